@@ -2,5 +2,7 @@
 
 from .backtest_runner import BacktestRunner
 from .results_analysis import ResultsAnalyzer
+from .vectorized_engine import VectorizedBacktest
+from .batch_engine import BatchBacktest
 
-__all__ = ['BacktestRunner', 'ResultsAnalyzer']
+__all__ = ['BacktestRunner', 'ResultsAnalyzer', 'VectorizedBacktest', 'BatchBacktest']
@@ -4,14 +4,19 @@
 
 from backtesting import Backtest 
 import logging
+import os
+import tempfile
 from multiprocessing import Pool, cpu_count
 import pandas as pd  # Import pandas for type checking
+from data.array_store import SharedFrame, export_frame, resolve_frame
+from .vectorized_engine import VectorizedBacktest
 
 # Do not configure logging here; it's configured in main.py
 logger = logging.getLogger(__name__)
 
 class BacktestRunner:
-    def __init__(self, strategies, data_dict, transaction_costs=0.001, slippage=0.0005):
+    def __init__(self, strategies, data_dict, transaction_costs=0.001, slippage=0.0005,
+                 record_events=False, events_dir=None, engine='event'):
         """
         Initialize the BacktestRunner.
 
@@ -20,11 +25,23 @@ class BacktestRunner:
             data_dict (dict): Dictionary containing processed data for each asset and timeframe.
             transaction_costs (float): Transaction cost per trade (default 0.1%).
             slippage (float): Slippage percentage (default 0.05%).
+            record_events (bool): Record strategy events (signals, orders) and add them to each
+                result as '_events'. Default is False.
+            events_dir (str, optional): Directory where each result's events are also written as
+                '<strategy>_<asset>_events.parquet'. Implies record_events.
+            engine (str): 'event' runs every strategy bar by bar with backtesting.py; 'vectorized'
+                runs single-timeframe strategies that declare signal arrays (vectorized = True)
+                with the vectorized engine and falls back to 'event' for the others.
         """
         self.strategies = strategies
         self.data_dict = data_dict
         self.transaction_costs = transaction_costs
         self.slippage = slippage
+        self.record_events = record_events or events_dir is not None
+        self.events_dir = events_dir
+        if engine not in ('event', 'vectorized'):
+            raise ValueError(f"Unknown backtest engine '{engine}'. Available: ['event', 'vectorized']")
+        self.engine = engine
         self.results = {}
 
     def run_backtests(self, concurrent=False):
@@ -52,21 +69,75 @@ class BacktestRunner:
     def _run_backtests_concurrently(self):
         """
         Run backtests concurrently using multiprocessing.
+        The frames are published once: each DataFrame is exported to a temporary array store
+        and the pool initializer hands every worker the SharedFrame handles, so workers attach
+        to one memory-mapped copy. Tasks only carry (strategy index, asset, params) and results
+        come back as compact records (see _compact_result()).
         """
-        tasks = []
-        for strategy_class in self.strategies:
-            for asset, timeframes in self.data_dict.items():
-                tasks.append((strategy_class, asset, timeframes))
+        tasks = [(index, asset, None)
+                 for index in range(len(self.strategies)) for asset in self.data_dict]
+        if not tasks:
+            return
+
+        with tempfile.TemporaryDirectory(prefix='backtest_frames_') as store_dir:
+            shared_data = self._publish_frames(store_dir)
+            processes = min(cpu_count(), len(tasks))
+            logger.info(f"Running {len(tasks)} backtests on {processes} processes")
+            with Pool(processes=processes, initializer=_init_backtest_worker,
+                      initargs=(self.get_config(), self.strategies, shared_data)) as pool:
+                for key, output in pool.starmap(_run_backtest_task, tasks):
+                    if output is not None:
+                        self.results[key] = output
+
+    def _publish_frames(self, store_dir):
+        """
+        Export the frames the strategies read (primary and higher timeframes) as array stores.
 
-        with Pool(processes=cpu_count()) as pool:
-            results = pool.starmap(self._run_single_backtest, tasks)
-            for key, output in results:
-                if output is not None:
-                    self.results[key] = output
+        Parameters:
+            store_dir (str): Directory that holds the array stores while the pool runs.
+
+        Returns:
+            dict: {asset: {timeframe: SharedFrame}}. Frames that cannot be exported as
+                  float64 blocks are passed through unchanged.
+        """
+        needed = set()
+        for strategy_class in self.strategies:
+            needed.add(getattr(strategy_class, 'primary_tf', '1m'))
+            if getattr(strategy_class, 'requires_multiple_timeframes', False):
+                needed.add(getattr(strategy_class, 'higher_tf', None))
+
+        shared_data = {}
+        for asset, timeframes in self.data_dict.items():
+            shared_data[asset] = {}
+            for timeframe in needed:
+                if timeframe is None or timeframe not in timeframes:
+                    continue
+                frame = timeframes[timeframe]
+                if not isinstance(frame, SharedFrame):
+                    frame = resolve_frame(frame)
+                    try:
+                        frame = SharedFrame(export_frame(frame, os.path.join(store_dir, asset, timeframe)))
+                    except (AttributeError, TypeError, ValueError) as e:
+                        logger.warning(f"Passing {asset} {timeframe} data to workers unshared: {e}")
+                shared_data[asset][timeframe] = frame
+        return shared_data
+
+    def get_config(self):
+        """
+        Constructor arguments (besides strategies and data_dict) that recreate an equivalent
+        BacktestRunner in another process.
+        """
+        return {
+            'transaction_costs': self.transaction_costs,
+            'slippage': self.slippage,
+            'record_events': self.record_events,
+            'events_dir': self.events_dir,
+            'engine': self.engine,
+        }
 
     # backtest_framework/backtest/backtest_runner.py
 
-    def _run_single_backtest(self, strategy_class, asset, timeframes):
+    def _run_single_backtest(self, strategy_class, asset, timeframes, params=None):
         """
         Run a single backtest for a given strategy and asset.
 
@@ -74,6 +145,7 @@ class BacktestRunner:
             strategy_class (class): The strategy class to backtest.
             asset (str): The asset symbol (e.g., 'BTCUSD').
             timeframes (dict): Dictionary of timeframes and their corresponding data.
+            params (dict, optional): Strategy parameters overriding the class defaults.
 
         Returns:
             tuple: (strategy_asset_key, backtest_result)
@@ -92,7 +164,7 @@ class BacktestRunner:
                 return (key, None)
 
             # Retrieve and verify data
-            data = timeframes[primary_tf]
+            data = resolve_frame(timeframes[primary_tf])
             if not isinstance(data, pd.DataFrame):
                 logger.error(f"Data for {asset} at {primary_tf} is not a pandas DataFrame. It's a {type(data)}. Skipping backtest.")
                 return (key, None)
@@ -106,7 +178,7 @@ class BacktestRunner:
             logger.info(f"Data for {asset} at {primary_tf} timeframe:\n{data.head()}")
 
             # Prepare additional timeframes if required
-            strategy_kwargs = {}
+            strategy_kwargs = dict(params or {})
             if getattr(strategy_class, 'requires_multiple_timeframes', False):
                 # Identify additional required timeframes
                 higher_tf = getattr(strategy_class, 'higher_tf', None)
@@ -114,7 +186,7 @@ class BacktestRunner:
                     if higher_tf not in timeframes:
                         logger.error(f"Higher timeframe '{higher_tf}' not found for asset '{asset}'. Skipping backtest.")
                         return (key, None)
-                    higher_data = timeframes[higher_tf]
+                    higher_data = resolve_frame(timeframes[higher_tf])
                     if not isinstance(higher_data, pd.DataFrame):
                         logger.error(f"Data for {asset} at {higher_tf} is not a pandas DataFrame. It's a {type(higher_data)}. Skipping backtest.")
                         return (key, None)
@@ -125,6 +197,14 @@ class BacktestRunner:
                     strategy_kwargs['higher_tf_data'] = higher_data
                     logger.info(f"Passing higher_tf data '{higher_tf}' to {strategy_class.__name__}")
 
+            if self._use_vectorized_engine(strategy_class):
+                logger.info(f"Running {key} with the vectorized engine")
+                output = VectorizedBacktest(
+                    data, strategy_class, cash=100000, commission=self.transaction_costs
+                ).run(**strategy_kwargs)
+                logger.info(f"Completed backtest for {key}")
+                return (key, output)
+
             # Initialize Backtest with the strategy's primary_tf data
             bt = Backtest(
                 data=data,
@@ -134,11 +214,15 @@ class BacktestRunner:
                 exclusive_orders=False if getattr(strategy_class, 'requires_multiple_timeframes', False) else True
             )
 
+            if self.record_events and hasattr(strategy_class, 'record_events'):
+                strategy_kwargs['record_events'] = True
+
             # Log strategy_kwargs
             logger.info(f"strategy_kwargs for {key}: {strategy_kwargs}")
 
             # Run the backtest with strategy-specific parameters
             output = bt.run(**strategy_kwargs)
+            self._collect_events(key, output)
 
             logger.info(f"Completed backtest for {key}")
             return (key, output)
@@ -148,6 +232,32 @@ class BacktestRunner:
             return (key, None)
 
 
+    def _use_vectorized_engine(self, strategy_class):
+        """
+        Whether a strategy runs on the vectorized engine: it must declare signal arrays and
+        trade a single timeframe (the engine models exclusive orders only).
+        """
+        return (self.engine == 'vectorized'
+                and getattr(strategy_class, 'vectorized', False)
+                and not getattr(strategy_class, 'requires_multiple_timeframes', False)
+                and not self.record_events)
+
+    def _collect_events(self, key, output):
+        """
+        Move the events recorded by the strategy into the result (and to Parquet if configured).
+        """
+        strategy = output.get('_strategy')
+        events = getattr(strategy, 'events', None)
+        if events is None or not events.enabled:
+            return
+        frame = strategy.events_frame()
+        output['_events'] = frame
+        if self.events_dir is not None:
+            os.makedirs(self.events_dir, exist_ok=True)
+            path = os.path.join(self.events_dir, f"{key}_events.parquet")
+            frame.to_parquet(path, index=False)
+            logger.info(f"Saved {len(frame)} events for {key} to {path}")
+
     def get_results(self):
         """
         Retrieve the backtest results.
@@ -186,3 +296,39 @@ class BacktestRunner:
         logger.info(f"Optimization completed for strategy {strategy_class.__name__}")
 
         return stats, heatmap
+
+
+def _compact_result(output):
+    """
+    Drop the strategy instance from a backtest result before it is sent back to the parent.
+    The instance references its data and indicators; the statistics, '_equity_curve',
+    '_trades' and '_events' stay in the result.
+    """
+    if output is None:
+        return None
+    return output.drop(labels=['_strategy'], errors='ignore')
+
+
+# Per-process state of the concurrent backtest workers, set by _init_backtest_worker()
+_worker_runner = None
+
+
+def _init_backtest_worker(config, strategies, shared_data):
+    """
+    Pool initializer: build the worker's BacktestRunner once over the shared frame handles.
+    """
+    global _worker_runner
+    _worker_runner = BacktestRunner(strategies, shared_data, **config)
+
+
+def _run_backtest_task(strategy_index, asset, params):
+    """
+    Run one (strategy, asset, params) task in a worker process.
+
+    Returns:
+        tuple: (strategy_asset_key, compact backtest result or None)
+    """
+    strategy_class = _worker_runner.strategies[strategy_index]
+    key, output = _worker_runner._run_single_backtest(
+        strategy_class, asset, _worker_runner.data_dict[asset], params)
+    return key, _compact_result(output)
@@ -0,0 +1,321 @@
+# backtest_framework/backtest/batch_engine.py
+
+import logging
+import numpy as np
+import pandas as pd
+from .vectorized_engine import FULL_EQUITY, FirstHitIndex, VectorizedBacktest
+
+# Do not configure logging here; it's configured in main.py
+logger = logging.getLogger(__name__)
+
+# Statistics computed for every parameter set (same definitions as backtesting.py's compute_stats)
+BATCH_STATS = ['Equity Final [$]', 'Return [%]', 'Sharpe Ratio', 'Calmar Ratio',
+               'Max. Drawdown [%]', 'Win Rate [%]', '# Trades']
+
+# float64 (params x bars) arrays held per parameter set while a block is evaluated
+ARRAYS_PER_PARAMETER_SET = 12
+
+
+class BatchBacktest:
+    """
+    Evaluate many parameter sets of a vectorized strategy (see VectorizedBacktest) in one pass.
+
+    Signals, SL/TP levels, equity and statistics of a block of parameter sets are
+    (params x bars) arrays. With exclusive orders every entry signal closes the open trade,
+    so when each trade starts and ends does not depend on cash: trade exits are found
+    for all trades of the block at once with FirstHitIndex, and only the position-size
+    recurrence (whole units bought with the available cash) loops, once per trade
+    column. Parameter sets that run out of money, or whose signals use exit arrays,
+    are re-run with VectorizedBacktest, so results equal Backtest.run()'s.
+
+    Parameter sets differing only in the strategy's exit_params (e.g., an SL x TP grid)
+    share one entry signal computation; each of them only costs the exit search and
+    the size recurrence.
+    """
+
+    def __init__(self, data, strategy_class, cash=10_000, commission=0.0, memory_budget_mb=256):
+        """
+        Initialize the batch evaluator.
+
+        Parameters:
+            data (pd.DataFrame): OHLC data indexed by timestamp.
+            strategy_class (class): Vectorized strategy class (see BaseStrategy.batch_signals()).
+            cash (float): Starting cash.
+            commission (float): Commission ratio applied to entry prices.
+            memory_budget_mb (float): Memory for the (params x bars) arrays of one block;
+                sets how many parameter sets are evaluated together.
+        """
+        self.data = data
+        self.strategy_class = strategy_class
+        self.cash = cash
+        self.commission = commission
+        self.memory_budget_mb = memory_budget_mb
+        self.opens = data['Open'].to_numpy(dtype='float64')
+        self.highs = data['High'].to_numpy(dtype='float64')
+        self.lows = data['Low'].to_numpy(dtype='float64')
+        self.closes = data['Close'].to_numpy(dtype='float64')
+        self._single = VectorizedBacktest(data, strategy_class, cash=cash, commission=commission)
+        self._day_ends, self._annual_trading_days = _daily_sampling(data.index)
+        self._low_index = None
+        self._negative_high_index = None
+        self._entry_cache = {}
+        self.entry_sets = 0
+
+    @property
+    def block_size(self) -> int:
+        """
+        Number of parameter sets evaluated together within the memory budget.
+        """
+        per_set = ARRAYS_PER_PARAMETER_SET * 8 * max(len(self.data), 1)
+        return max(1, int(self.memory_budget_mb * 1024 ** 2 // per_set))
+
+    def run(self, param_sets: list) -> pd.DataFrame:
+        """
+        Evaluate parameter sets.
+
+        Parameters:
+            param_sets (list): Dictionaries of strategy parameters.
+
+        Returns:
+            pd.DataFrame: One row per parameter set with the parameters and BATCH_STATS.
+        """
+        # Evaluate parameter sets sharing entry parameters together (see BaseStrategy.exit_params),
+        # so their entry signals are computed once and only the exits are re-simulated
+        groups = {}
+        for position, param_set in enumerate(param_sets):
+            key = self._entry_key(self._single.strategy_parameters(**param_set))
+            groups.setdefault(key, []).append(position)
+        order = [position for positions in groups.values() for position in positions]
+        self.entry_sets = len(groups)
+
+        records = [None] * len(param_sets)
+        block_size = self.block_size
+        for first in range(0, len(order), block_size):
+            positions = order[first:first + block_size]
+            block = [param_sets[position] for position in positions]
+            stats = self._run_block(block)
+            for position, params, row in zip(positions, block, stats):
+                records[position] = {**params, **row}
+            # Later blocks can only share the entry parameters of this block's last set
+            last_key = self._entry_key(self._single.strategy_parameters(**block[-1]))
+            self._entry_cache = {last_key: self._entry_cache[last_key]} if last_key in self._entry_cache else {}
+        self._entry_cache = {}
+        return pd.DataFrame(records)
+
+    def _entry_key(self, params: dict):
+        return self.strategy_class.entry_key(params)
+
+    def _run_block(self, block: list) -> list:
+        params = [self._single.strategy_parameters(**param_set) for param_set in block]
+        signals = self.strategy_class.batch_signals(self.data, params, entry_cache=self._entry_cache)
+
+        if 'long_exits' in signals or 'short_exits' in signals:
+            return [self._run_single(param_set) for param_set in block]
+
+        trades, equity, fallback = self._simulate(signals)
+        stats = batch_stats(equity, trades['pnl'], trades['closed'], self._day_ends, self._annual_trading_days)
+        rows = [{stat: stats[stat][row] for stat in BATCH_STATS} for row in range(len(block))]
+        for row in np.flatnonzero(fallback):
+            rows[row] = self._run_single(block[row])
+        return rows
+
+    def _run_single(self, param_set: dict) -> dict:
+        output = self._single.run(**param_set)
+        return {stat: output[stat] for stat in BATCH_STATS}
+
+    def _simulate(self, signals: dict):
+        """
+        Trades and equity curves of a block of signal matrices.
+
+        Returns:
+            tuple: (trade matrices, equity (params x bars), rows to re-run one by one)
+        """
+        opens, closes = self.opens, self.closes
+        n = len(closes)
+        long_entries = np.asarray(signals['long_entries'], dtype=bool)
+        rows_count = long_entries.shape[0]
+        short_entries = np.asarray(signals['short_entries'], dtype=bool) & ~long_entries
+        sl = np.asarray(signals.get('sl', np.full(long_entries.shape, np.nan)), dtype='float64')
+        tp = np.asarray(signals.get('tp', np.full(long_entries.shape, np.nan)), dtype='float64')
+        starts = np.broadcast_to(np.asarray(signals.get('start', 0), dtype='int64'), (rows_count,))
+
+        # Orders violating SL < price < TP (longs) or TP < price < SL (shorts) are rejected
+        with np.errstate(invalid='ignore'):
+            long_price = closes * (1 + self.commission)
+            short_price = closes * (1 - self.commission)
+            long_entries = long_entries & (np.isnan(sl) | (sl < long_price)) & (np.isnan(tp) | (long_price < tp))
+            short_entries = short_entries & (np.isnan(tp) | (tp < short_price)) & (np.isnan(sl) | (short_price < sl))
+        active = np.arange(n) >= starts[:, None]
+        long_entries &= active
+        short_entries &= active
+
+        # One trade per entry signal, in (row, bar) order
+        rows, bars = np.nonzero(long_entries | short_entries)
+        is_long = long_entries[rows, bars]
+        trade_sl = sl[rows, bars]
+        trade_tp = tp[rows, bars]
+        fills = np.minimum(bars + 1, n - 1)
+        has_next = np.zeros(len(rows), dtype=bool)
+        has_next[:-1] = rows[1:] == rows[:-1]
+        next_bars = np.where(has_next, np.roll(bars, -1), n - 1)
+        next_fills = np.where(has_next, np.roll(fills, -1), n - 1)
+
+        # First SL/TP hit from the entry bar through the next signal bar (Low for long SL and
+        # short TP, High for long TP and short SL; NaN levels never hit)
+        span = int((next_bars - fills).max()) + 1 if len(rows) else 1
+        low_levels = np.where(is_long, trade_sl, trade_tp)
+        high_levels = np.where(is_long, trade_tp, trade_sl)
+        low_hits = self._low(span).first_below(fills, next_bars, low_levels)
+        high_hits = self._negative_high(span).first_below(fills, next_bars, -high_levels)
+        sl_hits = np.where(is_long, low_hits, high_hits)
+        tp_hits = np.where(is_long, high_hits, low_hits)
+        sl_first = (sl_hits >= 0) & ((tp_hits < 0) | (sl_hits <= tp_hits))
+        tp_first = (tp_hits >= 0) & ~sl_first
+
+        exit_bars = np.where(sl_first, sl_hits, np.where(tp_first, tp_hits, next_fills))
+        exit_open = opens[exit_bars]
+        sl_price = np.where(is_long, np.minimum(exit_open, trade_sl), np.maximum(exit_open, trade_sl))
+        tp_price = np.where(is_long, np.maximum(exit_open, trade_tp), np.minimum(exit_open, trade_tp))
+        exit_prices = np.where(sl_first, sl_price, np.where(tp_first, tp_price, exit_open))
+        # A trade opened by a signal on the last bar and not stopped out stays open
+        closed = sl_first | tp_first | (bars < n - 1)
+
+        # Lay trades out as (params x trades) matrices
+        counts = np.bincount(rows, minlength=rows_count)
+        columns = int(counts.max()) if len(rows) else 0
+        column = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        def matrix(values, fill):
+            out = np.full((rows_count, columns), fill, dtype=np.asarray(values).dtype)
+            out[rows, column] = values
+            return out
+
+        side = np.where(is_long, 1.0, -1.0)
+        entry_price = matrix(opens[fills] * (1 + np.copysign(self.commission, side)), np.nan)
+        exit_price = matrix(exit_prices, np.nan)
+        side = matrix(side, 0.0)
+        valid = matrix(np.ones(len(rows), dtype=bool), False)
+
+        # Position sizes depend on the cash left by the previous trades
+        cash = np.full(rows_count, float(self.cash))
+        cash_after = np.empty((rows_count, columns + 1))
+        cash_after[:, 0] = cash
+        size = np.zeros((rows_count, columns))
+        pnl = np.zeros((rows_count, columns))
+        for k in range(columns):
+            present = valid[:, k]
+            units = np.floor_divide(cash * 1.0 * FULL_EQUITY, np.where(present, entry_price[:, k], 1.0))
+            size[:, k] = np.where(present, side[:, k] * units, 0.0)
+            pnl[:, k] = np.where(present, size[:, k] * (exit_price[:, k] - entry_price[:, k]), 0.0)
+            cash = np.where(present, cash + pnl[:, k], cash)
+            cash_after[:, k + 1] = cash
+        fallback = (valid & (size == 0)).any(axis=1)
+
+        # Equity: cash after the trades exited so far plus the open trade's unrealized PnL
+        closed_matrix = matrix(closed, False)
+        exit_bar = matrix(exit_bars, n)
+        exit_bar = np.where(closed_matrix, exit_bar, n)
+        entry_bar = matrix(fills, n)
+        row_index = np.repeat(np.arange(rows_count), columns)
+        exited = np.zeros((rows_count, n + 1), dtype='int64')
+        np.maximum.at(exited, (row_index, exit_bar.ravel()), np.tile(np.arange(1, columns + 1), rows_count))
+        exited = np.maximum.accumulate(exited[:, :n], axis=1)
+        entered = np.zeros((rows_count, n + 1), dtype='int64')
+        np.maximum.at(entered, (row_index, entry_bar.ravel()), np.tile(np.arange(1, columns + 1), rows_count))
+        entered = np.maximum.accumulate(entered[:, :n], axis=1)
+        equity = np.take_along_axis(cash_after, exited, axis=1)
+        current = np.maximum(entered - 1, 0)
+        in_trade = (entered > 0) & (np.arange(n) < np.take_along_axis(exit_bar, current, axis=1)) if columns else \
+            np.zeros((rows_count, n), dtype=bool)
+        if columns:
+            open_size = np.take_along_axis(size, current, axis=1)
+            open_entry = np.take_along_axis(entry_price, current, axis=1)
+            equity = np.where(in_trade, equity + open_size * (closes - open_entry), equity)
+        # Bars before the first next() call carry the first recorded equity
+        first = np.minimum(starts, n - 1)
+        equity = np.where(active | (starts[:, None] >= n), equity, np.take_along_axis(equity, first[:, None], axis=1))
+        fallback |= (equity <= 0).any(axis=1)
+
+        trades = {'pnl': pnl, 'closed': closed_matrix & valid}
+        return trades, equity, fallback
+
+    def _low(self, span):
+        if self._low_index is None or len(self._low_index.tables) < _levels(span):
+            self._low_index = FirstHitIndex(self.lows, span)
+        return self._low_index
+
+    def _negative_high(self, span):
+        if self._negative_high_index is None or len(self._negative_high_index.tables) < _levels(span):
+            self._negative_high_index = FirstHitIndex(-self.highs, span)
+        return self._negative_high_index
+
+
+def _levels(span: int) -> int:
+    """
+    Number of FirstHitIndex levels needed for ranges of `span` bars.
+    """
+    return max(1, int(span).bit_length())
+
+
+def _daily_sampling(index):
+    """
+    Positions of each day's last bar and the number of trading days per year, as used by
+    backtesting.py for annualized return and volatility.
+    """
+    if not isinstance(index, pd.DatetimeIndex) or len(index) == 0:
+        return None, np.nan
+    days = index.normalize().asi8
+    day_ends = np.flatnonzero(np.append(days[1:] != days[:-1], True))
+    annual_trading_days = float(365 if index.dayofweek.to_series().between(5, 6).mean() > 2/7 * .6 else 252)
+    return day_ends, annual_trading_days
+
+
+def batch_stats(equity, pnl, closed, day_ends, annual_trading_days) -> dict:
+    """
+    backtesting.py statistics of every row of an equity matrix.
+
+    Parameters:
+        equity (np.ndarray): (params x bars) equity curves.
+        pnl (np.ndarray): (params x trades) trade PnL.
+        closed (np.ndarray): (params x trades) mask of closed trades.
+        day_ends (np.ndarray): Positions of each day's last bar (None without a DatetimeIndex).
+        annual_trading_days (float): Trading days per year.
+
+    Returns:
+        dict: Statistic name -> array with one value per row.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = 1 - equity / np.maximum.accumulate(equity, axis=1)
+        max_drawdown = -np.nan_to_num(drawdown.max(axis=1))
+
+        if day_ends is not None:
+            daily = equity[:, day_ends]
+            day_returns = np.full(daily.shape, np.nan)
+            day_returns[:, 1:] = daily[:, 1:] / daily[:, :-1] - 1
+            growth = np.nan_to_num(day_returns, nan=0.0) + 1
+            gmean = np.where((growth <= 0).any(axis=1), 0.0,
+                             np.exp(np.log(np.where(growth > 0, growth, 1.0)).sum(axis=1) / growth.shape[1]) - 1)
+            variance = np.nanvar(day_returns, axis=1, ddof=1) if daily.shape[1] > 2 else np.full(len(equity), np.nan)
+        else:
+            gmean = np.zeros(len(equity))
+            variance = np.full(len(equity), np.nan)
+        annualized_return = (1 + gmean) ** annual_trading_days - 1
+        volatility = np.sqrt((variance + (1 + gmean) ** 2) ** annual_trading_days
+                             - (1 + gmean) ** (2 * annual_trading_days)) * 100
+        annualized_return_pct = annualized_return * 100
+        sharpe = np.clip(annualized_return_pct / np.where(volatility == 0, np.nan, volatility), 0, np.inf)
+        calmar = np.clip(annualized_return / np.where(max_drawdown == 0, np.nan, -max_drawdown), 0, np.inf)
+
+        trades = closed.sum(axis=1)
+        wins = (closed & (pnl > 0)).sum(axis=1)
+        win_rate = np.where(trades > 0, wins / np.where(trades > 0, trades, 1) * 100, np.nan)
+
+    return {
+        'Equity Final [$]': equity[:, -1],
+        'Return [%]': (equity[:, -1] - equity[:, 0]) / equity[:, 0] * 100,
+        'Sharpe Ratio': sharpe,
+        'Calmar Ratio': calmar,
+        'Max. Drawdown [%]': max_drawdown * 100,
+        'Win Rate [%]': win_rate,
+        '# Trades': trades,
+    }
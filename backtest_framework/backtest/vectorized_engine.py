@@ -0,0 +1,338 @@
+# backtest_framework/backtest/vectorized_engine.py
+
+import sys
+import logging
+import numpy as np
+import pandas as pd
+from backtesting._stats import compute_stats
+
+# Do not configure logging here; it's configured in main.py
+logger = logging.getLogger(__name__)
+
+# Fraction of equity backtesting.py commits to an order placed without an explicit size
+FULL_EQUITY = 1 - sys.float_info.epsilon
+
+
+class VectorizedBacktest:
+    """
+    Backtest of a signal-based strategy without a per-bar Python loop.
+
+    The strategy declares its entry (and optional exit) signals as arrays through the
+    classmethod `signals(df, **params)`, which returns a dict with:
+        'long_entries', 'short_entries' (bool arrays): buy/sell signal on the bar's close.
+        'long_exits', 'short_exits' (bool arrays, optional): close the open long/short trade.
+        'sl', 'tp' (float arrays): stop-loss/take-profit price of an entry on that bar (NaN for none).
+        'start' (int): first bar on which signals are acted upon (indicator warm-up).
+
+    Fills follow backtesting.py with exclusive_orders=True: a signal is filled at the next
+    bar's open (the last bar's open for a signal on the last bar), commission is applied
+    to the entry price, each new order closes the open trade first, the order uses all
+    available cash in whole units, and SL/TP are checked from the entry bar on (stop-loss
+    first when both are hit within a bar). Open trades are closed at the last bar's open.
+    The signals and the search for SL/TP hits are NumPy operations; Python only loops over
+    trades, so results match Backtest.run() at a fraction of its cost.
+    """
+
+    def __init__(self, data, strategy_class, cash=10_000, commission=0.0):
+        """
+        Initialize the vectorized backtest.
+
+        Parameters:
+            data (pd.DataFrame): OHLC data indexed by timestamp.
+            strategy_class (class): Strategy class implementing `signals()`.
+            cash (float): Starting cash.
+            commission (float): Commission ratio applied to entry prices (e.g., 0.001).
+        """
+        self.data = data
+        self.strategy_class = strategy_class
+        self.cash = cash
+        self.commission = commission
+
+    def strategy_parameters(self, **kwargs) -> dict:
+        """
+        Strategy parameters: keyword arguments, then class attributes, then declared defaults.
+        """
+        params = {}
+        for name, spec in getattr(self.strategy_class, 'strategy_params', {}).items():
+            if name in kwargs:
+                params[name] = kwargs[name]
+            else:
+                params[name] = getattr(self.strategy_class, name, spec.get('default'))
+        params.update(kwargs)
+        return params
+
+    def run(self, **kwargs) -> pd.Series:
+        """
+        Run the backtest. Keyword arguments are interpreted as strategy parameters.
+
+        Returns:
+            pd.Series: Statistics in the format of Backtest.run(), including '_trades', '_equity_curve'
+                       and '_strategy' (a strategy instance holding the parameters; init() is not called).
+        """
+        params = self.strategy_parameters(**kwargs)
+        signals = self.strategy_class.signals(self.data, **params)
+        trades, equity = simulate_signals(
+            self.data['Open'].to_numpy(dtype='float64'),
+            self.data['High'].to_numpy(dtype='float64'),
+            self.data['Low'].to_numpy(dtype='float64'),
+            self.data['Close'].to_numpy(dtype='float64'),
+            signals, self.cash, self.commission,
+        )
+        return compute_stats(
+            trades=trades_frame(trades, self.data.index),
+            equity=equity,
+            ohlc_data=self.data,
+            strategy_instance=self.strategy_instance(kwargs, params),
+            risk_free_rate=0.0,
+        )
+
+    def strategy_instance(self, kwargs: dict, params: dict):
+        """
+        Strategy instance for the '_strategy' entry of the results, as Backtest.run() returns it.
+        Its attributes hold the resolved parameters and it prints the keyword arguments, like the
+        event engine's instance; it has no broker or data and init() is not called on it.
+        """
+        # Parameters declared only in strategy_params are not class attributes, which
+        # Strategy.__init__ would reject, so they are set after construction
+        strategy = self.strategy_class(None, None, {})
+        for name, value in params.items():
+            setattr(strategy, name, value)
+        strategy._params = dict(kwargs)
+        return strategy
+
+
+def simulate_signals(opens, highs, lows, closes, signals, cash, commission):
+    """
+    Simulate the trades produced by entry/exit signal arrays.
+
+    Parameters:
+        opens, highs, lows, closes (np.ndarray): float64 OHLC arrays.
+        signals (dict): Signal arrays as described in VectorizedBacktest.
+        cash (float): Starting cash.
+        commission (float): Commission ratio applied to entry prices.
+
+    Returns:
+        tuple: (closed trades as a dict of column lists, equity curve as np.ndarray)
+    """
+    n = len(closes)
+    start = int(signals.get('start', 0))
+    long_entries = np.asarray(signals['long_entries'], dtype=bool)
+    short_entries = np.asarray(signals['short_entries'], dtype=bool) & ~long_entries
+    long_exits = np.asarray(signals.get('long_exits', np.zeros(n, dtype=bool)), dtype=bool)
+    short_exits = np.asarray(signals.get('short_exits', np.zeros(n, dtype=bool)), dtype=bool)
+    sl = np.asarray(signals.get('sl', np.full(n, np.nan)), dtype='float64')
+    tp = np.asarray(signals.get('tp', np.full(n, np.nan)), dtype='float64')
+
+    # Orders are rejected (and nothing happens) unless SL < price < TP for longs, TP < price < SL for shorts,
+    # price being the commission-adjusted close of the signal bar
+    with np.errstate(invalid='ignore'):
+        long_price = closes * (1 + commission)
+        short_price = closes * (1 - commission)
+        long_entries &= (np.isnan(sl) | (sl < long_price)) & (np.isnan(tp) | (long_price < tp))
+        short_entries &= (np.isnan(tp) | (tp < short_price)) & (np.isnan(sl) | (short_price < sl))
+    direction = np.where(long_entries, 1, np.where(short_entries, -1, 0)).astype('int8')
+    direction[:start] = 0
+    exits = np.where(long_exits, 1, 0) | np.where(short_exits, 2, 0)
+    exits[:start] = 0
+    event_bars = np.flatnonzero((direction != 0) | (exits != 0))
+
+    trades = {'Size': [], 'EntryBar': [], 'ExitBar': [], 'EntryPrice': [], 'ExitPrice': [], 'PnL': []}
+    initial_cash = cash
+    open_trade = None  # (size, entry_price, entry_bar, sl, tp, signal_bar)
+    last_bar = n - 1
+
+    def close_trade(trade, price, bar):
+        nonlocal cash
+        size, entry_price, entry_bar = trade[0], trade[1], trade[2]
+        pnl = size * (price - entry_price)
+        trades['Size'].append(size)
+        trades['EntryBar'].append(entry_bar)
+        trades['ExitBar'].append(bar)
+        trades['EntryPrice'].append(entry_price)
+        trades['ExitPrice'].append(price)
+        trades['PnL'].append(pnl)
+        cash += pnl
+
+    for bar in event_bars:
+        # SL/TP of the open trade are checked up to and including the signal bar
+        if open_trade is not None:
+            hit = first_exit(opens, highs, lows, open_trade, bar)
+            if hit is not None:
+                close_trade(open_trade, hit[1], hit[0])
+                open_trade = None
+        fill_bar = min(bar + 1, last_bar)
+        side = int(direction[bar])
+        if open_trade is not None and (side != 0 or exits[bar] & (1 if open_trade[0] > 0 else 2)):
+            close_trade(open_trade, opens[fill_bar], fill_bar)
+            open_trade = None
+        if side == 0:
+            continue
+        entry_price = opens[fill_bar] * (1 + np.copysign(commission, side))
+        size = int((cash * 1.0 * FULL_EQUITY) // entry_price)
+        if not size:
+            continue
+        open_trade = (side * size, entry_price, fill_bar, sl[bar], tp[bar], bar)
+
+    if open_trade is not None:
+        hit = first_exit(opens, highs, lows, open_trade, last_bar)
+        if hit is not None:
+            close_trade(open_trade, hit[1], hit[0])
+            open_trade = None
+        elif open_trade[5] < last_bar:
+            # Trades still open when the data ends are closed at the last bar's open
+            close_trade(open_trade, opens[last_bar], last_bar)
+            open_trade = None
+
+    equity = equity_curve(closes, trades, open_trade, initial_cash, start)
+    ruined = np.flatnonzero(equity[start:] <= 0)
+    if len(ruined):
+        trades, equity = stop_out_of_money(closes, trades, open_trade, equity, start + int(ruined[0]))
+    return trades, equity
+
+
+def stop_out_of_money(closes, trades, open_trade, equity, bar):
+    """
+    Replicate the broker running out of money at `bar`: the trade open at that bar's close
+    is closed at the close, later trades never happen and equity stays at zero.
+    """
+    logger.warning(f"Equity reached zero at bar {bar}; trading stops there.")
+    kept = {column: [] for column in trades}
+    candidates = list(zip(*trades.values()))
+    if open_trade is not None:
+        candidates.append((open_trade[0], open_trade[1], open_trade[2], len(closes), np.nan, np.nan))
+    for row in candidates:
+        size, entry_price, entry_bar, exit_bar = row[:4]
+        if entry_bar > bar:
+            break
+        if exit_bar > bar:
+            row = (size, entry_price, entry_bar, bar, closes[bar], size * (closes[bar] - entry_price))
+        for column, value in zip(kept, row):
+            kept[column].append(value)
+        if exit_bar > bar:
+            break
+    equity = equity.copy()
+    equity[bar:] = 0
+    return kept, equity
+
+
+def first_exit(opens, highs, lows, trade, last):
+    """
+    First stop-loss or take-profit hit of a trade from its entry bar through `last`.
+
+    Returns:
+        tuple: (exit bar, exit price), or None if neither level is reached.
+    """
+    size, _, entry_bar, sl, tp = trade[:5]
+    if entry_bar > last:
+        return None
+    window = slice(entry_bar, last + 1)
+    is_long = size > 0
+    sl_bar = tp_bar = None
+    if not np.isnan(sl):
+        hits = lows[window] < sl if is_long else highs[window] > sl
+        if hits.any():
+            sl_bar = entry_bar + int(hits.argmax())
+    if not np.isnan(tp):
+        hits = highs[window] > tp if is_long else lows[window] < tp
+        if hits.any():
+            tp_bar = entry_bar + int(hits.argmax())
+    if sl_bar is None and tp_bar is None:
+        return None
+    # The stop-loss is processed first when both levels are hit within the same bar
+    if sl_bar is not None and (tp_bar is None or sl_bar <= tp_bar):
+        price = min(opens[sl_bar], sl) if is_long else max(opens[sl_bar], sl)
+        return sl_bar, price
+    price = max(opens[tp_bar], tp) if is_long else min(opens[tp_bar], tp)
+    return tp_bar, price
+
+
+def equity_curve(closes, trades, open_trade, initial_cash, start):
+    """
+    Account equity at every bar's close: cash plus the open trade's unrealized PnL.
+    """
+    n = len(closes)
+    if start >= n:
+        return np.full(n, float(initial_cash))
+    exit_bars = np.asarray(trades['ExitBar'], dtype='int64')
+    pnl = np.asarray(trades['PnL'], dtype='float64')
+    # Realized cash after every bar, accumulated trade by trade as the broker does
+    cash_after = np.empty(len(pnl) + 1)
+    cash_after[0] = initial_cash
+    for position, value in enumerate(pnl):
+        cash_after[position + 1] = cash_after[position] + value
+    cash = cash_after[np.searchsorted(exit_bars, np.arange(n), side='right')]
+    equity = cash.copy()
+    spans = list(zip(trades['Size'], trades['EntryPrice'], trades['EntryBar'], trades['ExitBar']))
+    if open_trade is not None:
+        spans.append((open_trade[0], open_trade[1], open_trade[2], n))
+    for size, entry_price, entry_bar, exit_bar in spans:
+        equity[entry_bar:exit_bar] += size * (closes[entry_bar:exit_bar] - entry_price)
+    equity[:start] = equity[start]
+    return equity
+
+
+def trades_frame(trades, index) -> pd.DataFrame:
+    """
+    Closed trades in the format of Backtest.run()'s '_trades'.
+    """
+    frame = pd.DataFrame(trades)
+    frame['ReturnPct'] = np.sign(frame['Size']) * (frame['ExitPrice'] / frame['EntryPrice'] - 1) \
+        if len(frame) else pd.Series(dtype='float64')
+    frame['EntryTime'] = index[frame['EntryBar'].to_numpy(dtype='int64')]
+    frame['ExitTime'] = index[frame['ExitBar'].to_numpy(dtype='int64')]
+    frame['Duration'] = frame['ExitTime'] - frame['EntryTime']
+    return frame
+
+
+class FirstHitIndex:
+    """
+    Sparse table of range minima over a price array, answering many "first bar in
+    [start, end] whose value is below level" queries at once by binary lifting:
+    O(n log span) to build, O(log span) NumPy operations per batch of queries.
+    Use the negated High array to search for values above a level.
+    """
+
+    def __init__(self, values: np.ndarray, max_span: int = None):
+        """
+        Build the table.
+
+        Parameters:
+            values (np.ndarray): float64 array to search (e.g., Low, or -High).
+            max_span (int, optional): Longest query range; limits the number of levels.
+        """
+        self.values = np.asarray(values, dtype='float64')
+        n = len(self.values)
+        max_span = n if max_span is None else max(1, min(int(max_span), n))
+        self.tables = [self.values]
+        width = 1
+        while width * 2 <= max_span:
+            previous = self.tables[-1]
+            table = np.full(n, np.inf)
+            table[:n - width] = np.minimum(previous[:n - width], previous[width:])
+            self.tables.append(table)
+            width *= 2
+
+    def first_below(self, starts, ends, levels) -> np.ndarray:
+        """
+        First position in [starts, ends] (inclusive) whose value is strictly below levels.
+
+        Returns:
+            np.ndarray: int64 positions, -1 where the level is never crossed.
+        """
+        starts = np.asarray(starts, dtype='int64')
+        ends = np.asarray(ends, dtype='int64')
+        levels = np.asarray(levels, dtype='float64')
+        if len(starts) == 0:
+            return starts.copy()
+        n = len(self.values)
+        position = starts.copy()
+        # Skip the longest prefix without a hit, halving the block size at every level
+        for level in range(len(self.tables) - 1, -1, -1):
+            width = 1 << level
+            fits = position + width - 1 <= ends
+            block_min = self.tables[level][np.minimum(position, n - 1)]
+            skip = fits & ~(block_min < levels)
+            position += np.where(skip, width, 0)
+        inside = position <= ends
+        hit = inside & (self.values[np.minimum(position, n - 1)] < levels)
+        return np.where(hit, position, -1)
@@ -0,0 +1,82 @@
+# benchmarks/bench_compact_dtypes.py
+
+"""
+Compare the default float64 representation of processed data with the compact one
+(float32 columns, int64 nanosecond index): memory, load time, pickling to a worker
+and the cost of restoring full precision at the backtest boundary.
+
+Usage:
+    python -m benchmarks.bench_compact_dtypes [rows]
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.data_manager import DataManager
+from data.storage import from_compact_frame
+
+
+def make_processed_frame(rows: int) -> pd.DataFrame:
+    """
+    Build a synthetic processed 1m OHLCV frame with support/resistance columns.
+    """
+    rng = np.random.default_rng(42)
+    close = 20000.0 + np.cumsum(rng.normal(0.0, 5.0, rows))
+    index = pd.date_range('2018-01-01', periods=rows, freq='min', name='timestamp')
+    return pd.DataFrame({
+        'Open': close + rng.normal(0.0, 1.0, rows),
+        'High': close + 5.0,
+        'Low': close - 5.0,
+        'Close': close,
+        'Volume': rng.uniform(0.0, 10.0, rows),
+        'support': close - 20.0,
+        'resistance': close + 20.0,
+    }, index=index)
+
+
+def timed(func, repeat=5):
+    """
+    Best wall time of func over several runs, and its last result.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(rows=2_000_000):
+    df = make_processed_frame(rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        full = DataManager(raw_data_path=tmp_dir, processed_data_path=tmp_dir, cache=False)
+        compact = DataManager(raw_data_path=tmp_dir, processed_data_path=tmp_dir, cache=False, compact=True)
+        full.save_processed_data(df, 'BENCH', '1m')
+
+        full_load, full_df = timed(lambda: full.load_processed_data('BENCH', '1m', validate=False))
+        compact_load, compact_df = timed(lambda: compact.load_processed_data('BENCH', '1m', validate=False))
+
+    full_bytes = full_df.memory_usage(index=True).sum()
+    compact_bytes = compact_df.memory_usage(index=True).sum()
+    full_pickle, full_payload = timed(lambda: pickle.dumps(full_df, protocol=pickle.HIGHEST_PROTOCOL))
+    compact_pickle, compact_payload = timed(lambda: pickle.dumps(compact_df, protocol=pickle.HIGHEST_PROTOCOL))
+    restore, _ = timed(lambda: from_compact_frame(compact_df))
+
+    print(f"Rows: {rows:,}")
+    print(f"{'':<22}{'float64':>14}{'compact':>14}")
+    print(f"{'Memory (MB)':<22}{full_bytes / 1e6:>14.1f}{compact_bytes / 1e6:>14.1f}")
+    print(f"{'Load (s)':<22}{full_load:>14.3f}{compact_load:>14.3f}")
+    print(f"{'Pickle (s)':<22}{full_pickle:>14.3f}{compact_pickle:>14.3f}")
+    print(f"{'Pickle size (MB)':<22}{len(full_payload) / 1e6:>14.1f}{len(compact_payload) / 1e6:>14.1f}")
+    print(f"Restoring full precision at the backtest boundary: {restore:.3f}s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
@@ -0,0 +1,98 @@
+# benchmarks/bench_indicators.py
+
+"""
+Time the NumPy indicator kernels of utils.indicators (multi-window SMA, EMA, rolling
+min/max, ATR, RSI and Bollinger bands) against the pandas equivalents computed one
+window at a time, on a synthetic year of 1m BTCUSD-like bars, and report the largest
+relative difference between the two.
+
+Usage:
+    python -m benchmarks.bench_indicators [rows]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.indicators import sma, ema, rolling_min, rolling_max, atr, rsi, bollinger
+
+WINDOWS = [5, 10, 20, 50, 100, 200, 500, 1000]
+
+
+def make_prices(rows: int) -> tuple:
+    """
+    Build synthetic 1m high/low/close arrays (525,600 rows is one year).
+    """
+    rng = np.random.default_rng(42)
+    close = 20000.0 + np.cumsum(rng.normal(0.0, 5.0, rows))
+    return close + rng.uniform(0.0, 5.0, rows), close - rng.uniform(0.0, 5.0, rows), close
+
+
+def pandas_rsi(close: pd.Series, window: int) -> pd.Series:
+    change = close.diff()
+    gain = change.clip(lower=0).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    loss = (-change.clip(upper=0)).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+
+def pandas_atr(high: pd.Series, low: pd.Series, close: pd.Series, window: int) -> pd.Series:
+    previous_close = close.shift()
+    true_range = pd.concat([high - low, (high - previous_close).abs(), (low - previous_close).abs()], axis=1).max(axis=1)
+    return true_range.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+
+
+def timed(func, repeats=3):
+    """
+    Return (best wall time in seconds, result) of func().
+    """
+    best, result = np.inf, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def max_relative_difference(numpy_rows, pandas_rows) -> float:
+    numpy_rows = np.asarray(numpy_rows, dtype='float64')
+    pandas_rows = np.asarray(pandas_rows, dtype='float64')
+    valid = ~np.isnan(numpy_rows) & ~np.isnan(pandas_rows)
+    return float(np.max(np.abs(numpy_rows[valid] - pandas_rows[valid]) / np.abs(pandas_rows[valid])))
+
+
+def main(rows=525_600):
+    high, low, close = make_prices(rows)
+    high_series, low_series, close_series = pd.Series(high), pd.Series(low), pd.Series(close)
+    cases = [
+        ('SMA', lambda: sma(close, WINDOWS),
+         lambda: [close_series.rolling(w).mean() for w in WINDOWS]),
+        ('EMA', lambda: ema(close, WINDOWS),
+         lambda: [close_series.ewm(span=w, adjust=False).mean() for w in WINDOWS]),
+        ('Rolling min', lambda: rolling_min(close, WINDOWS),
+         lambda: [close_series.rolling(w).min() for w in WINDOWS]),
+        ('Rolling max', lambda: rolling_max(close, WINDOWS),
+         lambda: [close_series.rolling(w).max() for w in WINDOWS]),
+        ('ATR', lambda: atr(high, low, close, WINDOWS),
+         lambda: [pandas_atr(high_series, low_series, close_series, w) for w in WINDOWS]),
+        ('RSI', lambda: rsi(close, WINDOWS),
+         lambda: [pandas_rsi(close_series, w) for w in WINDOWS]),
+        ('Bollinger upper', lambda: bollinger(close, WINDOWS)[1],
+         lambda: [close_series.rolling(w).mean() + 2 * close_series.rolling(w).std(ddof=0) for w in WINDOWS]),
+    ]
+
+    print(f"Rows: {rows:,}  windows: {WINDOWS}")
+    print(f"{'Indicator':<18}{'numpy (ms)':>12}{'pandas (ms)':>13}{'speedup':>10}{'max rel diff':>15}")
+    for name, numpy_func, pandas_func in cases:
+        numpy_time, numpy_rows = timed(numpy_func)
+        pandas_time, pandas_rows = timed(pandas_func)
+        difference = max_relative_difference(numpy_rows, pandas_rows)
+        print(f"{name:<18}{numpy_time * 1e3:>12.1f}{pandas_time * 1e3:>13.1f}"
+              f"{pandas_time / numpy_time:>9.1f}x{difference:>15.1e}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 525_600)
@@ -0,0 +1,100 @@
+# benchmarks/bench_strategy_next.py
+
+"""
+Measure the cost of Strategy.next() per bar with pandas-based bar access
+(self.data.df['Close'][-1], crossover() on sliced indicators) against the
+precomputed NumPy arrays of BaseStrategy (self.closes[self.bar_index]),
+using MomentumStrategy on a synthetic year of 1m BTCUSD-like bars.
+
+Usage:
+    python -m benchmarks.bench_strategy_next [rows]
+"""
+
+import contextlib
+import io
+import logging
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from backtesting import Backtest
+from backtesting.lib import crossover
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.momentum_strategy import MomentumStrategy
+
+
+class PandasAccessMomentumStrategy(MomentumStrategy):
+    """
+    MomentumStrategy with the per-bar pandas accessors (and logging) it used before the array API.
+    """
+
+    def next(self):
+        current_close = self.data.df['Close'][-1]
+        current_short_ma = self.short_ma[-1]
+        current_long_ma = self.long_ma[-1]
+        logging.info(f"Current Close Price: {current_close}")
+        logging.info(f"Short MA: {current_short_ma}, Long MA: {current_long_ma}")
+        if crossover(self.short_ma, self.long_ma):
+            self.buy(sl=current_close * (1 - self.sl_percent / 100), tp=current_close * (1 + self.tp_percent / 100))
+        elif crossover(self.long_ma, self.short_ma):
+            self.sell(sl=current_close * (1 + self.sl_percent / 100), tp=current_close * (1 - self.tp_percent / 100))
+
+
+def make_bars(rows: int) -> pd.DataFrame:
+    """
+    Build a synthetic 1m OHLCV frame (525,600 rows is one year).
+    """
+    rng = np.random.default_rng(42)
+    close = 20000.0 + np.cumsum(rng.normal(0.0, 5.0, rows))
+    index = pd.date_range('2023-01-01', periods=rows, freq='min', name='timestamp')
+    return pd.DataFrame({
+        'Open': close + rng.normal(0.0, 1.0, rows),
+        'High': close + 5.0,
+        'Low': close - 5.0,
+        'Close': close,
+        'Volume': rng.uniform(0.0, 10.0, rows),
+    }, index=index)
+
+
+def time_next(strategy_class, df: pd.DataFrame):
+    """
+    Run a backtest and return (seconds spent in next(), number of next() calls, stats).
+    """
+    spent = [0.0, 0]
+    original_next = strategy_class.next
+
+    def timed_next(self):
+        start = time.perf_counter()
+        original_next(self)
+        spent[0] += time.perf_counter() - start
+        spent[1] += 1
+
+    timed_class = type(strategy_class.__name__, (strategy_class,), {'next': timed_next})
+    # Strategy parameters are class attributes, set from the defaults as main.py does
+    for name, spec in strategy_class.strategy_params.items():
+        setattr(timed_class, name, spec['default'])
+    bt = Backtest(df, timed_class, cash=10_000_000, commission=0.0)
+    # Silence the per-signal prints of the strategy
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = bt.run()
+    return spent[0], spent[1], stats
+
+
+def main(rows=525_600):
+    df = make_bars(rows)
+    pandas_time, calls, pandas_stats = time_next(PandasAccessMomentumStrategy, df)
+    array_time, _, array_stats = time_next(MomentumStrategy, df)
+
+    print(f"Rows: {rows:,}  next() calls: {calls:,}")
+    print(f"{'':<22}{'pandas':>14}{'arrays':>14}")
+    print(f"{'next() total (s)':<22}{pandas_time:>14.3f}{array_time:>14.3f}")
+    print(f"{'next() per bar (us)':<22}{pandas_time / calls * 1e6:>14.2f}{array_time / calls * 1e6:>14.2f}")
+    print(f"{'# Trades':<22}{pandas_stats['# Trades']:>14}{array_stats['# Trades']:>14}")
+    print(f"Speedup: {pandas_time / array_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 525_600)
@@ -0,0 +1,17 @@
+# data/__init__.py
+
+from .data_manager import DataManager
+from .storage import StorageBackend, CSVStorage, ParquetStorage, FeatherStorage, to_compact_frame, from_compact_frame
+from .array_store import SharedFrame, export_frame, attach_frame, resolve_frame
+from .frame_cache import FrameCache, default_frame_cache
+from .lazy_data import LazyDataDict, LazyTimeframes
+from .catalog import DatasetCatalog
+from .quality import QualityIndex, scan_quality
+from .bars import build_information_bars, information_bar_label
+
+__all__ = ['DataManager', 'StorageBackend', 'CSVStorage', 'ParquetStorage', 'FeatherStorage',
+           'to_compact_frame', 'from_compact_frame',
+           'SharedFrame', 'export_frame', 'attach_frame', 'resolve_frame',
+           'FrameCache', 'default_frame_cache', 'LazyDataDict', 'LazyTimeframes',
+           'DatasetCatalog', 'QualityIndex', 'scan_quality',
+           'build_information_bars', 'information_bar_label']
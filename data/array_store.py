@@ -0,0 +1,144 @@
+# data/array_store.py
+
+import json
+import os
+import shutil
+import time
+import uuid
+import numpy as np
+import pandas as pd
+from .storage import from_compact_frame
+
+# File names of an array store version directory
+TIMESTAMPS_FILE = 'timestamps.npy'
+VALUES_FILE = 'values.npy'
+META_FILE = 'meta.json'
+# Pointer to the current version directory of an array store
+CURRENT_FILE = 'CURRENT'
+
+
+def current_version(directory: str):
+    """
+    Version token of the array store in directory, or None for a store written
+    before versioning (files directly in the directory).
+    """
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def export_frame(df: pd.DataFrame, directory: str) -> str:
+    """
+    Export a processed frame as a memory-mappable array store.
+    The store holds the index as int64 nanoseconds and all columns as one
+    (columns x rows) float64 block so it can be attached without copying.
+    Every export writes a fresh version directory and then switches the CURRENT
+    pointer with os.replace(), so files already mapped by other processes are
+    never rewritten in place. The previous version is kept for handles still in
+    flight; older ones are removed.
+
+    Parameters:
+        df (pd.DataFrame): Frame indexed by a DatetimeIndex with numeric columns.
+        directory (str): Target directory (created if needed).
+
+    Returns:
+        str: The directory of the array store.
+    """
+    os.makedirs(directory, exist_ok=True)
+    timestamps = pd.DatetimeIndex(df.index).as_unit('ns').asi8
+    values = np.ascontiguousarray(df.to_numpy(dtype='float64').T)
+
+    previous = current_version(directory)
+    version = f"v{time.time_ns():x}{uuid.uuid4().hex[:8]}"
+    version_dir = os.path.join(directory, version)
+    os.makedirs(version_dir)
+    np.save(os.path.join(version_dir, TIMESTAMPS_FILE), timestamps)
+    np.save(os.path.join(version_dir, VALUES_FILE), values)
+    with open(os.path.join(version_dir, META_FILE), 'w') as f:
+        json.dump({'columns': list(df.columns), 'rows': len(df)}, f)
+
+    pointer = os.path.join(directory, f"{CURRENT_FILE}.{version}.tmp")
+    with open(pointer, 'w') as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(directory, CURRENT_FILE))
+
+    # Unlinking is safe for mappings that are still open; the data stays until they are closed
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name in (version, previous, CURRENT_FILE):
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        elif name in (TIMESTAMPS_FILE, VALUES_FILE, META_FILE):
+            os.remove(path)
+    return directory
+
+
+def attach_frame(directory: str, version: str = None) -> pd.DataFrame:
+    """
+    Attach to an array store read-only and rebuild the DataFrame as a view on the mapped files.
+
+    Parameters:
+        directory (str): Directory written by export_frame().
+        version (str, optional): Version token to attach (default: the current version).
+
+    Returns:
+        pd.DataFrame: Read-only frame backed by the memory-mapped arrays.
+    """
+    version = version or current_version(directory)
+    version_dir = os.path.join(directory, version) if version else directory
+    with open(os.path.join(version_dir, META_FILE)) as f:
+        meta = json.load(f)
+    timestamps = np.load(os.path.join(version_dir, TIMESTAMPS_FILE), mmap_mode='r')
+    values = np.load(os.path.join(version_dir, VALUES_FILE), mmap_mode='r')
+
+    index = pd.DatetimeIndex(timestamps.view('datetime64[ns]'), name='timestamp')
+    # values.T is a (rows x columns) view; copy=False keeps it as the frame's single block
+    return pd.DataFrame(values.T, index=index, columns=meta['columns'], copy=False)
+
+
+class SharedFrame:
+    """
+    Lightweight, picklable handle to one version of an array store.
+    Pickling only transfers the directory and version token; each process attaches to
+    the mapped files once per version, so every worker shares the same physical copy
+    of the data and a re-export is picked up through a new handle, never by a stale cache.
+    """
+
+    _attached = {}  # Per-process cache of attached frames keyed by (directory, version)
+
+    def __init__(self, directory: str, version: str = None):
+        self.directory = directory
+        self.version = version or current_version(directory)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        key = (self.directory, self.version)
+        if key not in SharedFrame._attached:
+            # Release the mappings of superseded versions of the same store
+            for stale in [k for k in SharedFrame._attached if k[0] == self.directory]:
+                del SharedFrame._attached[stale]
+            SharedFrame._attached[key] = attach_frame(self.directory, self.version)
+        return SharedFrame._attached[key]
+
+    def __getstate__(self):
+        return {'directory': self.directory, 'version': self.version}
+
+    def __setstate__(self, state):
+        self.directory = state['directory']
+        self.version = state.get('version')
+
+    def __repr__(self):
+        return f"SharedFrame('{self.directory}', version='{self.version}')"
+
+
+def resolve_frame(data):
+    """
+    Return the full-precision DataFrame behind a SharedFrame handle or a compact frame,
+    or the input unchanged.
+    """
+    if isinstance(data, SharedFrame):
+        return data.frame
+    return from_compact_frame(data)
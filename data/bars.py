@@ -0,0 +1,83 @@
+# data/bars.py
+
+import numpy as np
+import pandas as pd
+
+# Quantity accumulated by each kind of information-driven bar
+INFORMATION_BAR_KINDS = ('volume', 'dollar', 'tick')
+
+
+def information_bar_label(kind: str, threshold: float) -> str:
+    """
+    Timeframe label under which information bars are stored (e.g., 'volume_5000').
+    """
+    if kind not in INFORMATION_BAR_KINDS:
+        raise ValueError(f"Unknown bar kind '{kind}'. Available: {list(INFORMATION_BAR_KINDS)}")
+    if threshold <= 0:
+        raise ValueError(f"Bar threshold must be positive, got {threshold}")
+    value = int(threshold) if float(threshold).is_integer() else threshold
+    return f"{kind}_{value}"
+
+
+def parse_information_bar_label(label: str):
+    """
+    Split an information bar label into (kind, threshold), or return None for time timeframes.
+    """
+    kind, _, value = label.partition('_')
+    if kind not in INFORMATION_BAR_KINDS or not value:
+        return None
+    try:
+        return kind, float(value)
+    except ValueError:
+        return None
+
+
+def build_information_bars(df: pd.DataFrame, kind: str, threshold: float) -> pd.DataFrame:
+    """
+    Aggregate time bars into volume, dollar-value or tick-count bars.
+    A bar is closed by the row that brings the cumulative volume (Volume), traded value
+    (Close * Volume) or row count to the next multiple of threshold. Bucketing is a
+    cumulative sum and an integer division; aggregation uses ufunc.reduceat over the bar
+    boundaries, so the whole build is vectorized. Each bar is labeled with the timestamp
+    of its last source row, and the last bar may still be filling up.
+
+    Parameters:
+        df (pd.DataFrame): Time bars indexed by timestamp, sorted, with OHLCV columns.
+        kind (str): 'volume', 'dollar' or 'tick'.
+        threshold (float): Quantity per bar.
+
+    Returns:
+        pd.DataFrame: Bars with the same OHLCV(+support/resistance) schema as df.
+    """
+    information_bar_label(kind, threshold)  # validates kind and threshold
+    if df.empty:
+        return df.iloc[:0]
+
+    close = df['Close'].to_numpy(dtype='float64')
+    volume = df['Volume'].to_numpy(dtype='float64')
+    if kind == 'volume':
+        quantity = volume
+    elif kind == 'dollar':
+        quantity = close * volume
+    else:
+        quantity = np.ones(len(df))
+
+    # Bar of each row: how many thresholds were completed before the row
+    cumulative = np.cumsum(quantity)
+    bar_ids = np.floor_divide(cumulative - quantity, threshold)
+    starts = np.flatnonzero(np.diff(bar_ids, prepend=-1.0))
+    ends = np.append(starts[1:] - 1, len(df) - 1)
+
+    aggregations = {
+        'Open': lambda values: values[starts],
+        'High': lambda values: np.maximum.reduceat(values, starts),
+        'Low': lambda values: np.minimum.reduceat(values, starts),
+        'Close': lambda values: values[ends],
+        'Volume': lambda values: np.add.reduceat(values, starts),
+        'support': lambda values: np.minimum.reduceat(values, starts),
+        'resistance': lambda values: np.maximum.reduceat(values, starts),
+    }
+    bars = {col: aggregate(df[col].to_numpy(dtype='float64'))
+            for col, aggregate in aggregations.items() if col in df.columns}
+    index = pd.DatetimeIndex(df.index[ends], name='timestamp')
+    return pd.DataFrame(bars, index=index)
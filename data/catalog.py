@@ -0,0 +1,115 @@
+# data/catalog.py
+
+import json
+import os
+import time
+from contextlib import contextmanager
+import pandas as pd
+
+CATALOG_FILE = 'catalog.json'
+# Seconds to wait for another process to release the catalog before taking over its lock
+LOCK_TIMEOUT = 10.0
+
+
+class DatasetCatalog:
+    """
+    Index of every processed artifact: asset, timeframe, row count, first/last timestamp,
+    column schema, storage format and path. Stored as '<processed>/catalog.json' so that
+    available data can be listed and validated without opening any data file.
+    """
+
+    def __init__(self, processed_data_path: str):
+        self.path = os.path.join(processed_data_path, CATALOG_FILE)
+        self.datasets = self._read()
+
+    def _read(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f).get('datasets', {})
+        except (OSError, ValueError):
+            return {}
+
+    def reload(self):
+        """
+        Re-read the catalog from disk (e.g., after another process updated it).
+        """
+        self.datasets = self._read()
+
+    def assets(self) -> list:
+        return sorted(self.datasets)
+
+    def timeframes(self, asset: str) -> list:
+        return list(self.datasets.get(asset, {}))
+
+    def entry(self, asset: str, timeframe: str):
+        """
+        Metadata of an artifact, or None if it is not in the catalog.
+        """
+        return self.datasets.get(asset, {}).get(timeframe)
+
+    def has(self, asset: str, timeframe: str) -> bool:
+        entry = self.entry(asset, timeframe)
+        return entry is not None and entry['rows'] > 0
+
+    def record(self, asset, timeframe, rows, start, end, columns, storage_format, path):
+        """
+        Record (or replace) the metadata of an artifact and persist the catalog.
+        Several processes may write concurrently, so the update is a locked
+        read-modify-write followed by an atomic replace of the file.
+
+        Parameters:
+            columns (list): Column names, or None to keep the recorded schema.
+        """
+        with self._locked():
+            self.datasets = self._read()
+            previous = self.entry(asset, timeframe) or {}
+            self.datasets.setdefault(asset, {})[timeframe] = {
+                'rows': int(rows),
+                'start': pd.Timestamp(start).isoformat() if rows else None,
+                'end': pd.Timestamp(end).isoformat() if rows else None,
+                'columns': list(columns) if columns is not None else previous.get('columns', []),
+                'storage_format': storage_format,
+                'path': path,
+                'updated': pd.Timestamp.now().isoformat(),
+            }
+            self._write()
+
+    def record_frame(self, asset, timeframe, df, storage_format, path):
+        """
+        Record an artifact from the frame that was written for it.
+        """
+        start, end = (df.index[0], df.index[-1]) if len(df) else (None, None)
+        self.record(asset, timeframe, len(df), start, end, df.columns, storage_format, path)
+
+    def _write(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'datasets': self.datasets}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lock_path = f"{self.path}.lock"
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                if time.monotonic() > deadline:
+                    # The holder died without releasing the lock
+                    try:
+                        os.remove(lock_path)
+                    except FileNotFoundError:
+                        pass
+                    deadline = time.monotonic() + LOCK_TIMEOUT
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            os.remove(lock_path)
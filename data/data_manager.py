@@ -0,0 +1,1046 @@
+# data/data_manager.py
+
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from utils.logger import setup_logger
+from utils.helpers import TIMEFRAME_RULES, timeframe_to_rule, timeframe_to_timedelta
+from utils.indicators import calculate_support_resistance_bank
+from .storage import CSVStorage, PROCESSED_DTYPES, get_storage_backend, apply_processed_dtypes, to_compact_frame, pa
+from .array_store import SharedFrame, export_frame
+from .manifest import AssetManifest, hash_file
+from .frame_cache import FrameCache, default_frame_cache
+from .lazy_data import LazyDataDict
+from .catalog import DatasetCatalog
+from .quality import QualityIndex, scan_quality, empty_anomalies
+from .bars import build_information_bars, information_bar_label, parse_information_bar_label
+
+# Version of the processing logic recorded in each asset manifest; bump it when a change
+# to preprocessing or resampling must invalidate previously processed artifacts
+PROCESSING_VERSION = 1
+
+# Aggregation rules used when resampling processed OHLCV data to a lower frequency
+RESAMPLE_AGGREGATION = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum',
+    'support': 'min',
+    'resistance': 'max',
+}
+
+
+class DataManager:
+    """
+    Handles loading, preprocessing, resampling and persisting market data.
+    Raw 1-minute files live under raw_data_path/<asset>/ and processed artifacts
+    are written to processed_data_path/<asset>/ through a pluggable storage backend.
+    """
+
+    def __init__(self, raw_data_path='data/raw', processed_data_path='data/processed', storage_format='parquet', cache=True, compact=False, sr_windows=None):
+        """
+        Initialize the DataManager.
+
+        Parameters:
+            raw_data_path (str): Directory containing one subfolder of raw CSV files per asset.
+            processed_data_path (str): Directory where processed data is stored.
+            storage_format (str): Storage backend for processed data ('parquet', 'feather' or 'csv').
+                Falls back to 'csv' when pyarrow is not installed.
+            cache (bool or FrameCache): Serve repeated loads from an in-process LRU cache.
+                True uses the process-wide cache, False disables caching. Cached frames are
+                handed out as read-only views.
+            compact (bool): Load processed data in the compact representation (float32 columns,
+                int64 nanosecond index). BacktestRunner and the optimizers restore full precision
+                before running a strategy.
+            sr_windows (list, optional): Window sizes (in bars) of the support/resistance bank
+                stored with every resampled timeframe as 'support_{w}'/'resistance_{w}' columns.
+        """
+        self.raw_data_path = raw_data_path
+        self.processed_data_path = processed_data_path
+        self.logger = setup_logger('DataManager', 'data_manager.log')
+
+        if storage_format != 'csv' and pa is None:
+            self.logger.warning(f"pyarrow is not installed; falling back to CSV storage instead of '{storage_format}'.")
+            storage_format = 'csv'
+        self.storage = get_storage_backend(storage_format, processed_data_path)
+        # Legacy CSV artifacts remain readable whatever the configured backend is
+        self.legacy_storage = CSVStorage(processed_data_path)
+        if cache is True:
+            cache = default_frame_cache
+        self.cache = cache if isinstance(cache, FrameCache) else None
+        self.compact = compact
+        self.sr_windows = sorted(set(sr_windows)) if sr_windows else None
+        self.catalog = DatasetCatalog(processed_data_path)
+
+        self.logger.info(f"Initialized DataManager with raw data path: {raw_data_path} and processed data path: {processed_data_path}")
+
+    def detect_assets(self):
+        """
+        Detect available assets by scanning the subdirectories of the raw data path.
+
+        Returns:
+            list: Sorted list of asset symbols.
+        """
+        if not os.path.isdir(self.raw_data_path):
+            self.logger.error(f"Raw data path does not exist: {self.raw_data_path}")
+            return []
+        assets = sorted(
+            name for name in os.listdir(self.raw_data_path)
+            if os.path.isdir(os.path.join(self.raw_data_path, name))
+        )
+        self.logger.info(f"Detected assets: {assets}")
+        return assets
+
+    def get_raw_files(self, asset):
+        """
+        List the raw CSV files available for an asset.
+
+        Parameters:
+            asset (str): The asset symbol (e.g., 'BTCUSD').
+
+        Returns:
+            list: Sorted list of CSV file names.
+        """
+        asset_path = os.path.join(self.raw_data_path, asset)
+        if not os.path.isdir(asset_path):
+            raw_files = []
+        else:
+            raw_files = sorted(f for f in os.listdir(asset_path) if f.lower().endswith('.csv'))
+        self.logger.info(f"Found raw files for {asset}: {raw_files}")
+        return raw_files
+
+    def load_raw_data(self, asset, filename):
+        """
+        Load a raw CSV file for an asset.
+
+        Parameters:
+            asset (str): The asset symbol (e.g., 'BTCUSD').
+            filename (str): Name of the raw file (e.g., 'BTCUSDT_1m.csv').
+
+        Returns:
+            pd.DataFrame: Raw data, or an empty DataFrame if the file cannot be read.
+        """
+        file_path = os.path.join(self.raw_data_path, asset, filename)
+        try:
+            df = pd.read_csv(file_path)
+            self.logger.info(f"Loaded raw data for {asset} from {file_path}")
+            return df
+        except Exception as e:
+            self.logger.error(f"Error loading raw data for {asset} from {file_path}: {e}")
+            return pd.DataFrame()
+
+    def ingest_raw_data(self, asset, filename, chunksize=500_000):
+        """
+        Stream a raw CSV file into the processed 1m store in fixed-size chunks.
+        Each chunk is parsed with predeclared dtypes, cleaned and validated, then written
+        directly to the store, so peak memory is bounded by the chunk size rather than the
+        file size. A chunk is only sorted when its timestamps are out of order.
+
+        Parameters:
+            asset (str): The asset symbol (e.g., 'BTCUSD').
+            filename (str): Name of the raw file (e.g., 'BTCUSDT_1m.csv').
+            chunksize (int): Number of rows parsed per chunk.
+
+        Returns:
+            int: Number of rows written to the processed store.
+        """
+        file_path = os.path.join(self.raw_data_path, asset, filename)
+        raw_size = os.path.getsize(file_path)
+        self._invalidate_cache(asset)
+        total_rows = 0
+        dropped_rows = 0
+        first_timestamp = None
+        last_timestamp = None
+        globally_sorted = True
+        columns = None
+        anomalies = []
+        previous_raw_timestamp = None
+
+        try:
+            reader = pd.read_csv(file_path, chunksize=chunksize, dtype=PROCESSED_DTYPES)
+            for chunk_number, chunk in enumerate(reader):
+                columns = columns or list(chunk.columns)
+                if 'timestamp' not in chunk.columns:
+                    raise ValueError(f"'timestamp' column missing in {file_path}")
+
+                initial_rows = len(chunk)
+                chunk = chunk.dropna()
+                chunk = chunk.set_index(pd.to_datetime(chunk.pop('timestamp'))).rename_axis('timestamp')
+                dropped_rows += initial_rows - len(chunk)
+                if chunk.empty:
+                    continue
+
+                # Quality is checked in file order, carrying the last timestamp across chunks
+                anomalies.append(scan_quality(chunk, timeframe_to_timedelta('1m'), previous_raw_timestamp))
+                previous_raw_timestamp = chunk.index[-1]
+                if not chunk.index.is_monotonic_increasing:
+                    chunk = chunk.sort_index(kind='stable')
+                    self.logger.info(f"Sorted out-of-order chunk {chunk_number} of {file_path}.")
+                if last_timestamp is not None and chunk.index[0] < last_timestamp:
+                    globally_sorted = False
+
+                chunk = apply_processed_dtypes(chunk)
+                if total_rows == 0:
+                    self.storage.save(chunk, asset, '1m')
+                else:
+                    self.storage.append(chunk, asset, '1m')
+                total_rows += len(chunk)
+                first_timestamp = chunk.index[0] if first_timestamp is None else min(first_timestamp, chunk.index[0])
+                last_timestamp = chunk.index[-1] if last_timestamp is None else max(last_timestamp, chunk.index[-1])
+        except Exception as e:
+            self.logger.error(f"Error streaming raw data for {asset} from {file_path}: {e}")
+            return 0
+
+        self.logger.info(f"Dropped {dropped_rows} rows with missing values.")
+        if total_rows == 0:
+            self.logger.warning(f"No rows ingested for {asset} from {file_path}.")
+            return 0
+
+        if not globally_sorted:
+            # Chunks overlap in time: a single re-sort of the stored data is unavoidable
+            self.logger.warning(f"Raw file {file_path} is not in time order across chunks; re-sorting the stored 1m data.")
+            stored = self.storage.load(asset, '1m').sort_index(kind='stable')
+            self.storage.save(stored, asset, '1m')
+            # Duplicates and gaps across chunks only show in the sorted data; keep the chunks' order findings
+            anomalies = [frame[frame['kind'] == 'out_of_order'] for frame in anomalies]
+            anomalies.append(scan_quality(stored, timeframe_to_timedelta('1m')))
+
+        self._save_ingest_state(asset, {
+            'raw_file': filename,
+            'offset': raw_size,
+            'prefix_hash': hash_file(file_path, raw_size),
+            'columns': columns,
+            'last_timestamp': last_timestamp.isoformat(),
+        })
+        AssetManifest(self.processed_data_path, asset).record(
+            '1m', file_path, total_rows, first_timestamp, last_timestamp,
+            timeframe_to_rule('1m'), self.storage.name, PROCESSING_VERSION
+        )
+        anomalies = [frame for frame in anomalies if not frame.empty]
+        self._record_quality(asset, '1m', pd.concat(anomalies, ignore_index=True) if anomalies else empty_anomalies(), total_rows)
+        self.catalog.record(asset, '1m', total_rows, first_timestamp, last_timestamp,
+                            [col for col in columns if col != 'timestamp'], self.storage.name,
+                            self.get_processed_file_path(asset, '1m'))
+        self.logger.info(f"Streamed {total_rows} rows for {asset} from {file_path} into the processed store.")
+        return total_rows
+
+    def preprocess_data(self, df):
+        """
+        Clean raw data: drop rows with missing values, parse timestamps and sort by time.
+
+        Parameters:
+            df (pd.DataFrame): Raw data with a 'timestamp' column.
+
+        Returns:
+            pd.DataFrame: Cleaned data.
+        """
+        if df.empty:
+            self.logger.warning("Received empty DataFrame for preprocessing.")
+            return df
+
+        initial_rows = len(df)
+        df = df.dropna()
+        self.logger.info(f"Dropped {initial_rows - len(df)} rows with missing values.")
+
+        if 'timestamp' in df.columns:
+            df = df.assign(timestamp=pd.to_datetime(df['timestamp']))
+            df = df.sort_values('timestamp').reset_index(drop=True)
+        else:
+            df = df.sort_index()
+        self.logger.info("Sorted data by timestamp.")
+        self.logger.info(f"DataFrame now has {len(df)} rows after preprocessing.")
+        return df
+
+    def resample_data(self, df, frequency):
+        """
+        Resample data to a lower frequency.
+
+        Parameters:
+            df (pd.DataFrame): Data indexed by timestamp or holding a 'timestamp' column.
+            frequency (str): Pandas resampling rule (e.g., '5min', '1h').
+
+        Returns:
+            pd.DataFrame: Resampled data indexed by timestamp.
+        """
+        if df.empty:
+            self.logger.warning(f"Cannot resample empty DataFrame with frequency {frequency}.")
+            return pd.DataFrame()
+
+        df = self._ensure_datetime_index(df)
+        aggregation = {col: rule for col, rule in RESAMPLE_AGGREGATION.items() if col in df.columns}
+        resampled = df.resample(frequency).agg(aggregation).dropna()
+        self.logger.info(f"Resampled data to frequency {frequency}.")
+        return resampled
+
+    def resample_cascade(self, df, timeframes, base_timeframe='1m', asset=None):
+        """
+        Build several timeframes in one cascade (e.g., 1m -> 5m -> 15m -> 30m -> 1H -> 4H -> 1D).
+        Each level is aggregated from the largest already-built level whose bar duration divides
+        its own, so the 1m data is scanned once and every later level works on far fewer rows.
+        The OHLCV and support/resistance rules are associative, so the result is identical to
+        resampling each timeframe from the base data.
+
+        Parameters:
+            df (pd.DataFrame): Base data (indexed by timestamp or holding a 'timestamp' column).
+            timeframes (list): Target timeframes (e.g., ['5m', '1H', '1D']).
+            base_timeframe (str): Timeframe of df (default '1m').
+            asset (str, optional): If given, the frames are wrapped as {asset: frames}.
+
+        Returns:
+            dict: {timeframe: DataFrame} including the base timeframe, or {asset: {...}} when
+                  asset is given, ready to pass as BacktestRunner(data_dict=...).
+        """
+        frames = {base_timeframe: self._ensure_datetime_index(df)}
+        durations = {base_timeframe: timeframe_to_timedelta(base_timeframe)}
+
+        for timeframe in sorted(set(timeframes) - {base_timeframe}, key=timeframe_to_timedelta):
+            duration = timeframe_to_timedelta(timeframe)
+            sources = [tf for tf in frames if duration % durations[tf] == pd.Timedelta(0)]
+            if not sources:
+                self.logger.warning(f"Cannot build {timeframe} from {base_timeframe} data. Skipping.")
+                continue
+            source = max(sources, key=durations.get)
+            resampled = self.resample_data(frames[source], timeframe_to_rule(timeframe))
+            if resampled.empty:
+                continue
+            frames[timeframe] = resampled
+            durations[timeframe] = duration
+
+        return {asset: frames} if asset is not None else frames
+
+    def build_information_bars(self, asset, kind, threshold):
+        """
+        Build (or reuse) volume, dollar-value or tick-count bars for an asset from its 1m data.
+        The bars are stored as a processed artifact under the label returned by
+        information_bar_label() (e.g., 'volume_5000') and can be used as a timeframe anywhere,
+        including as a strategy's primary_tf.
+
+        Parameters:
+            asset (str): The asset symbol.
+            kind (str): 'volume', 'dollar' or 'tick'.
+            threshold (float): Volume, traded value or number of 1m bars per bar.
+
+        Returns:
+            pd.DataFrame: The bars, in the same OHLCV schema as time bars.
+        """
+        label = information_bar_label(kind, threshold)
+        self.process_asset(asset, [label])
+        return self.load_processed_data(asset, label, validate=False)
+
+    def get_processed_file_path(self, asset, timeframe):
+        """
+        Get the path of the processed artifact for an asset and timeframe in the configured storage.
+        """
+        return self.storage.get_path(asset, timeframe)
+
+    def save_processed_data(self, df, asset, timeframe):
+        """
+        Persist processed data for an asset and timeframe.
+
+        Parameters:
+            df (pd.DataFrame): Processed data.
+            asset (str): The asset symbol.
+            timeframe (str): Timeframe label (e.g., '1H').
+        """
+        self._invalidate_cache(asset)
+        try:
+            df = apply_processed_dtypes(self._ensure_datetime_index(df))
+            path = self.storage.save(df, asset, timeframe)
+            self.catalog.record_frame(asset, timeframe, df, self.storage.name, path)
+            self.logger.info(f"Saved processed data for {asset} at {timeframe} timeframe to {path}")
+        except Exception as e:
+            self.logger.error(f"Error saving processed data for {asset} at {timeframe} timeframe: {e}")
+
+    def load_processed_data(self, asset, timeframe, start=None, end=None, columns=None, validate=True):
+        """
+        Load processed data for an asset and timeframe.
+        The configured storage is tried first, then the legacy CSV artifact.
+        With the Parquet backend, start/end prune year partitions and row groups and
+        columns limits the read to the requested columns.
+
+        Parameters:
+            asset (str): The asset symbol.
+            timeframe (str): Timeframe label (e.g., '1H').
+            start (str or pd.Timestamp, optional): First timestamp to load (inclusive).
+            end (str or pd.Timestamp, optional): Last timestamp to load (inclusive).
+            columns (list, optional): Columns to load (default: all).
+            validate (bool): Check the artifact against the asset manifest and rebuild it
+                first if its raw file, resample rule or processing version changed.
+
+        Returns:
+            pd.DataFrame: Processed data indexed by timestamp (compact if the manager was created
+                with compact=True), or an empty DataFrame if unavailable.
+        """
+        if validate and self.storage.exists(asset, timeframe):
+            self._rebuild_if_invalid(asset, timeframe)
+
+        cache_key = (self.processed_data_path, asset, timeframe,
+                     None if start is None else pd.Timestamp(start), None if end is None else pd.Timestamp(end),
+                     None if columns is None else tuple(columns), self.compact)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.logger.info(f"Loaded processed data for {asset} at {timeframe} timeframe from cache")
+                return cached
+
+        for storage in (self.storage, self.legacy_storage):
+            if storage.exists(asset, timeframe):
+                path = storage.get_path(asset, timeframe)
+                try:
+                    df = storage.load(asset, timeframe, start=start, end=end, columns=columns)
+                    self.logger.info(f"Loaded processed data for {asset} at {timeframe} timeframe from {path}")
+                    if self.compact:
+                        df = to_compact_frame(df)
+                    if self.cache is not None:
+                        df = self.cache.put(cache_key, df)
+                    return df
+                except Exception as e:
+                    self.logger.error(f"Error loading processed data for {asset} at {timeframe} timeframe from {path}: {e}")
+                    return pd.DataFrame()
+
+        self.logger.warning(f"Processed data file not found: {self.get_processed_file_path(asset, timeframe)}")
+        return pd.DataFrame()
+
+    def list_datasets(self):
+        """
+        List the processed artifacts recorded in the catalog without opening any data file.
+
+        Returns:
+            dict: {asset: {timeframe: metadata}} with rows, start, end, columns, storage format and path.
+        """
+        self.catalog.reload()
+        return self.catalog.datasets
+
+    def rebuild_catalog(self):
+        """
+        Rebuild the catalog from the processed artifacts on disk, e.g., for data
+        processed before the catalog existed.
+        """
+        if not os.path.isdir(self.processed_data_path):
+            return
+        for asset in sorted(os.listdir(self.processed_data_path)):
+            # Artifacts of the configured format take precedence over legacy CSV ones
+            sources = {}
+            for storage in (self.legacy_storage, self.storage):
+                sources.update(dict.fromkeys(storage.timeframes(asset), storage))
+            for timeframe, storage in sorted(sources.items()):
+                df = storage.load(asset, timeframe)
+                self.catalog.record_frame(asset, timeframe, df, storage.name, storage.get_path(asset, timeframe))
+        self.logger.info(f"Rebuilt dataset catalog at {self.catalog.path}")
+
+    def has_processed_data(self, asset, timeframe):
+        """
+        Check whether a processed artifact exists for an asset and timeframe without loading it.
+        """
+        return self.storage.exists(asset, timeframe) or self.legacy_storage.exists(asset, timeframe)
+
+    def lazy_data_dict(self, assets, timeframes):
+        """
+        Create a data dictionary that loads each asset/timeframe on first access.
+
+        Parameters:
+            assets (list): Asset symbols to expose.
+            timeframes (list): Timeframe labels to expose for every asset.
+
+        Returns:
+            LazyDataDict: Mapping usable wherever BacktestRunner or the optimizers expect a data_dict.
+        """
+        return LazyDataDict(self, assets, timeframes)
+
+    def get_config(self):
+        """
+        Constructor arguments that recreate an equivalent DataManager in another process.
+        """
+        return {
+            'raw_data_path': self.raw_data_path,
+            'processed_data_path': self.processed_data_path,
+            'storage_format': self.storage.name,
+            'cache': self.cache is not None,
+            'compact': self.compact,
+            'sr_windows': self.sr_windows,
+        }
+
+    def cache_stats(self):
+        """
+        Hit/miss/eviction counters of the frame cache, or None if caching is disabled.
+        """
+        return self.cache.stats() if self.cache is not None else None
+
+    def _invalidate_cache(self, asset):
+        """
+        Drop cached frames of an asset after its processed data was (re)written.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(lambda key: key[0] == self.processed_data_path and key[1] == asset)
+
+    def _rebuild_if_invalid(self, asset, timeframe):
+        """
+        Rebuild a processed artifact whose manifest entry no longer matches its raw file.
+        Artifacts without a manifest (e.g., written by an older version) or whose raw file
+        is no longer available are reused as they are.
+        """
+        manifest = AssetManifest(self.processed_data_path, asset)
+        entry = manifest.artifacts.get(timeframe)
+        if entry is None:
+            return
+        raw_path = os.path.join(self.raw_data_path, asset, entry['raw_file'])
+        if not os.path.exists(raw_path):
+            return
+        reason = self._invalid_reason(manifest, asset, timeframe, raw_path)
+        if reason is not None:
+            self.logger.info(f"Processed data for {asset} at {timeframe} timeframe is stale ({reason}); rebuilding.")
+            self.process_asset(asset, [timeframe])
+
+    def get_array_store_path(self, asset, timeframe):
+        """
+        Get the directory of the memory-mapped array store for an asset and timeframe.
+        """
+        return os.path.join(self.processed_data_path, asset, f"{asset}_{timeframe}_arrays")
+
+    def export_array_store(self, asset, timeframe, df=None):
+        """
+        Export processed data as a memory-mapped array store that optimizer workers
+        can attach to read-only instead of receiving a pickled copy of the frame.
+
+        Parameters:
+            asset (str): The asset symbol.
+            timeframe (str): Timeframe label (e.g., '5m').
+            df (pd.DataFrame, optional): Data to export; loaded from the processed store if omitted.
+
+        Returns:
+            SharedFrame: Picklable handle to the array store, or None if there is no data.
+        """
+        if df is None:
+            df = self.load_processed_data(asset, timeframe)
+        if df.empty:
+            self.logger.warning(f"No data to export for {asset} at {timeframe} timeframe.")
+            return None
+        directory = export_frame(df, self.get_array_store_path(asset, timeframe))
+        self.logger.info(f"Exported array store for {asset} at {timeframe} timeframe to {directory}")
+        return SharedFrame(directory)
+
+    def share_frames(self, asset, frames):
+        """
+        Export several timeframes of an asset as array stores.
+
+        Parameters:
+            asset (str): The asset symbol.
+            frames (dict): Mapping of timeframe labels to DataFrames (e.g., processed_data[asset]).
+
+        Returns:
+            dict: Mapping of timeframe labels to SharedFrame handles, usable wherever
+                  the optimizers or BacktestRunner expect a per-asset data dictionary.
+        """
+        shared = {}
+        for timeframe, df in frames.items():
+            handle = self.export_array_store(asset, timeframe, df)
+            if handle is not None:
+                shared[timeframe] = handle
+        return shared
+
+    def process_all_assets(self, timeframes=None, incremental=False, chunksize=None, parallel=False, max_workers=None):
+        """
+        Process every detected asset: preprocess the raw 1m data, save it and
+        resample it to each target timeframe that has not been processed yet.
+        A failure in one asset is logged and reported without aborting the batch.
+
+        Parameters:
+            timeframes (list): Target timeframes (default: every timeframe above 1m).
+            incremental (bool): Only ingest raw rows appended since the last run and
+                recompute the affected higher timeframe buckets (see update_asset()).
+            chunksize (int, optional): Stream raw files in chunks of this many rows
+                (see ingest_raw_data()) instead of loading them whole.
+            parallel (bool): Process assets concurrently in a process pool.
+            max_workers (int, optional): Number of worker processes (default: CPU count).
+
+        Returns:
+            dict: {asset: None on success, or the error message on failure}.
+        """
+        timeframes = timeframes or [tf for tf in TIMEFRAME_RULES if tf != '1m']
+        assets = self.detect_assets()
+        statuses = {}
+
+        if parallel and len(assets) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        _process_asset_worker, self.get_config(), asset, timeframes, incremental, chunksize
+                    ): asset
+                    for asset in assets
+                }
+                for future in as_completed(futures):
+                    asset = futures[future]
+                    try:
+                        error, elapsed = future.result()
+                    except Exception as e:  # The worker process itself died
+                        error, elapsed = str(e), 0.0
+                    statuses[asset] = error
+                    self._log_asset_progress(asset, error, elapsed, len(statuses), len(assets))
+        else:
+            for asset in assets:
+                error, elapsed = _run_asset(self, asset, timeframes, incremental, chunksize)
+                statuses[asset] = error
+                self._log_asset_progress(asset, error, elapsed, len(statuses), len(assets))
+
+        failed = [asset for asset, error in statuses.items() if error is not None]
+        if failed:
+            self.logger.error(f"Processing failed for {len(failed)}/{len(assets)} assets: {failed}")
+        return statuses
+
+    def _log_asset_progress(self, asset, error, elapsed, done, total):
+        if error is None:
+            self.logger.info(f"[{done}/{total}] Processed {asset} in {elapsed:.1f}s.")
+        else:
+            self.logger.error(f"[{done}/{total}] Failed to process {asset} after {elapsed:.1f}s: {error}")
+
+    def process_asset(self, asset, timeframes, chunksize=None):
+        """
+        Process a single asset for the given target timeframes.
+        Artifacts recorded as valid in the asset manifest are reused; exactly the
+        invalid or missing ones are rebuilt.
+
+        Parameters:
+            asset (str): The asset symbol.
+            timeframes (list): Target timeframes.
+            chunksize (int, optional): Stream the raw file in chunks of this many rows.
+        """
+        raw_files = self.get_raw_files(asset)
+        if not raw_files:
+            self.logger.warning(f"No raw data files found for asset {asset}. Skipping.")
+            return
+
+        raw_path = os.path.join(self.raw_data_path, asset, raw_files[0])
+        manifest = AssetManifest(self.processed_data_path, asset)
+        invalid = []
+        for timeframe in ['1m'] + [tf for tf in timeframes if tf != '1m']:
+            reason = self._invalid_reason(manifest, asset, timeframe, raw_path)
+            if reason is None:
+                self.logger.info(f"Processed data for {asset} at {timeframe} timeframe is up to date. Skipping.")
+            else:
+                self.logger.info(f"Building {asset} at {timeframe} timeframe ({reason}).")
+                invalid.append(timeframe)
+        if not invalid:
+            return
+
+        if '1m' not in invalid:
+            df = None if chunksize else self.storage.load(asset, '1m')
+        elif chunksize:
+            if not self.ingest_raw_data(asset, raw_files[0], chunksize=chunksize):
+                return
+            df = None
+        else:
+            raw_size = os.path.getsize(raw_path)
+            df = self.load_raw_data(asset, raw_files[0])
+            columns = list(df.columns)
+            # Checked before preprocessing sorts the rows, so out-of-order timestamps are visible
+            anomalies = scan_quality(df, timeframe_to_timedelta('1m'))
+            df = self.preprocess_data(df)
+            if df.empty:
+                self.logger.warning(f"Preprocessed DataFrame for {asset} is empty. Skipping.")
+                return
+            df = self._ensure_datetime_index(df)
+            self.save_processed_data(df, asset, '1m')
+            manifest.record_frame('1m', raw_path, df, timeframe_to_rule('1m'), self.storage.name, PROCESSING_VERSION)
+            self._record_quality(asset, '1m', anomalies, len(df))
+            self._save_ingest_state(asset, {
+                'raw_file': raw_files[0],
+                'offset': raw_size,
+                'prefix_hash': hash_file(raw_path, raw_size),
+                'columns': columns,
+                'last_timestamp': df.index[-1].isoformat(),
+            })
+
+        manifest = AssetManifest(self.processed_data_path, asset)
+        missing = [tf for tf in invalid if tf != '1m']
+        time_missing = [tf for tf in missing if parse_information_bar_label(tf) is None]
+        if df is None:
+            # Streaming mode: resample the stored 1m data out of core instead of loading it
+            self.resample_out_of_core(asset, time_missing, chunk_rows=chunksize, raw_path=raw_path)
+            missing = [tf for tf in missing if tf not in time_missing]
+            frames = {}
+            if missing:
+                df = self.storage.load(asset, '1m')
+        else:
+            frames = self.resample_cascade(df, time_missing)
+        for timeframe in missing:
+            bar_spec = parse_information_bar_label(timeframe)
+            if bar_spec is not None:
+                frames[timeframe] = build_information_bars(df, *bar_spec)
+        for timeframe in missing:
+            resampled_df = frames.get(timeframe)
+            if resampled_df is None or resampled_df.empty:
+                self.logger.warning(f"Resampled DataFrame for {asset} at {timeframe} timeframe is empty. Skipping saving.")
+                continue
+            if self.sr_windows:
+                resampled_df = calculate_support_resistance_bank(resampled_df, self.sr_windows)
+            self.save_processed_data(resampled_df, asset, timeframe)
+            manifest.record_frame(timeframe, raw_path, resampled_df, self._rule_for(timeframe), self.storage.name,
+                                  PROCESSING_VERSION, self._sr_windows_for(timeframe))
+            self._record_quality(asset, timeframe, scan_quality(resampled_df, self._interval_for(timeframe)), len(resampled_df))
+
+    def resample_out_of_core(self, asset, timeframes, chunk_rows=1_000_000, raw_path=None):
+        """
+        Resample an asset's stored 1m data to higher timeframes without loading it into memory.
+        The 1m store is streamed in time order; rows of buckets that may still receive data
+        (the last bucket of each timeframe) are carried over to the next chunk, and every
+        completed bar is written to the target artifacts as it is produced. The result is
+        identical to resample_cascade() on the full data.
+
+        Parameters:
+            asset (str): The asset symbol.
+            timeframes (list): Target timeframes (e.g., ['5m', '1H', '1D']).
+            chunk_rows (int): Number of 1m rows read per chunk.
+            raw_path (str, optional): Raw file recorded in the manifest (default: the asset's raw file).
+
+        Returns:
+            dict: Number of bars written per timeframe.
+        """
+        timeframes = sorted(set(timeframes) - {'1m'}, key=timeframe_to_timedelta)
+        if not timeframes:
+            return {}
+        if raw_path is None:
+            raw_path = os.path.join(self.raw_data_path, asset, self.get_raw_files(asset)[0])
+        self._invalidate_cache(asset)
+        state = {tf: {'rows': 0, 'start': None, 'end': None, 'columns': None, 'history': None, 'anomalies': []}
+                 for tf in timeframes}
+
+        carry = None
+        for chunk in self.storage.iter_chunks(asset, '1m', chunk_rows):
+            if chunk.empty:
+                continue
+            data = chunk if carry is None else pd.concat([carry, chunk])
+            # Buckets from each timeframe's last bucket start onwards are not complete yet
+            cutoffs = {tf: data.index[-1].floor(timeframe_to_rule(tf)) for tf in timeframes}
+            self._write_completed_bars(asset, data, cutoffs, state)
+            carry = data[data.index >= min(cutoffs.values())]
+        if carry is not None:
+            self._write_completed_bars(asset, carry, None, state)
+
+        manifest = AssetManifest(self.processed_data_path, asset)
+        for timeframe, tf_state in state.items():
+            if not tf_state['rows']:
+                self.logger.warning(f"Resampled DataFrame for {asset} at {timeframe} timeframe is empty. Skipping saving.")
+                self.storage.delete(asset, timeframe)
+                continue
+            manifest.record(timeframe, raw_path, tf_state['rows'], tf_state['start'], tf_state['end'],
+                            self._rule_for(timeframe), self.storage.name, PROCESSING_VERSION, self._sr_windows_for(timeframe))
+            self.catalog.record(asset, timeframe, tf_state['rows'], tf_state['start'], tf_state['end'], tf_state['columns'],
+                                self.storage.name, self.get_processed_file_path(asset, timeframe))
+            anomalies = [frame for frame in tf_state['anomalies'] if not frame.empty]
+            self._record_quality(asset, timeframe, pd.concat(anomalies, ignore_index=True) if anomalies else empty_anomalies(),
+                                 tf_state['rows'])
+            self.logger.info(f"Resampled {asset} to {tf_state['rows']} {timeframe} bars out of core.")
+        return {tf: tf_state['rows'] for tf, tf_state in state.items()}
+
+    def _write_completed_bars(self, asset, data, cutoffs, state):
+        """
+        Resample a window of 1m data and write the bars that are complete (before each
+        timeframe's cutoff, or all of them when cutoffs is None) and not yet written.
+        """
+        frames = self.resample_cascade(data, list(state))
+        for timeframe, tf_state in state.items():
+            bars = frames.get(timeframe)
+            if bars is None or bars.empty:
+                continue
+            if tf_state['end'] is not None:
+                bars = bars[bars.index > tf_state['end']]
+            if cutoffs is not None:
+                bars = bars[bars.index < cutoffs[timeframe]]
+            if bars.empty:
+                continue
+            if self.sr_windows:
+                # Rolling windows reach back into the bars written by earlier chunks
+                history = tf_state['history']
+                extended = bars if history is None else pd.concat([history, bars])
+                bank = calculate_support_resistance_bank(extended, self.sr_windows)
+                tf_state['history'] = extended.iloc[-(max(self.sr_windows) - 1):] if max(self.sr_windows) > 1 else extended.iloc[:0]
+                bars = bank.iloc[len(extended) - len(bars):]
+            tf_state['anomalies'].append(scan_quality(bars, timeframe_to_timedelta(timeframe), tf_state['end']))
+            bars = apply_processed_dtypes(bars)
+            if tf_state['rows'] == 0:
+                self.storage.save(bars, asset, timeframe)
+                tf_state['start'] = bars.index[0]
+                tf_state['columns'] = list(bars.columns)
+            else:
+                self.storage.append(bars, asset, timeframe)
+            tf_state['rows'] += len(bars)
+            tf_state['end'] = bars.index[-1]
+
+    def _invalid_reason(self, manifest, asset, timeframe, raw_path):
+        """
+        Explain why an artifact must be rebuilt, or return None if it can be reused.
+        """
+        if not self.storage.exists(asset, timeframe):
+            return 'no processed artifact'
+        return manifest.invalid_reason(timeframe, raw_path, self._rule_for(timeframe), self.storage.name,
+                                       PROCESSING_VERSION, self._sr_windows_for(timeframe))
+
+    def load_quality_index(self, asset, timeframe):
+        """
+        Load the gap/anomaly index stored next to a processed artifact.
+
+        Returns:
+            QualityIndex: Index whose query()/gaps()/summary() answer quality questions without rescanning.
+        """
+        return QualityIndex(self.processed_data_path, asset, timeframe)
+
+    def _record_quality(self, asset, timeframe, anomalies, rows, since=None):
+        """
+        Persist the anomalies of an artifact: a full scan replaces its quality index,
+        a rescanned tail replaces the anomalies from `since` onwards.
+        """
+        index = self.load_quality_index(asset, timeframe)
+        if since is None:
+            index.replace(anomalies, rows)
+        else:
+            index.replace_tail(anomalies, since, rows)
+        if not anomalies.empty:
+            issues = {kind: count for kind, count in index.summary().items() if count}
+            self.logger.warning(f"Data quality issues in {asset} at {timeframe} timeframe: {issues}")
+
+    def _rule_for(self, timeframe):
+        """
+        Build rule recorded in the manifest: the resample rule of a time timeframe,
+        or the label itself for information bars.
+        """
+        if parse_information_bar_label(timeframe) is not None:
+            return timeframe
+        return timeframe_to_rule(timeframe)
+
+    def _interval_for(self, timeframe):
+        """
+        Expected spacing of an artifact's bars (None for information bars).
+        """
+        if parse_information_bar_label(timeframe) is not None:
+            return None
+        return timeframe_to_timedelta(timeframe)
+
+    def _sr_windows_for(self, timeframe):
+        """
+        Support/resistance bank windows stored with an artifact (the 1m base data has none).
+        """
+        return self.sr_windows if timeframe != '1m' else None
+
+    def _load_history(self, asset, timeframe, before, bars):
+        """
+        Load the last `bars` rows of an artifact strictly before a timestamp.
+        The time span read is widened until enough rows are found or the start of the
+        artifact (from the catalog) is reached, so gaps in the data are handled.
+        """
+        if bars <= 0:
+            return self.storage.load(asset, timeframe, start=before).iloc[:0]
+        entry = self.catalog.entry(asset, timeframe)
+        first = pd.Timestamp(entry['start']) if entry and entry['start'] else None
+        span = timeframe_to_timedelta(timeframe) * bars
+        while True:
+            start = before - span if first is not None else None
+            history = self.storage.load(asset, timeframe, start=start, end=before)
+            history = history[history.index < before]
+            if len(history) >= bars or start is None or start <= first:
+                return history.iloc[-bars:]
+            span *= 2
+
+    def update_asset(self, asset, timeframes):
+        """
+        Incrementally refresh an asset from rows appended to its raw file since the last run.
+        Only the new tail of the raw file is parsed, the new 1m rows are appended, and for each
+        target timeframe only the buckets touched by the new rows (including the last, possibly
+        partial, bucket) are recomputed and written back.
+        Falls back to a full process_asset() when there is no usable ingest state.
+
+        Parameters:
+            asset (str): The asset symbol.
+            timeframes (list): Target timeframes.
+        """
+        raw_files = self.get_raw_files(asset)
+        if not raw_files:
+            self.logger.warning(f"No raw data files found for asset {asset}. Skipping.")
+            return
+
+        state = self._load_ingest_state(asset)
+        raw_path = os.path.join(self.raw_data_path, asset, raw_files[0])
+        raw_size = os.path.getsize(raw_path)
+        targets = [tf for tf in timeframes if tf != '1m']
+        manifest = AssetManifest(self.processed_data_path, asset)
+        # Appending to the raw file is expected; any other reason to rebuild needs a full pass
+        reasons = [self._invalid_reason(manifest, asset, tf, raw_path) for tf in ['1m'] + targets]
+        if (state is None or state.get('raw_file') != raw_files[0] or raw_size < state['offset']
+                or any(reason not in (None, 'raw file changed') for reason in reasons)):
+            self.logger.info(f"No usable incremental state for {asset}; running a full rebuild.")
+            self.process_asset(asset, timeframes)
+            return
+        # Only a pure append keeps the consumed bytes; a rewrite that grew the file does not
+        if state.get('prefix_hash') != hash_file(raw_path, state['offset']):
+            self.logger.info(f"Raw file of {asset} was rewritten before the last ingested byte; running a full rebuild.")
+            self.process_asset(asset, timeframes)
+            return
+
+        new_rows, consumed = self._read_raw_tail(raw_path, state['offset'], state['columns'])
+        quality_tails = {}
+        if not new_rows.empty:
+            last_timestamp = pd.Timestamp(state['last_timestamp'])
+            quality_tails['1m'] = (scan_quality(new_rows, timeframe_to_timedelta('1m'), last_timestamp), last_timestamp)
+            new_rows = self.preprocess_data(new_rows)
+            new_rows = self._ensure_datetime_index(new_rows)
+            new_rows = new_rows[new_rows.index > pd.Timestamp(state['last_timestamp'])]
+        if new_rows.empty:
+            self.logger.info(f"No new raw rows for {asset}. Processed data is up to date.")
+            added = {}
+            removed = {}
+        else:
+            self._invalidate_cache(asset)
+            self.storage.append(apply_processed_dtypes(new_rows), asset, '1m')
+            self.logger.info(f"Appended {len(new_rows)} new 1m rows for {asset}.")
+            added = {'1m': new_rows}
+            removed = {}
+
+            # First bucket touched by the new rows per timeframe; it may already hold older 1m rows
+            time_targets = [tf for tf in targets if parse_information_bar_label(tf) is None]
+            bucket_starts = {tf: new_rows.index[0].floor(timeframe_to_rule(tf)) for tf in time_targets}
+            if time_targets:
+                source = self.storage.load_tail(asset, '1m', min(bucket_starts.values()))
+                frames = self.resample_cascade(source, time_targets)
+                for timeframe in time_targets:
+                    if timeframe not in frames:
+                        continue
+                    resampled = frames[timeframe]
+                    resampled = resampled[resampled.index >= bucket_starts[timeframe]]
+                    if self.sr_windows:
+                        # The rolling windows of the recomputed bars reach back into stored bars
+                        history = self._load_history(asset, timeframe, bucket_starts[timeframe], max(self.sr_windows) - 1)
+                        resampled = calculate_support_resistance_bank(
+                            pd.concat([history[resampled.columns], resampled]), self.sr_windows
+                        ).iloc[len(history):]
+                    previous = self._load_history(asset, timeframe, bucket_starts[timeframe], 1)
+                    quality_tails[timeframe] = (
+                        scan_quality(resampled, timeframe_to_timedelta(timeframe), previous.index[-1] if len(previous) else None),
+                        bucket_starts[timeframe]
+                    )
+                    removed[timeframe] = len(self.storage.load_tail(asset, timeframe, bucket_starts[timeframe]))
+                    self.storage.replace_tail(resampled, asset, timeframe, bucket_starts[timeframe])
+                    added[timeframe] = resampled
+                    self.logger.info(f"Recomputed {len(resampled)} {timeframe} bars for {asset} from {bucket_starts[timeframe]}.")
+
+            # Information bar boundaries depend on the cumulative sum since the first row, so they are rebuilt
+            bar_targets = [tf for tf in targets if tf not in time_targets]
+            if bar_targets:
+                source = self.storage.load(asset, '1m')
+                for timeframe in bar_targets:
+                    bars = build_information_bars(source, *parse_information_bar_label(timeframe))
+                    if self.sr_windows:
+                        bars = calculate_support_resistance_bank(bars, self.sr_windows)
+                    entry = manifest.artifacts.get(timeframe)
+                    removed[timeframe] = entry['rows'] if entry else 0
+                    self.storage.save(apply_processed_dtypes(bars), asset, timeframe)
+                    added[timeframe] = bars
+                    quality_tails[timeframe] = (scan_quality(bars, None), None)
+                    self.logger.info(f"Rebuilt {len(bars)} {timeframe} bars for {asset}.")
+            state['last_timestamp'] = new_rows.index[-1].isoformat()
+
+        for timeframe in ['1m'] + targets:
+            self._refresh_manifest_entry(manifest, asset, timeframe, raw_path, removed.get(timeframe, 0), added.get(timeframe))
+            entry = manifest.artifacts[timeframe]
+            frame = added.get(timeframe)
+            self.catalog.record(asset, timeframe, entry['rows'], entry['start'], entry['end'],
+                                frame.columns if frame is not None else None, self.storage.name,
+                                self.get_processed_file_path(asset, timeframe))
+            if timeframe in quality_tails:
+                self._record_quality(asset, timeframe, quality_tails[timeframe][0], entry['rows'], since=quality_tails[timeframe][1])
+        state['offset'] += consumed
+        state['prefix_hash'] = hash_file(raw_path, state['offset'])
+        self._save_ingest_state(asset, state)
+
+    def _refresh_manifest_entry(self, manifest, asset, timeframe, raw_path, removed, added):
+        """
+        Update a manifest entry after an incremental update replaced `removed` rows with `added`.
+        """
+        entry = manifest.artifacts.get(timeframe)
+        if entry is None or not entry['rows']:
+            manifest.record_frame(timeframe, raw_path, self.storage.load(asset, timeframe),
+                                  self._rule_for(timeframe), self.storage.name, PROCESSING_VERSION,
+                                  self._sr_windows_for(timeframe))
+            return
+        has_new_rows = added is not None and len(added) > 0
+        manifest.record(
+            timeframe, raw_path,
+            entry['rows'] - removed + (len(added) if has_new_rows else 0),
+            entry['start'],
+            added.index[-1] if has_new_rows else entry['end'],
+            self._rule_for(timeframe), self.storage.name, PROCESSING_VERSION, self._sr_windows_for(timeframe)
+        )
+
+    def _read_raw_tail(self, raw_path, offset, columns):
+        """
+        Parse the complete lines appended to a raw CSV file after a byte offset.
+
+        Returns:
+            tuple: (DataFrame of new rows, number of bytes consumed)
+        """
+        with open(raw_path, 'rb') as f:
+            f.seek(offset)
+            tail = f.read()
+        # A trailing line without a newline may still be being written; leave it for the next run
+        consumed = tail.rfind(b'\n') + 1
+        if consumed == 0:
+            return pd.DataFrame(columns=columns), 0
+        df = pd.read_csv(io.BytesIO(tail[:consumed]), header=None, names=columns)
+        self.logger.info(f"Read {len(df)} new raw rows from {raw_path}")
+        return df, consumed
+
+    def _get_ingest_state_path(self, asset):
+        return os.path.join(self.processed_data_path, asset, 'ingest_state.json')
+
+    def _load_ingest_state(self, asset):
+        path = self._get_ingest_state_path(asset)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_ingest_state(self, asset, state):
+        path = self._get_ingest_state_path(asset)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(state, f, indent=2)
+
+    @staticmethod
+    def _ensure_datetime_index(df):
+        """
+        Return the frame indexed by a DatetimeIndex, moving a 'timestamp' column to the index if needed.
+        """
+        if 'timestamp' in df.columns:
+            df = df.set_index(pd.to_datetime(df['timestamp'])).drop(columns='timestamp')
+        elif not isinstance(df.index, pd.DatetimeIndex):
+            df = df.set_axis(pd.to_datetime(df.index), axis=0)
+        return df.rename_axis('timestamp')
+
+
+def _run_asset(data_manager, asset, timeframes, incremental, chunksize):
+    """
+    Process one asset and capture any failure instead of raising.
+
+    Returns:
+        tuple: (error message or None, elapsed seconds)
+    """
+    start = time.perf_counter()
+    try:
+        if incremental:
+            data_manager.update_asset(asset, timeframes)
+        else:
+            data_manager.process_asset(asset, timeframes, chunksize=chunksize)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return error, time.perf_counter() - start
+
+
+def _process_asset_worker(config, asset, timeframes, incremental, chunksize):
+    """
+    Process pool entry point: build a DataManager in the worker and process a single asset.
+    """
+    data_manager = DataManager(**config)
+    return _run_asset(data_manager, asset, timeframes, incremental, chunksize)
@@ -0,0 +1,111 @@
+# data/frame_cache.py
+
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+# Default memory budget of the process-wide cache (1 GiB)
+DEFAULT_CACHE_BYTES = 1 << 30
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """
+    Memory used by a frame's columns and index, in bytes.
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def make_read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Flag the arrays behind a frame as read-only so cached data cannot be modified in place.
+    """
+    for block in df._mgr.blocks:
+        values = getattr(block.values, '_ndarray', block.values)
+        if hasattr(values, 'flags'):
+            values.flags.writeable = False
+    return df
+
+
+class FrameCache:
+    """
+    In-process LRU cache of DataFrames bounded by a byte budget.
+    Entries are stored read-only and handed out as shallow copies: callers can add
+    or replace columns on their copy, but in-place writes to cached data raise.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        Initialize the cache.
+
+        Parameters:
+            max_bytes (int): Memory budget; least recently used entries are evicted beyond it.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (frame, nbytes)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return a read-only view of the cached frame for key, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0].copy(deep=False)
+
+    def put(self, key, df: pd.DataFrame):
+        """
+        Cache a frame under key, evicting least recently used entries to stay within budget.
+        Frames larger than the whole budget are not cached.
+
+        Returns:
+            pd.DataFrame: A read-only view of the cached frame (or df itself if it was not cached).
+        """
+        nbytes = frame_nbytes(df)
+        if nbytes > self.max_bytes:
+            return df
+        df = make_read_only(df)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            while self._entries and self.current_bytes + nbytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+            self._entries[key] = (df, nbytes)
+            self.current_bytes += nbytes
+        return df.copy(deep=False)
+
+    def invalidate(self, predicate=None):
+        """
+        Drop entries whose key matches predicate (or every entry if predicate is None).
+        """
+        with self._lock:
+            for key in [k for k in self._entries if predicate is None or predicate(k)]:
+                self.current_bytes -= self._entries.pop(key)[1]
+
+    def stats(self) -> dict:
+        """
+        Hit/miss/eviction counters and current usage.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+# Process-wide cache shared by every DataManager that does not bring its own
+default_frame_cache = FrameCache()
@@ -0,0 +1,117 @@
+# data/lazy_data.py
+
+from collections.abc import Mapping
+
+
+class LazyDataDict(Mapping):
+    """
+    Drop-in replacement for the nested data_dict ({asset: {timeframe: DataFrame}}) that
+    loads an asset/timeframe only when it is first accessed.
+    Pickling transfers only the DataManager configuration and the asset/timeframe lists,
+    so multiprocessing tasks stay small and each process loads what it actually uses.
+    """
+
+    def __init__(self, data_manager, assets, timeframes):
+        """
+        Initialize the lazy mapping.
+
+        Parameters:
+            data_manager (DataManager): Manager used to load processed data.
+            assets (list): Asset symbols exposed by the mapping.
+            timeframes (list): Timeframe labels exposed for every asset.
+        """
+        self._data_manager = data_manager
+        self._config = data_manager.get_config()
+        self.assets = list(assets)
+        self.timeframes = list(timeframes)
+        self._by_asset = {}
+
+    @property
+    def data_manager(self):
+        if self._data_manager is None:
+            # Imported here because data_manager imports this module
+            from .data_manager import DataManager
+            self._data_manager = DataManager(**self._config)
+        return self._data_manager
+
+    def __getitem__(self, asset):
+        if asset not in self.assets:
+            raise KeyError(asset)
+        if asset not in self._by_asset:
+            self._by_asset[asset] = LazyTimeframes(self, asset, self.timeframes)
+        return self._by_asset[asset]
+
+    def __iter__(self):
+        return iter(self.assets)
+
+    def __len__(self):
+        return len(self.assets)
+
+    def __contains__(self, asset):
+        return asset in self.assets
+
+    def __getstate__(self):
+        return {'config': self._config, 'assets': self.assets, 'timeframes': self.timeframes}
+
+    def __setstate__(self, state):
+        self._data_manager = None
+        self._config = state['config']
+        self.assets = state['assets']
+        self.timeframes = state['timeframes']
+        self._by_asset = {}
+
+    def __repr__(self):
+        return f"LazyDataDict(assets={self.assets}, timeframes={self.timeframes})"
+
+
+class LazyTimeframes(Mapping):
+    """
+    Per-asset view of a LazyDataDict: {timeframe: DataFrame}, loaded on first access.
+    Membership only checks that the processed artifact exists; it never loads data.
+    """
+
+    def __init__(self, parent, asset, timeframes):
+        self._parent = parent
+        self.asset = asset
+        self.timeframes = list(timeframes)
+        self._frames = {}
+
+    @property
+    def loaded(self):
+        """
+        Timeframes that have been loaded so far.
+        """
+        return list(self._frames)
+
+    def __getitem__(self, timeframe):
+        if timeframe not in self._frames:
+            if timeframe not in self:
+                raise KeyError(timeframe)
+            df = self._parent.data_manager.load_processed_data(self.asset, timeframe)
+            if df.empty:
+                raise KeyError(timeframe)
+            self._frames[timeframe] = df
+        return self._frames[timeframe]
+
+    def __iter__(self):
+        return (timeframe for timeframe in self.timeframes if timeframe in self)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, timeframe):
+        if timeframe in self._frames:
+            return True
+        return timeframe in self.timeframes and self._parent.data_manager.has_processed_data(self.asset, timeframe)
+
+    def __getstate__(self):
+        return {'parent': self._parent, 'asset': self.asset, 'timeframes': self.timeframes}
+
+    def __setstate__(self, state):
+        self._parent = state['parent']
+        self.asset = state['asset']
+        self.timeframes = state['timeframes']
+        self._frames = {}
+
+    def __repr__(self):
+        return f"LazyTimeframes(asset='{self.asset}', timeframes={self.timeframes}, loaded={self.loaded})"
@@ -0,0 +1,126 @@
+# data/manifest.py
+
+import hashlib
+import json
+import os
+import pandas as pd
+from utils.helpers import LEGACY_RULES
+
+# Bytes read per step while hashing a raw file
+HASH_CHUNK_SIZE = 1 << 22
+
+# Digests of files already hashed in this process, keyed by (path, length, size, mtime_ns)
+_hash_memo = {}
+
+
+def hash_file(path: str, length: int = None) -> str:
+    """
+    Compute a BLAKE2 content hash of a raw file, or of its first `length` bytes, reading it
+    in chunks. The digest is memoized per file size and mtime, so recording several
+    artifacts built from the same raw file reads it once.
+
+    Parameters:
+        path (str): File to hash.
+        length (int, optional): Number of leading bytes to hash (default: the whole file).
+
+    Returns:
+        str: Hex digest.
+    """
+    stat = os.stat(path)
+    if length is not None and length >= stat.st_size:
+        length = None  # The whole file: shares the memoized digest
+    key = (os.path.abspath(path), length, stat.st_size, stat.st_mtime_ns)
+    if key in _hash_memo:
+        return _hash_memo[key]
+    remaining = stat.st_size if length is None else length
+    digest = hashlib.blake2b(str(remaining).encode(), digest_size=16)
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            chunk = f.read(min(HASH_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    if len(_hash_memo) >= 256:
+        _hash_memo.clear()
+    _hash_memo[key] = digest.hexdigest()
+    return _hash_memo[key]
+
+
+class AssetManifest:
+    """
+    Per-asset record of how every processed artifact was built: the raw file
+    (name, size, mtime and content hash), the row count and time range, the resample
+    rule, the storage format and the processing code version.
+    Stored as '<processed>/<asset>/manifest.json'.
+    """
+
+    def __init__(self, processed_data_path: str, asset: str):
+        self.asset = asset
+        self.path = os.path.join(processed_data_path, asset, 'manifest.json')
+        self.artifacts = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.artifacts = json.load(f).get('artifacts', {})
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({'asset': self.asset, 'artifacts': self.artifacts}, f, indent=2)
+
+    def record(self, timeframe, raw_path, rows, start, end, resample_rule, storage_format, version, sr_windows=None):
+        """
+        Record (or replace) the entry of an artifact and persist the manifest.
+        sr_windows lists the support/resistance bank windows stored with the artifact.
+        """
+        stat = os.stat(raw_path)
+        self.artifacts[timeframe] = {
+            'raw_file': os.path.basename(raw_path),
+            'raw_size': stat.st_size,
+            'raw_mtime': stat.st_mtime,
+            'raw_hash': hash_file(raw_path),
+            'rows': int(rows),
+            'start': pd.Timestamp(start).isoformat() if rows else None,
+            'end': pd.Timestamp(end).isoformat() if rows else None,
+            'resample_rule': resample_rule,
+            'storage_format': storage_format,
+            'version': version,
+            'sr_windows': list(sr_windows) if sr_windows else None,
+        }
+        self.save()
+
+    def record_frame(self, timeframe, raw_path, df, resample_rule, storage_format, version, sr_windows=None):
+        """
+        Record an artifact from the frame that was written for it.
+        """
+        start, end = (df.index[0], df.index[-1]) if len(df) else (None, None)
+        self.record(timeframe, raw_path, len(df), start, end, resample_rule, storage_format, version, sr_windows)
+
+    def invalid_reason(self, timeframe, raw_path, resample_rule, storage_format, version, sr_windows=None):
+        """
+        Check whether an artifact can be reused.
+
+        Returns:
+            str: Why the artifact must be rebuilt, or None if it is valid.
+        """
+        entry = self.artifacts.get(timeframe)
+        if entry is None:
+            return 'not in manifest'
+        if entry['version'] != version:
+            return f"built by processing version {entry['version']}"
+        if LEGACY_RULES.get(entry['resample_rule'], entry['resample_rule']) != resample_rule:
+            return f"built with resample rule {entry['resample_rule']}"
+        if entry['storage_format'] != storage_format:
+            return f"stored as {entry['storage_format']}"
+        if entry.get('sr_windows') != (list(sr_windows) if sr_windows else None):
+            return f"built with support/resistance windows {entry.get('sr_windows')}"
+        if entry['raw_file'] != os.path.basename(raw_path):
+            return f"built from raw file {entry['raw_file']}"
+        stat = os.stat(raw_path)
+        if stat.st_size == entry['raw_size'] and stat.st_mtime == entry['raw_mtime']:
+            return None
+        # Size or mtime moved: only a content change invalidates the artifact. Any byte may
+        # have changed (e.g., a corrected price mid-file), so the whole file is hashed.
+        if stat.st_size != entry['raw_size'] or hash_file(raw_path) != entry.get('raw_hash'):
+            return 'raw file changed'
+        return None
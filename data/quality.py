@@ -0,0 +1,193 @@
+# data/quality.py
+
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# Anomaly kinds recorded in a quality index
+ANOMALY_KINDS = (
+    'out_of_order',  # timestamp earlier than the previous row
+    'duplicate',     # timestamp equal to an earlier row
+    'gap',           # bars missing between two rows (count = number of missing bars)
+    'high_low',      # High < Low
+    'ohlc_range',    # Open or Close outside [Low, High]
+    'non_positive',  # a price <= 0
+    'negative_volume',
+)
+
+
+def empty_anomalies() -> pd.DataFrame:
+    return pd.DataFrame({
+        'kind': pd.Series(dtype='object'),
+        'start': pd.Series(dtype='datetime64[ns]'),
+        'end': pd.Series(dtype='datetime64[ns]'),
+        'count': pd.Series(dtype='int64'),
+    })
+
+
+def scan_quality(df: pd.DataFrame, expected_interval: pd.Timedelta, previous_timestamp=None) -> pd.DataFrame:
+    """
+    Check OHLCV data in one vectorized pass: timestamp monotonicity, duplicates,
+    gaps against the expected bar interval and OHLC consistency.
+    Rows are checked in their stored order, so run it before sorting to catch
+    out-of-order timestamps.
+
+    Parameters:
+        df (pd.DataFrame): Data indexed by timestamp or holding a 'timestamp' column.
+        expected_interval (pd.Timedelta): Bar interval of the data (e.g., 1 minute), or None
+            for bars without a fixed interval (no gap check).
+        previous_timestamp (pd.Timestamp, optional): Last timestamp before df, for scanning
+            data in chunks or appended tails without missing the boundary.
+
+    Returns:
+        pd.DataFrame: One row per anomaly with columns kind, start, end and count.
+    """
+    if df.empty:
+        return empty_anomalies()
+    if 'timestamp' in df.columns:
+        timestamps = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]')
+    else:
+        timestamps = pd.DatetimeIndex(df.index).as_unit('ns').to_numpy()
+    valid = ~np.isnat(timestamps)
+    if not valid.all():
+        df, timestamps = df[valid], timestamps[valid]
+        if df.empty:
+            return empty_anomalies()
+    ts = timestamps.view('int64')
+    interval = pd.Timedelta(expected_interval).value if expected_interval is not None else None
+    first = pd.Timestamp(previous_timestamp).value if previous_timestamp is not None else None
+
+    parts = []
+    previous, diffs = _diffs(ts, first)
+    out_of_order = np.flatnonzero(diffs < 0)
+    parts.append(('out_of_order', previous[out_of_order], ts[out_of_order], np.ones(len(out_of_order), dtype='int64')))
+
+    # Duplicates and gaps are judged on time order, so an out-of-order row is not also a gap.
+    # Rows older than previous_timestamp belong to data scanned earlier and are only out of order.
+    ordered = ts
+    if len(out_of_order):
+        ordered = np.sort(ts if first is None else ts[ts >= first], kind='stable')
+        if len(ordered) == 0:
+            ordered = ts[:0]
+            previous, diffs = ordered, ordered
+        else:
+            previous, diffs = _diffs(ordered, first)
+    duplicate = np.flatnonzero(diffs == 0)
+    if first is None:
+        duplicate = duplicate[duplicate > 0]
+    parts.append(('duplicate', ordered[duplicate], ordered[duplicate], np.ones(len(duplicate), dtype='int64')))
+    if interval is not None:
+        gap = np.flatnonzero(diffs > interval)
+        parts.append(('gap', previous[gap], ordered[gap], diffs[gap] // interval - 1))
+
+    columns = {col: df[col].to_numpy(dtype='float64') for col in ('Open', 'High', 'Low', 'Close', 'Volume') if col in df.columns}
+    if {'Open', 'High', 'Low', 'Close'}.issubset(columns):
+        o, h, l, c = columns['Open'], columns['High'], columns['Low'], columns['Close']
+        checks = [
+            ('high_low', h < l),
+            ('ohlc_range', (np.maximum(o, c) > h) | (np.minimum(o, c) < l)),
+            ('non_positive', (o <= 0) | (h <= 0) | (l <= 0) | (c <= 0)),
+        ]
+        if 'Volume' in columns:
+            checks.append(('negative_volume', columns['Volume'] < 0))
+        for kind, mask in checks:
+            rows = np.flatnonzero(mask)
+            parts.append((kind, ts[rows], ts[rows], np.ones(len(rows), dtype='int64')))
+
+    anomalies = pd.DataFrame({
+        'kind': np.concatenate([np.full(len(start), kind, dtype=object) for kind, start, _, _ in parts]),
+        'start': np.concatenate([start for _, start, _, _ in parts]).view('datetime64[ns]'),
+        'end': np.concatenate([end for _, _, end, _ in parts]).view('datetime64[ns]'),
+        'count': np.concatenate([count for _, _, _, count in parts]).astype('int64'),
+    })
+    return anomalies.sort_values(['start', 'kind'], kind='stable').reset_index(drop=True)
+
+
+def _diffs(ts: np.ndarray, first=None) -> tuple:
+    """
+    Previous timestamp of every row and the difference to it (the first row is compared
+    with `first`, or with itself when there is none).
+    """
+    previous = np.empty_like(ts)
+    previous[1:] = ts[:-1]
+    previous[0] = first if first is not None else ts[0]
+    return previous, ts - previous
+
+
+class QualityIndex:
+    """
+    Persistent gap/anomaly index of a processed artifact, stored next to it as
+    '<processed>/<asset>/<asset>_<timeframe>_quality.json' (columnar, int64 nanosecond times),
+    so resampling and backtests can query known gaps and bad bars without rescanning.
+    """
+
+    def __init__(self, processed_data_path: str, asset: str, timeframe: str):
+        self.asset = asset
+        self.timeframe = timeframe
+        self.path = os.path.join(processed_data_path, asset, f"{asset}_{timeframe}_quality.json")
+        self.anomalies = empty_anomalies()
+        self.rows = 0
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                stored = json.load(f)
+            self.rows = stored['rows']
+            self.anomalies = pd.DataFrame({
+                'kind': pd.Series(stored['kind'], dtype='object'),
+                'start': pd.Series(np.array(stored['start'], dtype='int64').view('datetime64[ns]')),
+                'end': pd.Series(np.array(stored['end'], dtype='int64').view('datetime64[ns]')),
+                'count': pd.Series(stored['count'], dtype='int64'),
+            })
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({
+                'asset': self.asset,
+                'timeframe': self.timeframe,
+                'rows': int(self.rows),
+                'kind': self.anomalies['kind'].tolist(),
+                'start': self.anomalies['start'].to_numpy(dtype='datetime64[ns]').view('int64').tolist(),
+                'end': self.anomalies['end'].to_numpy(dtype='datetime64[ns]').view('int64').tolist(),
+                'count': self.anomalies['count'].tolist(),
+            }, f)
+
+    def replace(self, anomalies: pd.DataFrame, rows: int):
+        """
+        Replace the whole index after a full scan and persist it.
+        """
+        self.anomalies = anomalies.sort_values(['start', 'kind'], kind='stable').reset_index(drop=True)
+        self.rows = rows
+        self.save()
+
+    def replace_tail(self, anomalies: pd.DataFrame, since, rows: int):
+        """
+        Replace the anomalies ending at or after `since` with those of a rescanned tail and persist.
+        """
+        kept = self.anomalies[self.anomalies['end'] < pd.Timestamp(since)]
+        frames = [frame for frame in (kept, anomalies) if not frame.empty]
+        merged = pd.concat(frames, ignore_index=True) if frames else empty_anomalies()
+        self.replace(merged, rows)
+
+    def query(self, kind=None, start=None, end=None) -> pd.DataFrame:
+        """
+        Anomalies of a kind (or all kinds) overlapping [start, end].
+        """
+        mask = np.ones(len(self.anomalies), dtype=bool)
+        if kind is not None:
+            mask &= (self.anomalies['kind'] == kind).to_numpy()
+        if start is not None:
+            mask &= (self.anomalies['end'] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (self.anomalies['start'] <= pd.Timestamp(end)).to_numpy()
+        return self.anomalies[mask]
+
+    def gaps(self, start=None, end=None) -> pd.DataFrame:
+        return self.query('gap', start, end)
+
+    def summary(self) -> dict:
+        """
+        Number of flagged rows per anomaly kind (missing bars for gaps).
+        """
+        totals = self.anomalies.groupby('kind')['count'].sum()
+        return {kind: int(totals.get(kind, 0)) for kind in ANOMALY_KINDS}
@@ -0,0 +1,377 @@
+# data/storage.py
+
+import logging
+import os
+import shutil
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; CSV storage works without it
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Explicit dtypes for processed OHLCV data, shared by all backends
+PROCESSED_DTYPES = {
+    'Open': 'float64',
+    'High': 'float64',
+    'Low': 'float64',
+    'Close': 'float64',
+    'Volume': 'float64',
+    'support': 'float64',
+    'resistance': 'float64',
+}
+
+
+def apply_processed_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast known processed columns to their explicit dtypes and make sure the index
+    is a DatetimeIndex named 'timestamp'.
+
+    Parameters:
+        df (pd.DataFrame): Processed data.
+
+    Returns:
+        pd.DataFrame: Data with normalized dtypes and index.
+    """
+    dtypes = {col: dtype for col, dtype in PROCESSED_DTYPES.items() if col in df.columns}
+    if dtypes:
+        df = df.astype(dtypes, copy=False)
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df = df.set_axis(pd.to_datetime(df.index), axis=0)
+    return df.rename_axis('timestamp')
+
+
+# Compact in-memory dtypes: float32 prices and volume, int64 nanosecond epoch index
+COMPACT_DTYPES = {col: 'float32' for col in PROCESSED_DTYPES}
+
+
+def to_compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert processed data to the compact representation: float32 columns and an int64
+    index of nanoseconds since the epoch. Halves the memory of OHLCV history.
+
+    Parameters:
+        df (pd.DataFrame): Processed data indexed by a DatetimeIndex.
+
+    Returns:
+        pd.DataFrame: Compact copy of the data.
+    """
+    if is_compact_frame(df):
+        return df
+    # Derived float columns (e.g., the support/resistance bank) are narrowed as well
+    dtypes = {col: COMPACT_DTYPES.get(col, 'float32') for col in df.columns if df[col].dtype == 'float64'}
+    df = df.astype(dtypes)
+    index = pd.Index(pd.DatetimeIndex(df.index).as_unit('ns').asi8, name='timestamp')
+    return df.set_axis(index, axis=0)
+
+
+def from_compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Restore full precision (float64 columns and a DatetimeIndex) from compact data.
+    Frames that are not compact are returned unchanged.
+    """
+    if not is_compact_frame(df):
+        return df
+    index = pd.DatetimeIndex(pd.to_datetime(df.index.to_numpy(), unit='ns'), name='timestamp')
+    dtypes = {col: PROCESSED_DTYPES.get(col, 'float64') for col in df.columns if df[col].dtype == 'float32'}
+    return df.astype(dtypes).set_axis(index, axis=0)
+
+
+def is_compact_frame(df) -> bool:
+    """
+    Whether a frame uses the compact representation (integer epoch index).
+    """
+    return isinstance(df, pd.DataFrame) and pd.api.types.is_integer_dtype(df.index.dtype) and df.index.name == 'timestamp'
+
+
+def filter_frame(df: pd.DataFrame, start=None, end=None, columns=None) -> pd.DataFrame:
+    """
+    Restrict a frame to start <= timestamp <= end and to the requested columns.
+    """
+    if start is not None or end is not None:
+        df = df.loc[pd.Timestamp(start) if start is not None else None:pd.Timestamp(end) if end is not None else None]
+    if columns is not None:
+        df = df[list(columns)]
+    return df
+
+
+class StorageBackend:
+    """
+    Base class for processed data storage backends.
+    A backend persists one DataFrame per asset/timeframe under the processed data directory.
+    """
+
+    name = None
+    extension = ''
+
+    def __init__(self, processed_data_path: str):
+        self.processed_data_path = processed_data_path
+
+    def get_path(self, asset: str, timeframe: str) -> str:
+        """
+        Get the storage path of the processed artifact for an asset and timeframe.
+        """
+        return os.path.join(self.processed_data_path, asset, f"{asset}_{timeframe}_processed{self.extension}")
+
+    def exists(self, asset: str, timeframe: str) -> bool:
+        return os.path.exists(self.get_path(asset, timeframe))
+
+    def timeframes(self, asset: str) -> list:
+        """
+        Timeframe labels (time rules and information bar labels alike) stored for an asset.
+        """
+        directory = os.path.join(self.processed_data_path, asset)
+        if not os.path.isdir(directory):
+            return []
+        prefix, suffix = f"{asset}_", f"_processed{self.extension}"
+        return sorted(name[len(prefix):-len(suffix)] for name in os.listdir(directory)
+                      if name.startswith(prefix) and name.endswith(suffix) and len(name) > len(prefix) + len(suffix))
+
+    def save(self, df: pd.DataFrame, asset: str, timeframe: str) -> str:
+        raise NotImplementedError
+
+    def load(self, asset: str, timeframe: str, start=None, end=None, columns=None) -> pd.DataFrame:
+        """
+        Load an artifact, optionally restricted to start <= timestamp <= end and to a subset of columns.
+        """
+        raise NotImplementedError
+
+    def delete(self, asset: str, timeframe: str):
+        path = self.get_path(asset, timeframe)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def iter_chunks(self, asset: str, timeframe: str, chunk_rows: int):
+        """
+        Yield an artifact in time order as frames of at most chunk_rows rows.
+        Backends that can read incrementally override this so that the whole artifact
+        is never held in memory.
+        """
+        df = self.load(asset, timeframe)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+
+    def load_tail(self, asset: str, timeframe: str, start) -> pd.DataFrame:
+        """
+        Load the rows whose timestamp is >= start.
+        """
+        return self.load(asset, timeframe, start=start)
+
+    def append(self, df: pd.DataFrame, asset: str, timeframe: str) -> str:
+        """
+        Append rows that are newer than everything already stored.
+        """
+        if not self.exists(asset, timeframe):
+            return self.save(df, asset, timeframe)
+        return self.save(pd.concat([self.load(asset, timeframe), df]), asset, timeframe)
+
+    def replace_tail(self, df: pd.DataFrame, asset: str, timeframe: str, start) -> str:
+        """
+        Replace all stored rows whose timestamp is >= start with df.
+        """
+        if not self.exists(asset, timeframe):
+            return self.save(df, asset, timeframe)
+        existing = self.load(asset, timeframe)
+        return self.save(pd.concat([existing[existing.index < start], df]), asset, timeframe)
+
+
+class CSVStorage(StorageBackend):
+    """
+    Legacy text storage: one '<asset>_<timeframe>_processed.csv' file per artifact.
+    """
+
+    name = 'csv'
+    extension = '.csv'
+    # Fixed timestamp format: pandas drops the time of day when every row of a write is at
+    # midnight, which would mix formats within a file that is appended to
+    date_format = '%Y-%m-%d %H:%M:%S'
+
+    def save(self, df, asset, timeframe):
+        path = self.get_path(asset, timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_csv(path, index=True, index_label='timestamp', date_format=self.date_format)
+        return path
+
+    def load(self, asset, timeframe, start=None, end=None, columns=None):
+        path = self.get_path(asset, timeframe)
+        usecols = ['timestamp'] + list(columns) if columns is not None else None
+        df = pd.read_csv(path, index_col='timestamp', parse_dates=True, dtype=PROCESSED_DTYPES, usecols=usecols)
+        return filter_frame(apply_processed_dtypes(df), start, end)
+
+    def append(self, df, asset, timeframe):
+        if not self.exists(asset, timeframe):
+            return self.save(df, asset, timeframe)
+        path = self.get_path(asset, timeframe)
+        df.to_csv(path, mode='a', header=False, index=True, date_format=self.date_format)
+        return path
+
+    def iter_chunks(self, asset, timeframe, chunk_rows):
+        path = self.get_path(asset, timeframe)
+        reader = pd.read_csv(path, index_col='timestamp', parse_dates=True, dtype=PROCESSED_DTYPES, chunksize=chunk_rows)
+        for chunk in reader:
+            yield apply_processed_dtypes(chunk)
+
+
+class ParquetStorage(StorageBackend):
+    """
+    Columnar storage: a Parquet dataset directory per artifact, partitioned by year
+    ('<asset>_<timeframe>_processed.parquet/year=2021/part-00000.parquet').
+    """
+
+    name = 'parquet'
+    extension = '.parquet'
+
+    def __init__(self, processed_data_path, compression='snappy', row_group_size=100_000):
+        if pa is None:
+            raise ImportError("ParquetStorage requires 'pyarrow'. Install it with 'pip install pyarrow'.")
+        super().__init__(processed_data_path)
+        self.compression = compression
+        # Row groups of ~10 weeks of 1m bars keep date-range reads selective within a year
+        self.row_group_size = row_group_size
+
+    def save(self, df, asset, timeframe):
+        path = self.get_path(asset, timeframe)
+        self.delete(asset, timeframe)
+        os.makedirs(path, exist_ok=True)
+        df = apply_processed_dtypes(df)
+        if df.empty:
+            # Keep the schema so that loading an empty artifact still yields the right columns
+            self._write_part(df, os.path.join(path, 'year=0'))
+            return path
+        for year, part in df.groupby(df.index.year, sort=True):
+            self._write_part(part, os.path.join(path, f"year={year}"))
+        return path
+
+    def load(self, asset, timeframe, start=None, end=None, columns=None):
+        path = self.get_path(asset, timeframe)
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+        # Only the requested columns are read; the timestamp is always needed for the index
+        names = [name for name in dataset.schema.names if name != 'year']
+        if columns is not None:
+            names = ['timestamp'] + [name for name in columns if name != 'timestamp']
+
+        # The year predicate prunes whole partition directories, the timestamp predicate
+        # skips row groups using their min/max statistics
+        row_filter = None
+        if start is not None:
+            start = pd.Timestamp(start)
+            row_filter = (ds.field('year') >= start.year) & (ds.field('timestamp') >= start)
+        if end is not None:
+            end = pd.Timestamp(end)
+            end_filter = (ds.field('year') <= end.year) & (ds.field('timestamp') <= end)
+            row_filter = end_filter if row_filter is None else row_filter & end_filter
+
+        table = dataset.to_table(columns=names, filter=row_filter)
+        return self._to_frame(table)
+
+    def append(self, df, asset, timeframe):
+        path = self.get_path(asset, timeframe)
+        if not self.exists(asset, timeframe):
+            return self.save(df, asset, timeframe)
+        df = apply_processed_dtypes(df)
+        for year, part in df.groupby(df.index.year, sort=True):
+            self._write_part(part, os.path.join(path, f"year={year}"))
+        return path
+
+    def replace_tail(self, df, asset, timeframe, start):
+        path = self.get_path(asset, timeframe)
+        if not self.exists(asset, timeframe):
+            return self.save(df, asset, timeframe)
+        start = pd.Timestamp(start)
+        # Only the partitions from the start year onwards are rewritten
+        kept = self.load(asset, timeframe, start=pd.Timestamp(year=start.year, month=1, day=1))
+        tail = pd.concat([kept[kept.index < start], apply_processed_dtypes(df)])
+        for name in os.listdir(path):
+            if name.startswith('year=') and int(name.split('=', 1)[1]) >= start.year:
+                shutil.rmtree(os.path.join(path, name))
+        for year, part in tail.groupby(tail.index.year, sort=True):
+            self._write_part(part, os.path.join(path, f"year={year}"))
+        return path
+
+    def iter_chunks(self, asset, timeframe, chunk_rows):
+        # Year partitions hold disjoint time ranges and part files are written in time order
+        path = self.get_path(asset, timeframe)
+        partitions = sorted((name for name in os.listdir(path) if name.startswith('year=')),
+                            key=lambda name: int(name.split('=', 1)[1]))
+        for partition in partitions:
+            partition_path = os.path.join(path, partition)
+            for part in sorted(f for f in os.listdir(partition_path) if f.endswith('.parquet')):
+                parquet_file = pq.ParquetFile(os.path.join(partition_path, part))
+                for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+                    yield self._to_frame(pa.Table.from_batches([batch]))
+
+    def _write_part(self, df, partition_path):
+        """
+        Write a frame as the next part file inside a partition directory.
+        """
+        os.makedirs(partition_path, exist_ok=True)
+        part_index = len([f for f in os.listdir(partition_path) if f.endswith('.parquet')])
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        pq.write_table(table, os.path.join(partition_path, f"part-{part_index:05d}.parquet"),
+                       compression=self.compression, row_group_size=self.row_group_size)
+
+    @staticmethod
+    def _to_frame(table) -> pd.DataFrame:
+        df = table.to_pandas()
+        if 'timestamp' in df.columns:
+            df = df.set_index('timestamp')
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        return apply_processed_dtypes(df)
+
+
+class FeatherStorage(StorageBackend):
+    """
+    Arrow IPC (Feather v2) storage: one uncompressed file per artifact for memory-speed loads.
+    """
+
+    name = 'feather'
+    extension = '.feather'
+
+    def __init__(self, processed_data_path):
+        if pa is None:
+            raise ImportError("FeatherStorage requires 'pyarrow'. Install it with 'pip install pyarrow'.")
+        super().__init__(processed_data_path)
+
+    def save(self, df, asset, timeframe):
+        path = self.get_path(asset, timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df = apply_processed_dtypes(df)
+        feather.write_feather(df.reset_index(), path, compression='uncompressed')
+        return path
+
+    def load(self, asset, timeframe, start=None, end=None, columns=None):
+        path = self.get_path(asset, timeframe)
+        read_columns = ['timestamp'] + [name for name in columns if name != 'timestamp'] if columns is not None else None
+        df = feather.read_feather(path, columns=read_columns, memory_map=True).set_index('timestamp')
+        return filter_frame(apply_processed_dtypes(df), start, end)
+
+
+STORAGE_BACKENDS = {
+    'csv': CSVStorage,
+    'parquet': ParquetStorage,
+    'feather': FeatherStorage,
+}
+
+
+def get_storage_backend(storage_format: str, processed_data_path: str) -> StorageBackend:
+    """
+    Instantiate the storage backend registered under the given format name.
+
+    Parameters:
+        storage_format (str): One of 'csv', 'parquet' or 'feather'.
+        processed_data_path (str): Root directory of the processed data.
+
+    Returns:
+        StorageBackend: Backend instance.
+    """
+    if storage_format not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage format '{storage_format}'. Available: {list(STORAGE_BACKENDS)}")
+    return STORAGE_BACKENDS[storage_format](processed_data_path)
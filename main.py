@@ -10,6 +10,8 @@ from strategies.momentum_strategy import MomentumStrategy
 from strategies.multi_tf_strategy import MultiTimeframeStrategy
 # Import other strategy classes as needed
 from data.data_manager import DataManager
+from data.array_store import resolve_frame
+from utils.indicators import calculate_support_resistance_bank
 from backtest_framework.backtest.results_analysis import ResultsAnalyzer
 from optimization.grid_search_optimizer import GridSearchOptimizer
 from optimization.random_search_optimizer import RandomSearchOptimizer
@@ -35,9 +37,17 @@ def main():
     logger = logging.getLogger('Main')
     logger.info("Starting Qafary Framework Process.")
 
+    # Initialize DataManager; its catalog lists the processed data without opening any data file
+    data_manager = DataManager(
+        raw_data_path='C:/Users/IQRA/Desktop/Qafary Framework/data/raw',
+        processed_data_path='C:/Users/IQRA/Desktop/Qafary Framework/data/processed'
+    )
+    datasets = data_manager.list_datasets()
+
     # Define available assets, timeframes, and strategies
-    available_assets = ['BTCUSD', 'ETHUSD', 'LTCUSD']  # Update with your available assets
-    available_timeframes = ['1m', '5m', '15m', '1H', '4H', '1D']  # Update as needed
+    # Fall back to the default lists when the catalog is empty
+    available_assets = data_manager.catalog.assets() or ['BTCUSD', 'ETHUSD', 'LTCUSD']
+    default_timeframes = ['1m', '5m', '15m', '1H', '4H', '1D']
     available_strategies = {
         'BreakoutMTFStrategy': BreakoutMTFStrategy,
         'MomentumStrategy' : MomentumStrategy,
@@ -63,9 +73,14 @@ def main():
     logger.info(f"User selected asset: {selected_asset}")
 
     # Prompt user to select timeframes
+    available_timeframes = [tf for tf in data_manager.catalog.timeframes(selected_asset) if data_manager.catalog.has(selected_asset, tf)] or default_timeframes
     print("\nAvailable timeframes:")
     for i, tf in enumerate(available_timeframes, 1):
-        print(f"{i}. {tf}")
+        entry = datasets.get(selected_asset, {}).get(tf)
+        if entry:
+            print(f"{i}. {tf} ({entry['rows']} bars, {entry['start']} to {entry['end']})")
+        else:
+            print(f"{i}. {tf}")
     timeframes_needed = []
     while True:
         tf_choice = input("Enter the number of the timeframe you want to add (or 'done' to finish): ").strip()
@@ -108,23 +123,16 @@ def main():
             print("Invalid input. Please enter a number.")
     logger.info(f"User selected strategy: {selected_strategy_name}")
 
-    # Initialize DataManager and load data
-    data_manager = DataManager(
-        raw_data_path='C:/Users/IQRA/Desktop/Qafary Framework/data/raw',
-        processed_data_path='C:/Users/IQRA/Desktop/Qafary Framework/data/processed'
-    )
-    processed_data = {}
+    # Load data for the selected asset and timeframes
     assets = [selected_asset]
 
-    # Load data for selected asset and timeframes
-    processed_data[selected_asset] = {}
+    # Timeframes are loaded on first access, so only those a strategy uses are read
+    processed_data = data_manager.lazy_data_dict(assets, timeframes_needed)
     for tf in timeframes_needed:
-        df = data_manager.load_processed_data(selected_asset, tf)
-        if not df.empty:
-            processed_data[selected_asset][tf] = df
-            logger.info(f"Loaded data for {selected_asset} at {tf} timeframe with {len(df)} records.")
+        if tf in processed_data[selected_asset]:
+            logger.info(f"Processed data available for {selected_asset} at {tf} timeframe.")
         else:
-            logger.warning(f"No data loaded for {selected_asset} at {tf} timeframe.")
+            logger.warning(f"No data available for {selected_asset} at {tf} timeframe.")
 
     # Set strategy-specific parameters dynamically
     strategy_params = getattr(selected_strategy_class, 'strategy_params', {})
@@ -159,6 +167,7 @@ def main():
         strategies=[selected_strategy_class],
         data_dict=processed_data,
         transaction_costs=0.002,  # 0.1%
+        engine='vectorized',  # Signal-based strategies skip the per-bar loop; others run bar by bar
     )
 
     # Run Backtest Without Optimization
@@ -260,13 +269,25 @@ def main():
                 def constraint(params):
                     return eval(constraint_expr, {}, params)
 
+        # Export the asset's frames as memory-mapped array stores so optimizer workers share one copy
+        needed_timeframes = [timeframe] + ([higher_tf] if higher_tf_data is not None else [])
+        frames = {tf: processed_data[asset][tf] for tf in needed_timeframes}
+        if 'sr_window' in param_inputs and higher_tf_data is not None:
+            # Store the support/resistance bank of every window in the sweep with the higher
+            # timeframe, so each run selects its columns instead of recomputing them
+            start, stop, step = param_inputs['sr_window']
+            sr_windows = list(range(int(start), int(stop) + 1, int(step)))
+            frames[higher_tf] = calculate_support_resistance_bank(resolve_frame(frames[higher_tf]), sr_windows)
+            logger.info(f"Added support/resistance bank for windows {sr_windows} to {higher_tf} data.")
+        shared_frames = data_manager.share_frames(asset, frames)
+
         if opt_choice == '1':
             logger.info("User selected Grid Search Optimization.")
             optimizer = GridSearchOptimizer(
                 backtest_runner,
                 selected_strategy_class,
-                data,
-                processed_data[asset],
+                shared_frames[timeframe],
+                shared_frames,
                 logger=logger
             )
 
@@ -278,13 +299,14 @@ def main():
                 else:
                     param_ranges[param] = [start + i * step for i in range(int((stop - start) / step) + 1)]
 
-            # Perform Grid Search Optimization with joblib
+            # Perform Grid Search Optimization (batched for vectorized strategies, joblib otherwise)
             best_result, df_results = optimizer.optimize(
                 param_ranges=param_ranges,
                 metric='Equity Final [$]',
                 maximize=True,
                 constraint=constraint,
-                max_cores=-1  # Use all available CPU cores
+                max_cores=-1,  # Use all available CPU cores
+                mode='batched'
             )
 
             # Display Best Parameters
@@ -302,8 +324,8 @@ def main():
             optimizer = RandomSearchOptimizer(
                 backtest_runner,
                 selected_strategy_class,
-                data,
-                processed_data[asset],
+                shared_frames[timeframe],
+                shared_frames,
                 logger=logger
             )
 
@@ -325,14 +347,15 @@ def main():
                     print("Invalid input. Please enter an integer value.")
                     continue
 
-            # Perform Random Search Optimization with joblib
+            # Perform Random Search Optimization (batched for vectorized strategies, joblib otherwise)
             best_result, df_results = optimizer.optimize(
                 param_distributions=param_distributions,
                 n_iter=n_iter,
                 metric='Equity Final [$]',
                 maximize=True,
                 constraint=constraint,
-                max_cores=-1  # Use all available CPU cores
+                max_cores=-1,  # Use all available CPU cores
+                mode='batched'
             )
 
             # Display Best Parameters
@@ -0,0 +1,79 @@
+# optimization/batched_search.py
+
+from data.array_store import resolve_frame
+from backtest_framework.backtest.batch_engine import BatchBacktest
+
+# Metrics stored for every parameter combination (result column -> backtesting.py stat)
+RESULT_METRICS = {
+    'Equity Final [$]': 'Equity Final [$]',
+    'Sharpe Ratio': 'Sharpe Ratio',
+    'Calmar Ratio': 'Calmar Ratio',
+    'Win Rate [%]': 'Win Rate [%]',
+    'Max Drawdown [%]': 'Max. Drawdown [%]',
+}
+
+
+class BatchedSearchMixin:
+    """
+    'batched' mode shared by the grid and random search optimizers: blocks of parameter
+    sets evaluated together with BatchBacktest. Expects the optimizer attributes
+    strategy_class, data, backtest_runner and logger.
+    """
+
+    def _resolve_mode(self, mode, metric):
+        """
+        Validate the optimization mode and fall back to 'joblib' when batched mode cannot run.
+
+        Returns:
+            str: 'joblib' or 'batched'.
+        """
+        if mode not in ('joblib', 'batched'):
+            raise ValueError(f"Unknown optimization mode '{mode}'. Use 'joblib' or 'batched'.")
+        if mode == 'batched' and not self._supports_batched(metric):
+            self.logger.warning(f"Batched mode is not available for {self.strategy_class.__name__} "
+                                f"with metric '{metric}'; using joblib.")
+            return 'joblib'
+        return mode
+
+    def _supports_batched(self, metric):
+        """
+        Whether the strategy and metric can be evaluated with BatchBacktest.
+        """
+        return (getattr(self.strategy_class, 'vectorized', False)
+                and not getattr(self.strategy_class, 'requires_multiple_timeframes', False)
+                and metric in RESULT_METRICS)
+
+    def _run_batched(self, param_dicts, memory_budget_mb):
+        """
+        Evaluate all parameter combinations in blocks with BatchBacktest.
+
+        Parameters:
+            param_dicts (list): Dictionaries of parameters for the strategy.
+            memory_budget_mb (float): Memory for one block of combinations.
+
+        Returns:
+            list: Results containing parameters and performance metrics, with the same
+                  columns as the records of the 'joblib' mode.
+        """
+        batch = BatchBacktest(
+            resolve_frame(self.data),
+            self.strategy_class,
+            cash=100000,
+            commission=self.backtest_runner.transaction_costs,
+            memory_budget_mb=memory_budget_mb
+        )
+        self.logger.info(f"Evaluating {len(param_dicts)} combinations in blocks of {batch.block_size}")
+        stats = batch.run(param_dicts)
+        exit_params = [name for name in getattr(self.strategy_class, 'exit_params', []) if name in param_dicts[0]] \
+            if param_dicts else []
+        if exit_params:
+            self.logger.info(f"Exit-only parameters {exit_params}: entry signals computed for "
+                             f"{batch.entry_sets} of {len(param_dicts)} combinations")
+
+        results = []
+        for param_dict, (_, row) in zip(param_dicts, stats.iterrows()):
+            record = param_dict.copy()
+            for column, stat in RESULT_METRICS.items():
+                record[column] = row[stat]
+            results.append(record)
+        return results
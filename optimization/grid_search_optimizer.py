@@ -5,9 +5,75 @@ import pandas as pd
 import itertools
 from joblib import Parallel, delayed
 from backtesting import Backtest
+from data.array_store import resolve_frame
+from utils.indicators import cache_counters, counters_since, collect_cache_stats, format_cache_stats
+from .batched_search import RESULT_METRICS, BatchedSearchMixin
+
+logger = logging.getLogger(__name__)
+
+def run_parameter_set(data, strategy_class, param_dict, transaction_costs, higher_tf_data=None):
+    """
+    Run a single backtest with the given parameters.
+    A module-level function so that joblib only ships its arguments (SharedFrame handles
+    pickle as a path) to the workers, never the optimizer or its BacktestRunner.
+
+    Parameters:
+        data (pd.DataFrame or SharedFrame): Primary timeframe data.
+        strategy_class (class): The strategy class to backtest.
+        param_dict (dict): Dictionary of parameters for the strategy.
+        transaction_costs (float): Commission per trade.
+        higher_tf_data (pd.DataFrame or SharedFrame, optional): Higher timeframe data for
+            multi-timeframe strategies.
+
+    Returns:
+        dict: Result containing parameters and performance metrics.
+    """
+    try:
+        # Deep copy the strategy class to avoid interference between processes
+        import copy
+        strategy_class = copy.deepcopy(strategy_class)
+
+        # Update strategy parameters
+        for key, value in param_dict.items():
+            setattr(strategy_class, key, value)
+
+        # Prepare strategy_kwargs with higher_tf_data (SharedFrame handles attach to the mapped arrays)
+        strategy_kwargs = {'higher_tf_data': resolve_frame(higher_tf_data)} if higher_tf_data is not None else {}
+
+        # Initialize Backtest
+        bt = Backtest(
+            data=resolve_frame(data),
+            strategy=strategy_class,
+            cash=100000,
+            commission=transaction_costs,
+            exclusive_orders=True
+        )
+
+        # Run backtest
+        cache_before = cache_counters()
+        output = bt.run(**strategy_kwargs)
+
+        # Get the metric
+        metric_value = output[param_dict.get('metric', 'Equity Final [$]')]
+        record = param_dict.copy()
+        record[param_dict.get('metric', 'Equity Final [$]')] = metric_value
+
+        # Store other metrics as needed
+        for column, stat in RESULT_METRICS.items():
+            record[column] = output.get(stat, None)
+        # Indicator cache counters of this backtest, summed and removed by optimize()
+        record['_indicator_cache'] = counters_since(cache_before)
+
+        return record
+
+    except Exception as e:
+        logger.error(f"Error running backtest with params {param_dict}: {e}")
+        return None
 
-class GridSearchOptimizer:
+class GridSearchOptimizer(BatchedSearchMixin):
     def __init__(self, backtest_runner, strategy_class, data, data_dict, logger=None):
+        # data and the data_dict entries may be DataFrames or SharedFrame handles from
+        # DataManager.share_frames(); handles keep the joblib payload to a file path.
         self.backtest_runner = backtest_runner
         self.strategy_class = strategy_class
         self.data = data
@@ -16,9 +82,11 @@ class GridSearchOptimizer:
         # Prepare higher_tf_data once
         self.higher_tf_data = self._prepare_higher_tf_data()
 
-    def optimize(self, param_ranges, metric, maximize=True, constraint=None, max_cores=-1):
+    def optimize(self, param_ranges, metric, maximize=True, constraint=None, max_cores=-1,
+                 mode='joblib', memory_budget_mb=256):
         """
-        Perform grid search optimization using joblib for parallel execution.
+        Perform grid search optimization using joblib for parallel execution, or in batches
+        of parameter sets evaluated together as (params x bars) arrays (mode='batched').
 
         Parameters:
             param_ranges (dict): Parameter ranges for optimization.
@@ -26,6 +94,10 @@ class GridSearchOptimizer:
             maximize (bool): Whether to maximize or minimize the metric.
             constraint (function): A function that imposes constraints on parameters.
             max_cores (int): Number of CPU cores to use (-1 uses all cores).
+            mode (str): 'joblib' runs one Backtest per combination; 'batched' evaluates blocks of
+                combinations with BatchBacktest. Strategies without vectorized signals, multi-timeframe
+                strategies and metrics BatchBacktest does not compute use 'joblib'.
+            memory_budget_mb (float): Memory for one block of combinations in 'batched' mode.
 
         Returns:
             best_result (pd.Series): The best parameters and their corresponding metrics.
@@ -46,15 +118,25 @@ class GridSearchOptimizer:
             ]
 
         self.logger.info(f"Total parameter combinations after applying constraints: {len(param_combinations)}")
+        param_dicts = [dict(zip(param_names, params)) for params in param_combinations]
 
-        # Run backtests in parallel using joblib
-        results = Parallel(n_jobs=max_cores)(
-            delayed(self._run_backtest)(dict(zip(param_names, params)))
-            for params in param_combinations
-        )
+        mode = self._resolve_mode(mode, metric)
+
+        cache_before = cache_counters()
+        if mode == 'batched':
+            results = self._run_batched(param_dicts, memory_budget_mb)
+        else:
+            # Run backtests in parallel using joblib
+            # Workers receive the data handles, the strategy class and the costs, not the optimizer
+            results = Parallel(n_jobs=max_cores)(
+                delayed(run_parameter_set)(self.data, self.strategy_class, param_dict,
+                                           self.backtest_runner.transaction_costs, self.higher_tf_data)
+                for param_dict in param_dicts
+            )
 
         # Collect and process results
         results = [res for res in results if res is not None]
+        self.logger.info(format_cache_stats(collect_cache_stats(results, cache_before)))
         df_results = pd.DataFrame(results)
 
         # Find best parameters
@@ -66,61 +148,12 @@ class GridSearchOptimizer:
         self.logger.info("Grid Search Optimization Completed with joblib")
         return best_result, df_results
 
-    def _run_backtest(self, param_dict):
-        """
-        Run a single backtest with the given parameters.
-
-        Parameters:
-            param_dict (dict): Dictionary of parameters for the strategy.
-
-        Returns:
-            dict: Result containing parameters and performance metrics.
-        """
-        try:
-            # Deep copy the strategy class to avoid interference between processes
-            import copy
-            strategy_class = copy.deepcopy(self.strategy_class)
-
-            # Update strategy parameters
-            for key, value in param_dict.items():
-                setattr(strategy_class, key, value)
-
-            # Prepare strategy_kwargs with higher_tf_data
-            strategy_kwargs = {'higher_tf_data': self.higher_tf_data} if self.higher_tf_data is not None else {}
-
-            # Initialize Backtest
-            bt = Backtest(
-                data=self.data,
-                strategy=strategy_class,
-                cash=100000,
-                commission=self.backtest_runner.transaction_costs,
-                exclusive_orders=True
-            )
-
-            # Run backtest
-            output = bt.run(**strategy_kwargs)
-
-            # Get the metric
-            metric_value = output[param_dict.get('metric', 'Equity Final [$]')]
-            record = param_dict.copy()
-            record[param_dict.get('metric', 'Equity Final [$]')] = metric_value
-
-            # Store other metrics as needed
-            for m in ['Equity Final [$]', 'Sharpe Ratio', 'Calmar Ratio', 'Win Rate [%]', 'Max Drawdown [%]']:
-                record[m] = output.get(m, None)
-
-            return record
-
-        except Exception as e:
-            self.logger.error(f"Error running backtest with params {param_dict}: {e}")
-            return None
-
     def _prepare_higher_tf_data(self):
         """
         Prepare higher_tf_data to pass to the strategy.
 
         Returns:
-            higher_tf_data (pd.DataFrame): Higher timeframe data.
+            higher_tf_data (pd.DataFrame or SharedFrame): Higher timeframe data.
         """
         if getattr(self.strategy_class, 'requires_multiple_timeframes', False):
             higher_tf = getattr(self.strategy_class, 'higher_tf', None)
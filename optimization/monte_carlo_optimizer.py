@@ -5,6 +5,58 @@ import pandas as pd
 import numpy as np
 from joblib import Parallel, delayed
 import os
+from data.array_store import resolve_frame
+from .grid_search_optimizer import run_parameter_set
+
+logger = logging.getLogger(__name__)
+
+def run_simulation(seed, data, strategy_class, param_ranges, perturb_data, transaction_costs, higher_tf_data=None):
+    """
+    Perform a single Monte Carlo simulation.
+    A module-level function so that joblib only ships the frame handles and parameters
+    to the workers; SharedFrame handles are resolved inside the worker.
+
+    Parameters:
+        seed (int): Random seed for reproducibility.
+        data (pd.DataFrame or SharedFrame): Primary timeframe data.
+        strategy_class (class): The strategy class to backtest.
+        param_ranges (dict): Dictionary of parameter ranges (low, high) for each parameter.
+        perturb_data (bool): Whether to perturb the data.
+        transaction_costs (float): Commission per trade.
+        higher_tf_data (pd.DataFrame or SharedFrame, optional): Higher timeframe data.
+
+    Returns:
+        dict: Dictionary containing parameters and performance.
+    """
+    rng = np.random.RandomState(seed)
+    # Randomly select parameters within the specified ranges
+    params = {}
+    for param, (low, high) in param_ranges.items():
+        if isinstance(low, int) and isinstance(high, int):
+            params[param] = rng.randint(low, high + 1)
+        else:
+            params[param] = rng.uniform(low, high)
+
+    logger.debug(f"Simulating with parameters: {params}")
+
+    # Perturb data if needed
+    if perturb_data:
+        data = resolve_frame(data).copy()
+        # Apply random noise to multiple price fields
+        for price_field in ['Open', 'High', 'Low', 'Close']:
+            if price_field in data.columns:
+                noise = rng.normal(0, 0.01, size=len(data))  # 1% noise
+                data[price_field] *= (1 + noise)
+        logger.debug("Data perturbed for simulation.")
+
+    # Run backtest with parameters on the (perturbed) frame
+    record = run_parameter_set(data, strategy_class, params, transaction_costs, higher_tf_data)
+    if record is None:
+        logger.warning(f"Backtest output is None for parameters {params}.")
+        return {'params': params, 'performance': None}
+    performance = record['Equity Final [$]']  # Final equity
+    logger.debug(f"Performance for parameters {params}: {performance}")
+    return {'params': params, 'performance': performance}
 
 class MonteCarloOptimizer:
     def __init__(self, backtest_runner, strategy_class, asset, data, data_dict, logger=None):
@@ -15,8 +67,9 @@ class MonteCarloOptimizer:
             backtest_runner (BacktestRunner): Instance of BacktestRunner.
             strategy_class (class): The strategy class to optimize.
             asset (str): The asset symbol (e.g., 'BTCUSD').
-            data (pd.DataFrame): DataFrame of the primary timeframe data.
+            data (pd.DataFrame or SharedFrame): Primary timeframe data.
             data_dict (dict): Dictionary containing all data for the asset, including higher timeframes.
+                Values may be SharedFrame handles so that workers attach to the mapped arrays.
             logger (logging.Logger, optional): Logger instance.
         """
         self.backtest_runner = backtest_runner
@@ -25,60 +78,9 @@ class MonteCarloOptimizer:
         self.data = data
         self.data_dict = data_dict
         self.logger = logger or logging.getLogger(__name__)
-
-    def _simulate(self, seed, param_ranges, perturb_data):
-        """
-        Perform a single Monte Carlo simulation.
-
-        Parameters:
-            seed (int): Random seed for reproducibility.
-            param_ranges (dict): Dictionary of parameter ranges (low, high) for each parameter.
-            perturb_data (bool): Whether to perturb the data.
-
-        Returns:
-            dict: Dictionary containing parameters and performance.
-        """
-        np.random.seed(seed)
-        # Randomly select parameters within the specified ranges
-        params = {}
-        for param, (low, high) in param_ranges.items():
-            if isinstance(low, int) and isinstance(high, int):
-                params[param] = np.random.randint(low, high + 1)
-            else:
-                params[param] = np.random.uniform(low, high)
-
-        self.logger.debug(f"Simulating with parameters: {params}")
-
-        # Perturb data if needed
-        if perturb_data:
-            data = self.data.copy()
-            # Apply random noise to multiple price fields
-            for price_field in ['Open', 'High', 'Low', 'Close']:
-                if price_field in data.columns:
-                    noise = np.random.normal(0, 0.01, size=len(data))  # 1% noise
-                    data[price_field] *= (1 + noise)
-            self.logger.debug("Data perturbed for simulation.")
-        else:
-            data = self.data
-
-        # Run backtest with parameters
-        try:
-            key, output = self.backtest_runner.run_single_backtest(
-                self.strategy_class,
-                self.asset,
-                self.data_dict,
-                **params  # Pass parameters as keyword arguments
-            )
-            if output is not None:
-                performance = output['_trades']['Equity'].iloc[-1]  # Final equity
-                self.logger.debug(f"Performance for parameters {params}: {performance}")
-                return {'params': params, 'performance': performance}
-            else:
-                self.logger.warning(f"Backtest output is None for parameters {params}.")
-                return {'params': params, 'performance': None}
-        except Exception as e:
-            self.logger.error(f"Monte Carlo simulation failed with error: {e}")
-            return {'params': params, 'performance': None}
+        self.higher_tf_data = None
+        if getattr(strategy_class, 'requires_multiple_timeframes', False):
+            self.higher_tf_data = data_dict.get(getattr(strategy_class, 'higher_tf', None))
 
     def optimize(self, param_ranges, n_simulations=100, perturb_data=False, max_cores=-1):
         """
@@ -95,8 +97,11 @@ class MonteCarloOptimizer:
         """
         self.logger.info("Starting Monte Carlo Optimization.")
         seeds = np.random.randint(0, 1e6, size=n_simulations)
+        # Workers receive the frame handles and parameters, not the optimizer
         results = Parallel(n_jobs=max_cores)(
-            delayed(self._simulate)(seed, param_ranges, perturb_data) for seed in seeds
+            delayed(run_simulation)(seed, self.data, self.strategy_class, param_ranges, perturb_data,
+                                    self.backtest_runner.transaction_costs, self.higher_tf_data)
+            for seed in seeds
         )
         df_results = pd.DataFrame(results)
         # Filter out failed simulations
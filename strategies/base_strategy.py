@@ -1,22 +1,227 @@
 # strategies/base_strategy.py
 
 from backtesting import Strategy
+import numpy as np
+import pandas as pd
 import logging
+from utils.helpers import TIMEFRAME_RULES, timeframe_to_timedelta
+from utils.indicators import cached_indicator
+from .event_recorder import EventRecorder, NULL_EVENT_RECORDER
 
 class BaseStrategy(Strategy):
     """
-    Base strategy class that handles additional keyword arguments and logging.
+    Base strategy class that handles additional keyword arguments and logging, and gives
+    derived strategies NumPy access to the bars, cached indicators and event recording.
     """
 
     requires_multiple_timeframes = False  # Default to single-timeframe
     primary_tf = '1m'  # Default execution timeframe
+    record_events = False  # Record signals/orders into self.events
+    event_capacity = 1024  # Events preallocated by the recorder
+    vectorized = False  # Implements signals() for the vectorized engine
+    exit_params = []  # Parameters that only set SL/TP levels, never which bars enter
 
     def init(self):
         """
         Initialize indicators and variables.
-        Must be implemented by all derived strategy classes.
+        Must be implemented by all derived strategy classes, which should call super().init().
+        It stores the full OHLCV history as NumPy arrays (self.opens ... self.volumes,
+        self.timestamps) to be indexed with self.bar_index in next(), and sets up self.events,
+        which records only when record_events is set.
         """
         super().init()
+        # During init() self.data still spans the whole backtest, so these are the full series
+        df = self.data.df
+        self.opens = df['Open'].to_numpy(dtype='float64')
+        self.highs = df['High'].to_numpy(dtype='float64')
+        self.lows = df['Low'].to_numpy(dtype='float64')
+        self.closes = df['Close'].to_numpy(dtype='float64')
+        self.volumes = df['Volume'].to_numpy(dtype='float64') if 'Volume' in df.columns else np.full(len(df), np.nan)
+        self.timestamps = df.index.to_numpy()
+        self.events = EventRecorder(self.event_capacity) if self.record_events else NULL_EVENT_RECORDER
+
+    @property
+    def bar_index(self) -> int:
+        """
+        Index of the current bar in the precomputed arrays.
+        """
+        return len(self.data) - 1
+
+    @staticmethod
+    def as_array(indicator) -> np.ndarray:
+        """
+        Full values of an indicator created with self.I() as a plain NumPy array.
+        Call it in init(); index it with self.bar_index in next().
+        """
+        return np.asarray(indicator, dtype='float64')
+
+    def cached_I(self, func, data, *params, **kwargs):
+        """
+        self.I(func, data, *params) with the values taken from the shared indicator cache
+        (utils.indicators.INDICATOR_CACHE), so runs over the same data and parameters
+        compute the indicator once. Keyword arguments are passed on to self.I().
+        """
+        kwargs.setdefault('name', f"{func.__name__}({','.join(map(str, params))})")
+        return self.I(cached_indicator, func, data, *params, **kwargs)
+
+    def align_higher_timeframe(self, higher_index, higher_tf=None) -> np.ndarray:
+        """
+        Map every primary bar to the last higher timeframe bar that had closed when the
+        primary bar closed, or -1 if none had. Bars are labeled by their open time, so a bar
+        closes at its label plus its duration; a higher bar that is still forming is never used.
+
+        Parameters:
+            higher_index (pd.DatetimeIndex): Index of the higher timeframe data.
+            higher_tf (str, optional): Higher timeframe label (e.g., '1H'); defaults to self.higher_tf.
+                Its duration is inferred from the index when the label is not a time timeframe.
+
+        Returns:
+            np.ndarray: int64 array of higher timeframe positions, one per primary bar.
+        """
+        primary_index = pd.DatetimeIndex(self.data.index)
+        higher_index = pd.DatetimeIndex(higher_index)
+        if higher_tf is None:
+            higher_tf = getattr(self, 'higher_tf', None)
+        primary_close = primary_index.as_unit('ns').asi8 + self._bar_duration(self.primary_tf, primary_index)
+        higher_close = higher_index.as_unit('ns').asi8 + self._bar_duration(higher_tf, higher_index)
+        return np.searchsorted(higher_close, primary_close, side='right') - 1
+
+    @staticmethod
+    def align_values(values, alignment: np.ndarray) -> np.ndarray:
+        """
+        Higher timeframe values (e.g., an indicator Series) laid out on the primary bars
+        using an alignment from align_higher_timeframe(); NaN before the first closed bar.
+        """
+        values = np.asarray(values, dtype='float64')
+        if len(values) == 0:
+            return np.full(len(alignment), np.nan)
+        aligned = values[np.maximum(alignment, 0)]
+        aligned[alignment < 0] = np.nan
+        return aligned
+
+    @staticmethod
+    def _bar_duration(timeframe, index: pd.DatetimeIndex) -> int:
+        """
+        Duration of one bar in nanoseconds: from the timeframe label, or the smallest spacing
+        of the index for labels without a fixed duration (e.g., information bars).
+        """
+        if timeframe in TIMEFRAME_RULES:
+            return timeframe_to_timedelta(timeframe).value
+        spacing = np.diff(index.as_unit('ns').asi8)
+        spacing = spacing[spacing > 0]
+        return int(spacing.min()) if len(spacing) else 0
+
+    def crossed_over(self, series1: np.ndarray, series2: np.ndarray) -> bool:
+        """
+        Whether series1 crossed above series2 on the current bar
+        (array equivalent of backtesting.lib.crossover).
+        """
+        i = self.bar_index
+        return i >= 1 and series1[i - 1] < series2[i - 1] and series1[i] > series2[i]
+
+    @classmethod
+    def signals(cls, df: pd.DataFrame, **params) -> dict:
+        """
+        Entry/exit signal arrays for the whole of df (see backtest.vectorized_engine).
+        Must be implemented by strategies that set vectorized = True, directly or through
+        entry_signals() and exit_levels().
+        """
+        entries = cls.entry_signals(df, **params)
+        return {**entries, **cls.exit_levels(df, entries, **params)}
+
+    @classmethod
+    def entry_signals(cls, df: pd.DataFrame, **params) -> dict:
+        """
+        Entry signal arrays ('long_entries', 'short_entries', 'start'), which must not
+        depend on exit_params.
+        """
+        raise NotImplementedError(f"{cls.__name__} does not provide vectorized signals.")
+
+    @classmethod
+    def exit_levels(cls, df: pd.DataFrame, entries: dict, **params) -> dict:
+        """
+        SL/TP level arrays ('sl', 'tp') for entries from entry_signals(). Exit parameters
+        may be (params x 1) columns when entries are (params x bars) arrays.
+        """
+        return {}
+
+    @classmethod
+    def prepare_indicators(cls, df: pd.DataFrame, param_sets: list):
+        """
+        Hook called by batch_signals() before computing entries, to compute the indicators
+        of many parameter sets at once (e.g., a multi-window SMA) into the indicator cache.
+        """
+        pass
+
+    @classmethod
+    def entry_key(cls, params: dict) -> tuple:
+        """
+        Parameters that determine the entry signals, as a hashable key.
+        """
+        return tuple(sorted((name, value) for name, value in params.items() if name not in cls.exit_params))
+
+    @staticmethod
+    def crossover_mask(series1: np.ndarray, series2: np.ndarray) -> np.ndarray:
+        """
+        Bars on which series1 crossed above series2 (vectorized crossed_over()).
+        2-D inputs are (params x bars) and are compared along the last axis.
+        """
+        series1 = np.asarray(series1, dtype='float64')
+        series2 = np.asarray(series2, dtype='float64')
+        mask = np.zeros(np.broadcast(series1, series2).shape, dtype=bool)
+        mask[..., 1:] = (series1[..., :-1] < series2[..., :-1]) & (series1[..., 1:] > series2[..., 1:])
+        return mask
+
+    @staticmethod
+    def warmup_start(*indicators) -> int:
+        """
+        First bar on which Backtest.run() calls next() for these indicators: one bar
+        after the latest first non-NaN value.
+        """
+        return 1 + max((int(np.isnan(np.asarray(indicator, dtype='float64')).argmin()) for indicator in indicators),
+                       default=0)
+
+    @classmethod
+    def batch_signals(cls, df, param_sets: list, entry_cache: dict = None) -> dict:
+        """
+        signals() of several parameter sets as (params x bars) arrays, for the batched
+        optimizer. Entry signals are computed once per distinct entry_key() and the
+        exit_params of all parameter sets are applied to them in one exit_levels() call.
+
+        Parameters:
+            df (pd.DataFrame): OHLCV data.
+            param_sets (list): Dictionaries of strategy parameters.
+            entry_cache (dict, optional): entry_key() -> entry signals, reused across calls.
+
+        Returns:
+            dict: Signal arrays stacked row by row; 'start' holds one value per parameter set.
+        """
+        entry_cache = {} if entry_cache is None else entry_cache
+        split = bool(cls.exit_params)
+        missing = [params for params in param_sets if cls.entry_key(params) not in entry_cache]
+        if missing:
+            cls.prepare_indicators(df, missing)
+        signal_dicts = []
+        for params in param_sets:
+            key = cls.entry_key(params)
+            if key not in entry_cache:
+                entry_cache[key] = cls.entry_signals(df, **params) if split else cls.signals(df, **params)
+            signal_dicts.append(entry_cache[key])
+        stacked = {}
+        for key in signal_dicts[0]:
+            values = [signals[key] for signals in signal_dicts]
+            stacked[key] = np.asarray(values) if key == 'start' else np.vstack(values)
+        if split:
+            exit_values = {name: np.array([[params[name]] for params in param_sets], dtype='float64')
+                           for name in cls.exit_params}
+            stacked.update(cls.exit_levels(df, stacked, **exit_values))
+        return stacked
+
+    def events_frame(self) -> pd.DataFrame:
+        """
+        Events recorded during the run, with the timestamp of each event's bar.
+        """
+        return self.events.to_frame(self.timestamps)
 
     def next(self):
         """
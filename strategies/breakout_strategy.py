@@ -1,8 +1,10 @@
 # strategies/breakout_mtf_strategy.py
 
 from .base_strategy import BaseStrategy
+import numpy as np
 import pandas as pd
 import logging
+from utils.indicators import rolling_min_max, support_resistance_columns, cached_indicator, calculate_moving_average
 
 class BreakoutMTFStrategy(BaseStrategy):
     """
@@ -18,16 +20,22 @@ class BreakoutMTFStrategy(BaseStrategy):
         'sl_percent': {'type': float, 'default': 7, 'prompt': 'Enter stop-loss percentage (e.g., 7): '},
         'higher_tf_short_ma': {'type': int, 'default': 20, 'prompt': 'Enter higher_tf_short_ma (e.g., 20): '},
         'higher_tf_long_ma': {'type': int, 'default': 50, 'prompt': 'Enter higher_tf_long_ma (e.g., 50): '},
+        'sr_window': {'type': int, 'default': None, 'prompt': 'Enter support/resistance window in higher timeframe bars (blank for the stored levels): '},
         'primary_tf': {'type': str, 'default': '5m', 'prompt': 'Enter primary timeframe (e.g., 5m): '},
         'higher_tf': {'type': str, 'default': '1H', 'prompt': 'Enter higher timeframe (e.g., 1H): '},
         'requires_multiple_timeframes': {'type': bool, 'default': True},
     }
 
-    optimizable_params = ['tp_percent', 'sl_percent', 'higher_tf_short_ma', 'higher_tf_long_ma']
+    optimizable_params = ['tp_percent', 'sl_percent', 'higher_tf_short_ma', 'higher_tf_long_ma', 'sr_window']
+    exit_params = ['sl_percent', 'tp_percent']  # Only set SL/TP levels
 
     # Define higher_tf_data as a class variable to receive data
     higher_tf_data = None
 
+    # Support/resistance window; None uses the 'support'/'resistance' columns, a number
+    # selects the precomputed 'support_{w}'/'resistance_{w}' bank columns
+    sr_window = None
+
     def init(self):
         """
         Initialize indicators and align higher timeframe data.
@@ -45,26 +53,30 @@ class BreakoutMTFStrategy(BaseStrategy):
             logging.error("Higher timeframe data 'higher_tf_data' is not a pandas DataFrame.")
             raise TypeError("Higher timeframe data 'higher_tf_data' is not a pandas DataFrame.")
 
-        required_columns = {'Close', 'support', 'resistance'}
+        support_column, resistance_column = support_resistance_columns(self.sr_window)
+        if self.sr_window is not None and support_column not in self.higher_tf_data.columns:
+            # Window not in the stored bank: compute it once for this run
+            logging.warning(f"Support/resistance window {self.sr_window} not precomputed; computing it.")
+            support, resistance = rolling_min_max(self.higher_tf_data['Close'].to_numpy(dtype='float64'), self.sr_window)
+            self.higher_tf_data = self.higher_tf_data.assign(**{support_column: support, resistance_column: resistance})
+
+        required_columns = {'Close', support_column, resistance_column}
         if not required_columns.issubset(self.higher_tf_data.columns):
             missing = required_columns - set(self.higher_tf_data.columns)
             logging.error(f"Required columns missing in higher timeframe data 'higher_tf_data': {missing}")
             raise ValueError(f"Required columns missing in higher timeframe data 'higher_tf_data': {missing}")
 
         # Calculate higher timeframe moving averages using parameters
-        self.higher_short_ma = self.higher_tf_data['Close'].rolling(window=self.higher_tf_short_ma).mean()
-        self.higher_long_ma = self.higher_tf_data['Close'].rolling(window=self.higher_tf_long_ma).mean()
-
-        # Align higher timeframe support and resistance with primary timeframe using forward fill
-        self.higher_support = self.higher_tf_data['support'].reindex(self.data.index, method='ffill')
-        self.higher_resistance = self.higher_tf_data['resistance'].reindex(self.data.index, method='ffill')
+        self.higher_short_ma = cached_indicator(calculate_moving_average, self.higher_tf_data['Close'], self.higher_tf_short_ma)
+        self.higher_long_ma = cached_indicator(calculate_moving_average, self.higher_tf_data['Close'], self.higher_tf_long_ma)
 
-        # Initialize index pointer for higher timeframe data
-        self.current_higher_index = 0
-
-        # Initialize previous higher timeframe moving averages for trend determination
-        self.prev_higher_short_ma = None
-        self.prev_higher_long_ma = None
+        # Align higher timeframe indicators with the primary timeframe: each primary bar sees
+        # the values of the last higher timeframe bar that had already closed
+        self.higher_bar_index = self.align_higher_timeframe(self.higher_tf_data.index)
+        self.higher_short_ma_values = self.align_values(self.higher_short_ma, self.higher_bar_index)
+        self.higher_long_ma_values = self.align_values(self.higher_long_ma, self.higher_bar_index)
+        self.higher_support = self.align_values(self.higher_tf_data[support_column], self.higher_bar_index)
+        self.higher_resistance = self.align_values(self.higher_tf_data[resistance_column], self.higher_bar_index)
 
         logging.info("BreakoutMTFStrategy initialized successfully.")
 
@@ -73,51 +85,24 @@ class BreakoutMTFStrategy(BaseStrategy):
         Execute the trading logic on each new bar.
         """
         try:
-            # Get the current timestamp from primary timeframe
-            current_timestamp = self.data.index[-1]
-            logging.debug(f"Current timestamp: {current_timestamp}")
-
-            # Advance higher_tf_index if the next higher_tf_data timestamp <= current_timestamp
-            while (self.current_higher_index < len(self.higher_short_ma) - 1 and
-                   self.higher_tf_data.index[self.current_higher_index + 1] <= current_timestamp):
-                self.current_higher_index += 1
-                logging.debug(f"Advanced higher_tf_index to {self.current_higher_index}")
+            i = self.bar_index
 
-            # Get current higher_tf moving averages
-            higher_short_ma = self.higher_short_ma.iloc[self.current_higher_index]
-            higher_long_ma = self.higher_long_ma.iloc[self.current_higher_index]
-            logging.debug(f"Higher Short MA: {higher_short_ma}, Higher Long MA: {higher_long_ma}")
+            # Higher timeframe moving averages of the last closed higher bar
+            higher_short_ma = self.higher_short_ma_values[i]
+            higher_long_ma = self.higher_long_ma_values[i]
 
             # Check if moving averages are valid
-            if pd.isna(higher_short_ma) or pd.isna(higher_long_ma):
-                logging.debug("HTF moving averages are NaN, skipping signal generation.")
+            if np.isnan(higher_short_ma) or np.isnan(higher_long_ma):
                 return  # Not enough data to compute moving averages
 
-            # Determine higher timeframe trend
-            if self.prev_higher_short_ma is not None and self.prev_higher_long_ma is not None:
-                higher_trend_bullish = (
-                    self.prev_higher_short_ma < self.prev_higher_long_ma and
-                    higher_short_ma > higher_long_ma
-                )
-                higher_trend_bearish = (
-                    self.prev_higher_short_ma > self.prev_higher_long_ma and
-                    higher_short_ma < higher_long_ma
-                )
-                logging.debug(f"Higher Trend Bullish: {higher_trend_bullish}, Higher Trend Bearish: {higher_trend_bearish}")
-            else:
-                higher_trend_bullish = False
-                higher_trend_bearish = False
-                logging.debug("No previous HTF moving averages to determine trend.")
-
-            # Update previous higher_tf moving averages
-            self.prev_higher_short_ma = higher_short_ma
-            self.prev_higher_long_ma = higher_long_ma
+            # Higher timeframe trend: crossover between the previous primary bar and this one
+            higher_trend_bullish = self.crossed_over(self.higher_short_ma_values, self.higher_long_ma_values)
+            higher_trend_bearish = self.crossed_over(self.higher_long_ma_values, self.higher_short_ma_values)
 
             # Get current close price and HTF resistance/support
-            current_close = self.data.Close[-1]
-            hourly_resistance = self.higher_resistance.iloc[self.current_higher_index]
-            hourly_support = self.higher_support.iloc[self.current_higher_index]
-            logging.debug(f"Current Close: {current_close}, Hourly Resistance: {hourly_resistance}, Hourly Support: {hourly_support}")
+            current_close = self.closes[i]
+            hourly_resistance = self.higher_resistance[i]
+            hourly_support = self.higher_support[i]
 
             # Check for breakout above resistance
             if current_close > hourly_resistance and higher_trend_bullish:
@@ -127,9 +112,8 @@ class BreakoutMTFStrategy(BaseStrategy):
 
                 # Ensure that SL and TP are logically placed
                 if stop_loss < entry_price < take_profit:
-                    logging.debug(f"Breakout Buy Signal: Entry={entry_price}, SL={stop_loss}, TP={take_profit}")
                     self.buy(sl=stop_loss, tp=take_profit)
-                    logging.info(f"Executed BUY at {entry_price} with SL={stop_loss} and TP={take_profit}")
+                    self.events.record(i, 'buy', entry_price, stop_loss, take_profit, hourly_resistance)
 
             # Check for breakout below support (Short Selling)
             if current_close < hourly_support and higher_trend_bearish:
@@ -139,9 +123,8 @@ class BreakoutMTFStrategy(BaseStrategy):
 
                 # Ensure that SL and TP are logically placed
                 if entry_price < stop_loss and take_profit < entry_price:
-                    logging.debug(f"Breakout Sell Signal: Entry={entry_price}, SL={stop_loss}, TP={take_profit}")
                     self.sell(sl=stop_loss, tp=take_profit)
-                    logging.info(f"Executed SELL at {entry_price} with SL={stop_loss} and TP={take_profit}")
+                    self.events.record(i, 'sell', entry_price, stop_loss, take_profit, hourly_support)
 
         except Exception as e:
             logging.error(f"Error in BreakoutMTFStrategy.next(): {e}")
@@ -0,0 +1,119 @@
+# strategies/event_recorder.py
+
+import numpy as np
+import pandas as pd
+
+
+class EventRecorder:
+    """
+    Columnar in-memory record of strategy events (signals, orders, diagnostics).
+    Each event is a bar position, a kind and up to four numbers (price, sl, tp, value)
+    written into preallocated NumPy arrays that double in size when full, so recording
+    an event costs a few array stores instead of a formatted log line.
+    """
+
+    enabled = True
+    COLUMNS = ('price', 'sl', 'tp', 'value')
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize the recorder.
+
+        Parameters:
+            capacity (int): Number of events preallocated before the first resize.
+        """
+        capacity = max(int(capacity), 1)
+        self._bars = np.empty(capacity, dtype='int64')
+        self._codes = np.empty(capacity, dtype='int16')
+        self._values = np.empty((capacity, len(self.COLUMNS)), dtype='float64')
+        self._size = 0
+        self.kinds = []
+        self._kind_codes = {}
+
+    def __len__(self):
+        return self._size
+
+    def record(self, bar: int, kind: str, price=np.nan, sl=np.nan, tp=np.nan, value=np.nan):
+        """
+        Append an event.
+
+        Parameters:
+            bar (int): Position of the bar the event belongs to (e.g., self.bar_index).
+            kind (str): Event kind (e.g., 'buy', 'sell', 'skip'); new kinds are registered on first use.
+            price, sl, tp, value (float): Event values; NaN when not applicable.
+        """
+        code = self._kind_codes.get(kind)
+        if code is None:
+            code = self._kind_codes[kind] = len(self.kinds)
+            self.kinds.append(kind)
+        if self._size == len(self._bars):
+            self._grow()
+        row = self._size
+        self._bars[row] = bar
+        self._codes[row] = code
+        self._values[row] = (price, sl, tp, value)
+        self._size = row + 1
+
+    def _grow(self):
+        capacity = 2 * len(self._bars)
+        self._bars = np.resize(self._bars, capacity)
+        self._codes = np.resize(self._codes, capacity)
+        values = np.empty((capacity, len(self.COLUMNS)), dtype='float64')
+        values[:self._size] = self._values[:self._size]
+        self._values = values
+
+    def clear(self):
+        self._size = 0
+
+    def to_frame(self, timestamps=None) -> pd.DataFrame:
+        """
+        Recorded events as a DataFrame with columns bar, kind, price, sl, tp and value.
+
+        Parameters:
+            timestamps (array-like, optional): Timestamps of the bars; adds a 'timestamp' column.
+
+        Returns:
+            pd.DataFrame: One row per event, in recording order.
+        """
+        size = self._size
+        frame = pd.DataFrame({'bar': self._bars[:size].copy()})
+        if timestamps is not None:
+            frame.insert(0, 'timestamp', np.asarray(timestamps)[frame['bar'].to_numpy()])
+        frame['kind'] = pd.Categorical.from_codes(self._codes[:size], categories=self.kinds) if self.kinds \
+            else pd.Categorical([])
+        for position, column in enumerate(self.COLUMNS):
+            frame[column] = self._values[:size, position]
+        return frame
+
+    def to_parquet(self, path: str, timestamps=None):
+        """
+        Write the recorded events to a Parquet file.
+        """
+        self.to_frame(timestamps).to_parquet(path, index=False)
+
+
+class NullEventRecorder:
+    """
+    Recorder used when event recording is disabled: every call is a no-op.
+    """
+
+    enabled = False
+    kinds = ()
+
+    def __len__(self):
+        return 0
+
+    def record(self, bar, kind, price=np.nan, sl=np.nan, tp=np.nan, value=np.nan):
+        pass
+
+    def clear(self):
+        pass
+
+    def to_frame(self, timestamps=None) -> pd.DataFrame:
+        return EventRecorder(1).to_frame(timestamps)
+
+    def to_parquet(self, path: str, timestamps=None):
+        self.to_frame(timestamps).to_parquet(path, index=False)
+
+
+NULL_EVENT_RECORDER = NullEventRecorder()
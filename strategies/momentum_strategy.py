@@ -1,8 +1,9 @@
 # strategies/momentum_strategy.py
 
 from .base_strategy import BaseStrategy
-from backtesting.lib import crossover
+from utils.indicators import INDICATOR_CACHE, cached_indicator, sma
 import logging
+import numpy as np
 import pandas as pd  # Ensure pandas is imported
 
 def SMA(data, window):
@@ -19,7 +20,7 @@ def SMA(data, window):
     if not isinstance(data, pd.Series):
         logging.error(f"SMA function received data type: {type(data)} instead of pd.Series")
         return pd.Series([None]*len(data))
-    return data.rolling(window=window).mean()
+    return pd.Series(sma(data.to_numpy(dtype='float64'), window), index=data.index)
 
 class MomentumStrategy(BaseStrategy):
     """
@@ -39,10 +40,15 @@ class MomentumStrategy(BaseStrategy):
 
     optimizable_params = ['short_window', 'long_window', 'sl_percent', 'tp_percent']
 
+    # Pure crossover with percentage SL/TP: can run on the vectorized engine
+    vectorized = True
+    exit_params = ['sl_percent', 'tp_percent']
+
     def init(self):
         """
         Initialize moving averages on the primary timeframe using the custom SMA function.
         """
+        super().init()
         logging.info(f"MomentumStrategy.init: self.data type: {type(self.data)}")
 
         try:
@@ -55,40 +61,76 @@ class MomentumStrategy(BaseStrategy):
             logging.error(f"Error accessing self.data.df: {e}")
             raise
 
-        # Initialize short and long moving averages using the custom SMA function
-        self.short_ma = self.I(SMA, self.data.df['Close'], self.short_window)
-        self.long_ma = self.I(SMA, self.data.df['Close'], self.long_window)
+        # Initialize short and long moving averages using the custom SMA function (memoized)
+        self.short_ma = self.cached_I(SMA, self.data.df['Close'], self.short_window)
+        self.long_ma = self.cached_I(SMA, self.data.df['Close'], self.long_window)
+        # Plain arrays of the full series for per-bar reads in next()
+        self.short_ma_values = self.as_array(self.short_ma)
+        self.long_ma_values = self.as_array(self.long_ma)
 
         logging.info("Initialized short_ma and long_ma using SMA.")
 
+    @classmethod
+    def prepare_indicators(cls, df, param_sets: list):
+        """
+        Compute the SMAs of every window in param_sets in one multi-window pass and
+        store them in the indicator cache used by entry_signals().
+        """
+        windows = sorted({params[name] for params in param_sets for name in ('short_window', 'long_window')})
+        averages = sma(df['Close'].to_numpy(dtype='float64'), windows)
+        INDICATOR_CACHE.put_many(SMA, df['Close'], [(window,) for window in windows], averages)
+
+    @classmethod
+    def entry_signals(cls, df, short_window, long_window, **params):
+        """
+        Moving average crossover entries of next() for the whole of df, as arrays.
+
+        Returns:
+            dict: Entry signal arrays for the vectorized engine.
+        """
+        short_ma = cached_indicator(SMA, df['Close'], short_window)
+        long_ma = cached_indicator(SMA, df['Close'], long_window)
+        long_entries = cls.crossover_mask(short_ma, long_ma)
+        return {
+            'long_entries': long_entries,
+            'short_entries': cls.crossover_mask(long_ma, short_ma) & ~long_entries,
+            'start': cls.warmup_start(short_ma, long_ma),
+        }
+
+    @classmethod
+    def exit_levels(cls, df, entries, sl_percent, tp_percent, **params):
+        """
+        SL/TP levels of next(): percentages of the close of the signal bar.
+
+        Returns:
+            dict: 'sl' and 'tp' arrays shaped like the entry signals.
+        """
+        closes = df['Close'].to_numpy(dtype='float64')
+        long_entries = entries['long_entries']
+        return {
+            'sl': np.where(long_entries, closes * (1 - sl_percent / 100), closes * (1 + sl_percent / 100)),
+            'tp': np.where(long_entries, closes * (1 + tp_percent / 100), closes * (1 - tp_percent / 100)),
+        }
+
     def next(self):
         """
         Execute the trading logic based on moving average crossover.
         """
         try:
-            # Current close price accessed via the DataFrame
-            current_close = self.data.df['Close'][-1]
-            # Current moving average values
-            current_short_ma = self.short_ma[-1]
-            current_long_ma = self.long_ma[-1]
-
-            logging.info(f"Current Close Price: {current_close}")
-            logging.info(f"Short MA: {current_short_ma}, Long MA: {current_long_ma}")
+            # Current close price read from the precomputed arrays
+            i = self.bar_index
+            current_close = self.closes[i]
 
             # Check for crossover conditions
-            if crossover(self.short_ma, self.long_ma):
-                self.buy(
-                    sl=current_close * (1 - self.sl_percent / 100),  # Stop-loss percentage below current price
-                    tp=current_close * (1 + self.tp_percent / 100)   # Take-profit percentage above current price
-                )
-                print(f'BUY signal triggered at {current_close}')
-                logging.info(f"BUY signal triggered at {current_close}")
-            elif crossover(self.long_ma, self.short_ma):
-                self.sell(
-                    sl=current_close * (1 + self.sl_percent / 100),  # Stop-loss percentage above current price
-                    tp=current_close * (1 - self.tp_percent / 100)   # Take-profit percentage below current price
-                )
-                print(f'SELL signal triggered at {current_close}')
-                logging.info(f"SELL signal triggered at {current_close}")
+            if self.crossed_over(self.short_ma_values, self.long_ma_values):
+                sl = current_close * (1 - self.sl_percent / 100)  # Stop-loss percentage below current price
+                tp = current_close * (1 + self.tp_percent / 100)  # Take-profit percentage above current price
+                self.buy(sl=sl, tp=tp)
+                self.events.record(i, 'buy', current_close, sl, tp)
+            elif self.crossed_over(self.long_ma_values, self.short_ma_values):
+                sl = current_close * (1 + self.sl_percent / 100)  # Stop-loss percentage above current price
+                tp = current_close * (1 - self.tp_percent / 100)  # Take-profit percentage below current price
+                self.sell(sl=sl, tp=tp)
+                self.events.record(i, 'sell', current_close, sl, tp)
         except Exception as e:
             logging.error(f"Error in MomentumStrategy.next(): {e}")
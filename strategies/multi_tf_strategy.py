@@ -1,8 +1,10 @@
 # strategies/multi_timeframe_strategy.py
 
 from .base_strategy import BaseStrategy
+import numpy as np
 import pandas as pd
 import logging
+from utils.indicators import cached_indicator, calculate_moving_average
 
 class MultiTimeframeStrategy(BaseStrategy):
     """
@@ -33,6 +35,7 @@ class MultiTimeframeStrategy(BaseStrategy):
         'sl_percent',
         'tp_percent'
     ]
+    exit_params = ['sl_percent', 'tp_percent']  # Only set SL/TP levels
 
     higher_tf_data = None  # Define as a class variable to receive data
 
@@ -40,6 +43,8 @@ class MultiTimeframeStrategy(BaseStrategy):
         """
         Initialize moving averages for both higher and current timeframes.
         """
+        super().init()
+
         # Access higher timeframe data
         higher_tf_data = self.higher_tf_data
         if higher_tf_data is None:
@@ -56,19 +61,21 @@ class MultiTimeframeStrategy(BaseStrategy):
 
         # Compute higher timeframe moving averages and store in higher_tf_data
         self.higher_tf_data = higher_tf_data.copy()
-        self.higher_tf_data['higher_short_ma'] = self.higher_tf_data['Close'].rolling(window=self.higher_tf_short_ma).mean()
-        self.higher_tf_data['higher_long_ma'] = self.higher_tf_data['Close'].rolling(window=self.higher_tf_long_ma).mean()
-
-        # Initialize a pointer to track the current higher timeframe index
-        self.current_higher_index = 0
-
-        # Initialize current timeframe moving averages using self.I() with lambda functions
-        self.current_short_ma = self.I(lambda x: x.rolling(window=self.current_tf_short_ma).mean(), self.data.df['Close'])
-        self.current_long_ma = self.I(lambda x: x.rolling(window=self.current_tf_long_ma).mean(), self.data.df['Close'])
-
-        # Initialize previous higher_tf moving averages for crossover detection
-        self.prev_higher_short_ma = None
-        self.prev_higher_long_ma = None
+        self.higher_tf_data['higher_short_ma'] = cached_indicator(
+            calculate_moving_average, self.higher_tf_data['Close'], self.higher_tf_short_ma)
+        self.higher_tf_data['higher_long_ma'] = cached_indicator(
+            calculate_moving_average, self.higher_tf_data['Close'], self.higher_tf_long_ma)
+
+        # Initialize current timeframe moving averages through the shared indicator cache
+        self.current_short_ma = self.cached_I(calculate_moving_average, self.data.df['Close'], self.current_tf_short_ma)
+        self.current_long_ma = self.cached_I(calculate_moving_average, self.data.df['Close'], self.current_tf_long_ma)
+        self.current_short_ma_values = self.as_array(self.current_short_ma)
+        self.current_long_ma_values = self.as_array(self.current_long_ma)
+
+        # Higher timeframe moving averages of the last closed higher bar, one value per primary bar
+        self.higher_bar_index = self.align_higher_timeframe(self.higher_tf_data.index)
+        self.higher_short_ma_values = self.align_values(self.higher_tf_data['higher_short_ma'], self.higher_bar_index)
+        self.higher_long_ma_values = self.align_values(self.higher_tf_data['higher_long_ma'], self.higher_bar_index)
 
         logging.info("Initialized higher and current timeframe moving averages.")
 
@@ -77,79 +84,37 @@ class MultiTimeframeStrategy(BaseStrategy):
         Execute the trading logic based on higher and current timeframe indicators.
         """
         try:
-            # Get current timestamp from primary timeframe
-            current_timestamp = self.data.index[-1]
-            logging.debug(f"Current timestamp: {current_timestamp}")
-
-            # Advance higher_tf_index if the next higher_tf_data timestamp <= current_timestamp
-            while (self.current_higher_index < len(self.higher_tf_data) - 1 and
-                   self.higher_tf_data.index[self.current_higher_index + 1] <= current_timestamp):
-                self.current_higher_index += 1
-                logging.debug(f"Advanced higher_tf_index to {self.current_higher_index}")
+            i = self.bar_index
 
-            # Get current higher_tf moving averages
-            higher_short_ma = self.higher_tf_data['higher_short_ma'].iloc[self.current_higher_index]
-            higher_long_ma = self.higher_tf_data['higher_long_ma'].iloc[self.current_higher_index]
-            logging.debug(f"Higher Short MA: {higher_short_ma}, Higher Long MA: {higher_long_ma}")
+            # Higher timeframe moving averages of the last closed higher bar
+            higher_short_ma = self.higher_short_ma_values[i]
+            higher_long_ma = self.higher_long_ma_values[i]
 
             # Check if moving averages are valid
-            if pd.isna(higher_short_ma) or pd.isna(higher_long_ma):
-                logging.debug("HTF moving averages are NaN, skipping signal generation.")
+            if np.isnan(higher_short_ma) or np.isnan(higher_long_ma):
                 return  # Not enough data to compute moving averages
 
-            # Determine higher timeframe trend
-            if self.prev_higher_short_ma is not None and self.prev_higher_long_ma is not None:
-                higher_trend_bullish = (
-                    self.prev_higher_short_ma < self.prev_higher_long_ma and
-                    higher_short_ma > higher_long_ma
-                )
-                higher_trend_bearish = (
-                    self.prev_higher_short_ma > self.prev_higher_long_ma and
-                    higher_short_ma < higher_long_ma
-                )
-                logging.debug(f"Higher Trend Bullish: {higher_trend_bullish}, Higher Trend Bearish: {higher_trend_bearish}")
-            else:
-                higher_trend_bullish = False
-                higher_trend_bearish = False
-                logging.debug("No previous HTF moving averages to determine trend.")
-
-            # Update previous higher_tf moving averages
-            self.prev_higher_short_ma = higher_short_ma
-            self.prev_higher_long_ma = higher_long_ma
+            # Higher timeframe trend: crossover between the previous primary bar and this one
+            higher_trend_bullish = self.crossed_over(self.higher_short_ma_values, self.higher_long_ma_values)
+            higher_trend_bearish = self.crossed_over(self.higher_long_ma_values, self.higher_short_ma_values)
 
             # Determine current timeframe signal using the last two values
-            if len(self.current_short_ma) < 2 or len(self.current_long_ma) < 2:
-                logging.debug("Not enough data to compute CTF signals.")
-                return  # Not enough data to compute signals
-
-            current_signal_buy = (
-                self.current_short_ma[-2] < self.current_long_ma[-2] and
-                self.current_short_ma[-1] > self.current_long_ma[-1]
-            )
-            current_signal_sell = (
-                self.current_short_ma[-2] > self.current_long_ma[-2] and
-                self.current_short_ma[-1] < self.current_long_ma[-1]
-            )
-            logging.debug(f"Current Signal Buy: {current_signal_buy}, Current Signal Sell: {current_signal_sell}")
+            current_signal_buy = self.crossed_over(self.current_short_ma_values, self.current_long_ma_values)
+            current_signal_sell = self.crossed_over(self.current_long_ma_values, self.current_short_ma_values)
 
             # Generate signals based on both timeframes
-            current_close_price = self.data.df['Close'].iloc[-1]
-            logging.debug(f"Current Close Price: {current_close_price}")
+            current_close_price = self.closes[i]
 
             if higher_trend_bullish and current_signal_buy:
-                self.buy(
-                    sl=current_close_price * (1 - self.sl_percent / 100),  # Stop-loss percentage below current price
-                    tp=current_close_price * (1 + self.tp_percent / 100)   # Take-profit percentage above current price
-                )
-                logging.info(f"BUY signal at {current_close_price} based on multi-timeframe analysis")
-                print(f'BUY signal triggered at {current_close_price} based on multi-timeframe analysis')
+                sl = current_close_price * (1 - self.sl_percent / 100)  # Stop-loss percentage below current price
+                tp = current_close_price * (1 + self.tp_percent / 100)  # Take-profit percentage above current price
+                self.buy(sl=sl, tp=tp)
+                self.events.record(i, 'buy', current_close_price, sl, tp)
             elif higher_trend_bearish and current_signal_sell:
-                self.sell(
-                    sl=current_close_price * (1 + self.sl_percent / 100),  # Stop-loss percentage above current price
-                    tp=current_close_price * (1 - self.tp_percent / 100)   # Take-profit percentage below current price
-                )
-                logging.info(f"SELL signal at {current_close_price} based on multi-timeframe analysis")
-                print(f'SELL signal triggered at {current_close_price} based on multi-timeframe analysis')
+                sl = current_close_price * (1 + self.sl_percent / 100)  # Stop-loss percentage above current price
+                tp = current_close_price * (1 - self.tp_percent / 100)  # Take-profit percentage below current price
+                self.sell(sl=sl, tp=tp)
+                self.events.record(i, 'sell', current_close_price, sl, tp)
 
         except Exception as e:
             logging.error(f"Error in MultiTimeframeStrategy.next(): {e}")
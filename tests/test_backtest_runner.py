@@ -0,0 +1,291 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from backtesting import Backtest
+from backtesting.lib import crossover
+from strategies.momentum_strategy import MomentumStrategy
+from strategies.multi_tf_strategy import MultiTimeframeStrategy
+from strategies.breakout_strategy import BreakoutMTFStrategy
+from strategies.event_recorder import EventRecorder, NULL_EVENT_RECORDER
+from data.array_store import SharedFrame
+from backtest_framework.backtest.backtest_runner import BacktestRunner
+from backtest_framework.backtest.vectorized_engine import VectorizedBacktest
+
+def make_bars(rows, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 0.5, rows))
+    index = pd.date_range('2023-01-01', periods=rows, freq='min', name='timestamp')
+    return pd.DataFrame({
+        'Open': close + rng.normal(0.0, 0.1, rows),
+        'High': close + 0.5,
+        'Low': close - 0.5,
+        'Close': close,
+        'Volume': rng.uniform(0.0, 10.0, rows),
+    }, index=index)
+
+def make_ohlc(rows, seed):
+    # Geometric random walk with gaps between bars and wicks beyond open/close
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.002, rows)))
+    open_ = np.r_[close[0], close[:-1]] + rng.normal(0.0, 0.05, rows)
+    index = pd.date_range('2023-01-01', periods=rows, freq='5min', name='timestamp')
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + rng.uniform(0.0, 0.2, rows),
+        'Low': np.minimum(open_, close) - rng.uniform(0.0, 0.2, rows),
+        'Close': close,
+        'Volume': rng.uniform(0.0, 10.0, rows),
+    }, index=index)
+
+class PandasAccessMomentumStrategy(MomentumStrategy):
+    """
+    MomentumStrategy reading bars through pandas and crossover(), as before the array API.
+    """
+
+    def next(self):
+        current_close = self.data.df['Close'].iloc[-1]
+        if crossover(self.short_ma, self.long_ma):
+            self.buy(sl=current_close * (1 - self.sl_percent / 100), tp=current_close * (1 + self.tp_percent / 100))
+        elif crossover(self.long_ma, self.short_ma):
+            self.sell(sl=current_close * (1 + self.sl_percent / 100), tp=current_close * (1 - self.tp_percent / 100))
+
+class TestStrategyBarAccess(unittest.TestCase):
+
+    def run_backtest(self, strategy_class, df):
+        strategy_class = type(strategy_class.__name__, (strategy_class,), {
+            'short_window': 10, 'long_window': 30, 'sl_percent': 1.0, 'tp_percent': 2.0,
+        })
+        bt = Backtest(df, strategy_class, cash=100000, commission=0.0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return bt.run()
+
+    def test_arrays_follow_current_bar(self):
+        df = make_bars(200)
+        seen = []
+
+        class Probe(MomentumStrategy):
+            def next(self):
+                seen.append((self.bar_index, self.closes[self.bar_index], self.data.Close[-1],
+                             self.timestamps[self.bar_index], self.data.index[-1]))
+
+        self.run_backtest(Probe, df)
+        self.assertEqual(len(seen), len(df) - 30)
+        for bar_index, close, data_close, timestamp, data_timestamp in seen:
+            self.assertEqual(close, data_close)
+            self.assertEqual(pd.Timestamp(timestamp), data_timestamp)
+        self.assertEqual(seen[-1][0], len(df) - 1)
+
+    def test_array_access_matches_pandas_access(self):
+        df = make_bars(3000)
+        legacy = self.run_backtest(PandasAccessMomentumStrategy, df)
+        arrays = self.run_backtest(MomentumStrategy, df)
+        self.assertGreater(arrays['# Trades'], 0)
+        self.assertEqual(arrays['# Trades'], legacy['# Trades'])
+        self.assertAlmostEqual(arrays['Equity Final [$]'], legacy['Equity Final [$]'])
+        pd.testing.assert_frame_equal(arrays['_trades'], legacy['_trades'])
+
+class TestHigherTimeframeAlignment(unittest.TestCase):
+
+    def setUp(self):
+        one_minute = make_bars(6000)
+        aggregation = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+        self.primary = one_minute.resample('5min').agg(aggregation)
+        self.higher = one_minute.resample('1h').agg(aggregation)
+        self.higher['support'] = self.higher['Close'].rolling(3).min()
+        self.higher['resistance'] = self.higher['Close'].rolling(3).max()
+
+    def run_strategy(self, strategy_class, **params):
+        captured = {}
+
+        class Capture(strategy_class):
+            def init(self):
+                super().init()
+                captured['strategy'] = self
+
+        for name, value in {'primary_tf': '5m', 'higher_tf': '1H', 'higher_tf_data': self.higher, **params}.items():
+            setattr(Capture, name, value)
+        bt = Backtest(self.primary, Capture, cash=100000, commission=0.0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            bt.run()
+        return captured['strategy']
+
+    def test_maps_primary_bars_to_last_closed_higher_bar(self):
+        strategy = self.run_strategy(MultiTimeframeStrategy, higher_tf_short_ma=2, higher_tf_long_ma=4,
+                                     current_tf_short_ma=3, current_tf_long_ma=7)
+        alignment = strategy.higher_bar_index
+        self.assertEqual(len(alignment), len(self.primary))
+        # 00:00-00:50 primary bars close before the first hourly bar does
+        np.testing.assert_array_equal(alignment[:11], -1)
+        # The 00:55 bar closes at 01:00, together with the 00:00 hourly bar
+        self.assertEqual(alignment[11], 0)
+        self.assertEqual(alignment[12 + 11], 1)
+        # A higher bar is only used once it has closed
+        primary_close = self.primary.index + pd.Timedelta('5min')
+        higher_close = self.higher.index[alignment[alignment >= 0]] + pd.Timedelta('1h')
+        self.assertTrue((higher_close <= primary_close[alignment >= 0]).all())
+        expected = self.higher['Close'].rolling(4).mean().to_numpy()[alignment[alignment >= 0]]
+        np.testing.assert_allclose(strategy.higher_long_ma_values[alignment >= 0], expected, rtol=1e-12)
+        self.assertTrue(np.isnan(strategy.higher_long_ma_values[alignment < 0]).all())
+
+    def test_breakout_levels_come_from_closed_higher_bars(self):
+        strategy = self.run_strategy(BreakoutMTFStrategy, higher_tf_short_ma=2, higher_tf_long_ma=4,
+                                     sl_percent=7, tp_percent=14, sr_window=None)
+        alignment = strategy.higher_bar_index
+        closed = alignment >= 0
+        np.testing.assert_array_equal(strategy.higher_resistance[closed],
+                                      self.higher['resistance'].to_numpy()[alignment[closed]])
+        np.testing.assert_array_equal(strategy.higher_support[closed],
+                                      self.higher['support'].to_numpy()[alignment[closed]])
+
+class TestVectorizedEngine(unittest.TestCase):
+
+    KEY_STATS = ['Equity Final [$]', 'Sharpe Ratio', 'Max. Drawdown [%]', 'Win Rate [%]',
+                 'Return [%]', 'Exposure Time [%]', '# Trades', 'SQN']
+
+    def assert_same_results(self, expected, actual):
+        for stat in self.KEY_STATS:
+            if pd.isna(expected[stat]):
+                self.assertTrue(pd.isna(actual[stat]), stat)
+            else:
+                self.assertEqual(actual[stat], expected[stat], stat)
+        pd.testing.assert_frame_equal(actual['_trades'], expected['_trades'])
+        np.testing.assert_array_equal(actual['_equity_curve']['Equity'].to_numpy(),
+                                      expected['_equity_curve']['Equity'].to_numpy())
+
+    def test_matches_backtesting_py(self):
+        param_sets = [
+            {'short_window': 5, 'long_window': 20, 'sl_percent': 0.5, 'tp_percent': 1.0},
+            {'short_window': 10, 'long_window': 50, 'sl_percent': 2.0, 'tp_percent': 4.0},
+            {'short_window': 3, 'long_window': 7, 'sl_percent': 0.2, 'tp_percent': 0.3},
+        ]
+        for seed, commission in [(1, 0.0), (2, 0.001), (3, 0.002)]:
+            df = make_ohlc(4000, seed)
+            for params in param_sets:
+                strategy_class = type('MomentumStrategy', (MomentumStrategy,), params)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    expected = Backtest(df, strategy_class, cash=100000, commission=commission,
+                                        exclusive_orders=True).run()
+                actual = VectorizedBacktest(df, strategy_class, cash=100000, commission=commission).run()
+                with self.subTest(seed=seed, **params):
+                    self.assertGreater(expected['# Trades'], 0)
+                    self.assert_same_results(expected, actual)
+
+    def test_signals_at_the_end_of_the_data(self):
+        # Short series put crossovers on the last bars, where open trades are force-closed
+        strategy_class = type('MomentumStrategy', (MomentumStrategy,), {
+            'short_window': 2, 'long_window': 5, 'sl_percent': 0.1, 'tp_percent': 0.2,
+        })
+        for seed in range(40):
+            df = make_ohlc(30 + seed % 7, seed)
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected = Backtest(df, strategy_class, cash=100000, exclusive_orders=True).run()
+            actual = VectorizedBacktest(df, strategy_class, cash=100000).run()
+            with self.subTest(seed=seed):
+                self.assert_same_results(expected, actual)
+
+    def test_runner_uses_vectorized_engine_for_signal_strategies(self):
+        strategy_class = type('MomentumStrategy', (MomentumStrategy,), {
+            'short_window': 10, 'long_window': 30, 'sl_percent': 1.0, 'tp_percent': 2.0, 'primary_tf': '5m',
+        })
+        data_dict = {'TEST': {'5m': make_ohlc(3000, 4)}}
+        event = BacktestRunner([strategy_class], data_dict)
+        vectorized = BacktestRunner([strategy_class], data_dict, engine='vectorized')
+        with contextlib.redirect_stdout(io.StringIO()):
+            event.run_backtests()
+        vectorized.run_backtests()
+        expected = event.get_results()['MomentumStrategy_TEST']
+        actual = vectorized.get_results()['MomentumStrategy_TEST']
+        self.assertIsInstance(actual['_strategy'], strategy_class)
+        self.assertEqual(str(actual['_strategy']), str(expected['_strategy']))
+        self.assert_same_results(expected, actual)
+
+class TestConcurrentRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.strategy_class = type('MomentumStrategy', (MomentumStrategy,), {
+            'short_window': 10, 'long_window': 30, 'sl_percent': 1.0, 'tp_percent': 2.0, 'primary_tf': '5m',
+        })
+        self.data_dict = {asset: {'5m': make_ohlc(2000, seed), '1h': make_ohlc(200, seed)}
+                          for asset, seed in [('AAA', 5), ('BBB', 6), ('CCC', 7)]}
+
+    def test_matches_sequential_run(self):
+        for engine in ['event', 'vectorized']:
+            sequential = BacktestRunner([self.strategy_class], self.data_dict, engine=engine)
+            concurrent = BacktestRunner([self.strategy_class], self.data_dict, engine=engine)
+            with contextlib.redirect_stdout(io.StringIO()):
+                sequential.run_backtests()
+                concurrent.run_backtests(concurrent=True)
+            expected, actual = sequential.get_results(), concurrent.get_results()
+            self.assertEqual(sorted(actual), ['MomentumStrategy_AAA', 'MomentumStrategy_BBB', 'MomentumStrategy_CCC'])
+            for key in expected:
+                with self.subTest(engine=engine, key=key):
+                    self.assertNotIn('_strategy', actual[key])
+                    self.assertEqual(actual[key]['Equity Final [$]'], expected[key]['Equity Final [$]'])
+                    self.assertEqual(actual[key]['# Trades'], expected[key]['# Trades'])
+                    pd.testing.assert_frame_equal(actual[key]['_trades'], expected[key]['_trades'])
+
+    def test_publishes_only_the_timeframes_strategies_read(self):
+        runner = BacktestRunner([self.strategy_class], self.data_dict)
+        with tempfile.TemporaryDirectory() as store_dir:
+            shared_data = runner._publish_frames(store_dir)
+            self.assertEqual(sorted(shared_data), ['AAA', 'BBB', 'CCC'])
+            for asset, timeframes in shared_data.items():
+                self.assertEqual(list(timeframes), ['5m'])
+                self.assertIsInstance(timeframes['5m'], SharedFrame)
+                pd.testing.assert_frame_equal(timeframes['5m'].frame, self.data_dict[asset]['5m'],
+                                              check_freq=False)
+
+class TestEventRecorder(unittest.TestCase):
+
+    def test_records_columns_and_grows(self):
+        recorder = EventRecorder(capacity=2)
+        for bar in range(5):
+            recorder.record(bar, 'buy' if bar % 2 == 0 else 'sell', price=100.0 + bar, sl=99.0, tp=101.0)
+        recorder.record(7, 'skip', value=3.0)
+        timestamps = pd.date_range('2024-01-01', periods=10, freq='min')
+        frame = recorder.to_frame(timestamps)
+        self.assertEqual(len(frame), 6)
+        self.assertEqual(list(frame.columns), ['timestamp', 'bar', 'kind', 'price', 'sl', 'tp', 'value'])
+        self.assertEqual(frame['kind'].tolist(), ['buy', 'sell', 'buy', 'sell', 'buy', 'skip'])
+        self.assertEqual(frame['timestamp'].iloc[-1], timestamps[7])
+        self.assertEqual(frame['price'].iloc[4], 104.0)
+        self.assertTrue(np.isnan(frame['price'].iloc[5]))
+        self.assertEqual(frame['value'].iloc[5], 3.0)
+
+    def test_disabled_recorder_keeps_nothing(self):
+        NULL_EVENT_RECORDER.record(0, 'buy', 1.0)
+        self.assertEqual(len(NULL_EVENT_RECORDER), 0)
+        self.assertTrue(NULL_EVENT_RECORDER.to_frame().empty)
+
+    def test_runner_adds_events_to_results(self):
+        strategy_class = type('MomentumStrategy', (MomentumStrategy,), {
+            'short_window': 10, 'long_window': 30, 'sl_percent': 1.0, 'tp_percent': 2.0, 'primary_tf': '1m',
+        })
+        data_dict = {'TEST': {'1m': make_bars(3000)}}
+        with tempfile.TemporaryDirectory() as events_dir:
+            runner = BacktestRunner([strategy_class], data_dict, events_dir=events_dir)
+            runner.run_backtests()
+            output = runner.get_results()['MomentumStrategy_TEST']
+            events = output['_events']
+            self.assertGreater(len(events), 0)
+            self.assertTrue(set(events['kind']).issubset({'buy', 'sell'}))
+            # Every recorded order opened a trade on the next bar
+            self.assertEqual(len(events), len(output['_trades']))
+            saved = pd.read_parquet(os.path.join(events_dir, 'MomentumStrategy_TEST_events.parquet'))
+            self.assertEqual(len(saved), len(events))
+
+        runner = BacktestRunner([strategy_class], data_dict)
+        runner.run_backtests()
+        self.assertNotIn('_events', runner.get_results()['MomentumStrategy_TEST'])
+
+        # Workers record events too and send them back with the compact result
+        runner = BacktestRunner([strategy_class], data_dict, record_events=True)
+        runner.run_backtests(concurrent=True)
+        self.assertEqual(len(runner.get_results()['MomentumStrategy_TEST']['_events']), len(events))
+
+if __name__ == '__main__':
+    unittest.main()
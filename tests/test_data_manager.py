@@ -1,6 +1,14 @@
+import os
+import tempfile
+import pickle
+import time
 import unittest
+import numpy as np
 import pandas as pd
 from data.data_manager import DataManager
+from data.array_store import SharedFrame, resolve_frame
+from data.frame_cache import FrameCache
+from data.manifest import AssetManifest
 
 class TestDataManager(unittest.TestCase):
     
@@ -56,11 +64,482 @@ class TestDataManager(unittest.TestCase):
         self.assertIn('support', resampled_df.columns)
         self.assertIn('resistance', resampled_df.columns)
     
+    def test_resample_cascade_matches_direct_resampling(self):
+        index = pd.date_range(start='2020-08-31 21:00:00', periods=3000, freq='min')
+        close = [11670.0 + (i % 53) - (i % 17) for i in range(3000)]
+        df = pd.DataFrame({
+            'timestamp': index,
+            'Open': close,
+            'High': [c + 5.0 for c in close],
+            'Low': [c - 5.0 for c in close],
+            'Close': close,
+            'Volume': [float(i % 9) for i in range(3000)],
+            'support': [c - 10.0 for c in close],
+            'resistance': [c + 10.0 for c in close]
+        }).drop(index=range(100, 400))  # Leave a gap so some buckets are empty
+        frames = self.data_manager.resample_cascade(df, ['1D', '5m', '4H', '15m', '30m', '1H'])
+        self.assertEqual(list(frames), ['1m', '5m', '15m', '30m', '1H', '4H', '1D'])
+        for timeframe, rule in [('5m', '5min'), ('15m', '15min'), ('30m', '30min'), ('1H', '1h'), ('4H', '4h'), ('1D', '1D')]:
+            pd.testing.assert_frame_equal(frames[timeframe], self.data_manager.resample_data(df, rule))
+
+        data_dict = self.data_manager.resample_cascade(df, ['5m', '1H'], asset='BTCUSD')
+        self.assertEqual(list(data_dict['BTCUSD']), ['1m', '5m', '1H'])
+
     def test_resample_data_empty(self):
         df = pd.DataFrame()
         resampled_df = self.data_manager.resample_data(df, '5T')
         self.assertTrue(resampled_df.empty)
 
+class TestProcessedStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.processed_path = os.path.join(self.tmp_dir.name, 'processed')
+        index = pd.date_range(start='2020-12-31 23:00:00', periods=120, freq='min', name='timestamp')
+        self.df = pd.DataFrame({
+            'Open': [100.0 + i for i in range(120)],
+            'High': [101.0 + i for i in range(120)],
+            'Low': [99.0 + i for i in range(120)],
+            'Close': [100.5 + i for i in range(120)],
+            'Volume': [10.0] * 120,
+            'support': [99.0] * 120,
+            'resistance': [101.0] * 120
+        }, index=index)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_columnar_round_trip_preserves_index_and_dtypes(self):
+        for storage_format in ['parquet', 'feather']:
+            data_manager = DataManager(raw_data_path=self.tmp_dir.name, processed_data_path=self.processed_path, storage_format=storage_format)
+            data_manager.save_processed_data(self.df, 'BTCUSD', '1m')
+            loaded = data_manager.load_processed_data('BTCUSD', '1m')
+            pd.testing.assert_frame_equal(loaded, self.df, check_freq=False)
+            self.assertIsInstance(loaded.index, pd.DatetimeIndex)
+
+    def test_parquet_partitions_by_year(self):
+        data_manager = DataManager(raw_data_path=self.tmp_dir.name, processed_data_path=self.processed_path)
+        data_manager.save_processed_data(self.df, 'BTCUSD', '1m')
+        path = data_manager.get_processed_file_path('BTCUSD', '1m')
+        self.assertEqual(sorted(os.listdir(path)), ['year=2020', 'year=2021'])
+
+    def test_date_range_and_column_pushdown(self):
+        for storage_format in ['parquet', 'feather', 'csv']:
+            data_manager = DataManager(raw_data_path=self.tmp_dir.name, processed_data_path=os.path.join(self.processed_path, storage_format), storage_format=storage_format)
+            data_manager.save_processed_data(self.df, 'BTCUSD', '1m')
+            loaded = data_manager.load_processed_data('BTCUSD', '1m', start='2021-01-01 00:00:00', end='2021-01-01 00:29:00', columns=['Close', 'Volume'])
+            expected = self.df.loc['2021-01-01 00:00:00':'2021-01-01 00:29:00', ['Close', 'Volume']]
+            pd.testing.assert_frame_equal(loaded, expected, check_freq=False)
+
+    def test_frame_cache_serves_read_only_views_and_evicts_lru(self):
+        data_manager = DataManager(raw_data_path=self.tmp_dir.name, processed_data_path=self.processed_path, cache=FrameCache(max_bytes=16000))
+        data_manager.save_processed_data(self.df, 'BTCUSD', '1m')
+        data_manager.save_processed_data(self.df, 'ETHUSD', '1m')
+
+        first = data_manager.load_processed_data('BTCUSD', '1m')
+        second = data_manager.load_processed_data('BTCUSD', '1m')
+        pd.testing.assert_frame_equal(second, self.df, check_freq=False)
+        self.assertEqual(data_manager.cache_stats()['hits'], 1)
+        with self.assertRaises(ValueError):
+            second['Close'].to_numpy()[0] = 0.0
+        # Adding a column to a handed-out view leaves the cached frame untouched
+        first['signal'] = 1.0
+        self.assertNotIn('signal', data_manager.load_processed_data('BTCUSD', '1m').columns)
+
+        # Two full frames (~7.7 KB each) fill the budget, so a third entry evicts the least recently used one
+        data_manager.load_processed_data('ETHUSD', '1m')
+        data_manager.load_processed_data('BTCUSD', '1m', columns=['Close'])
+        stats = data_manager.cache_stats()
+        self.assertGreaterEqual(stats['evictions'], 1)
+        self.assertLessEqual(stats['bytes'], 16000)
+
+        # Writing an asset invalidates its cached frames
+        data_manager.save_processed_data(self.df.iloc[:10], 'BTCUSD', '1m')
+        self.assertEqual(len(data_manager.load_processed_data('BTCUSD', '1m')), 10)
+
+    def test_compact_mode_halves_memory_and_restores_full_precision(self):
+        data_manager = DataManager(raw_data_path=self.tmp_dir.name, processed_data_path=self.processed_path, cache=False, compact=True)
+        data_manager.save_processed_data(self.df, 'BTCUSD', '1m')
+        compact = data_manager.load_processed_data('BTCUSD', '1m')
+        self.assertTrue((compact.dtypes == np.float32).all())
+        self.assertEqual(compact.index.dtype, np.int64)
+        self.assertLess(compact.memory_usage(index=True).sum(), 0.6 * self.df.memory_usage(index=True).sum())
+
+        # The backtest boundary converts back to float64 with a DatetimeIndex
+        restored = resolve_frame(compact)
+        self.assertTrue((restored.dtypes == np.float64).all())
+        pd.testing.assert_index_equal(restored.index, self.df.index)
+        pd.testing.assert_frame_equal(restored, self.df.astype('float32').astype('float64'), check_freq=False)
+
+    def test_lazy_data_dict_loads_on_first_access_and_pickles_small(self):
+        data_manager = DataManager(raw_data_path=self.tmp_dir.name, processed_data_path=self.processed_path, cache=False)
+        data_manager.save_processed_data(self.df, 'BTCUSD', '1m')
+        data_manager.save_processed_data(self.df.resample('1H').last(), 'BTCUSD', '1H')
+        data_dict = data_manager.lazy_data_dict(['BTCUSD'], ['1m', '1H', '4H'])
+
+        timeframes = data_dict['BTCUSD']
+        self.assertIn('1m', timeframes)
+        self.assertNotIn('4H', timeframes)
+        self.assertEqual(list(timeframes), ['1m', '1H'])
+        self.assertEqual(timeframes.loaded, [])
+
+        pd.testing.assert_frame_equal(timeframes['1m'], self.df, check_freq=False)
+        self.assertEqual(timeframes.loaded, ['1m'])
+        with self.assertRaises(KeyError):
+            timeframes['4H']
+
+        # The pickled form carries no data and loads again in the receiving process
+        payload = pickle.dumps(data_dict)
+        self.assertLess(len(payload), 1000)
+        restored = pickle.loads(payload)
+        self.assertEqual(restored['BTCUSD'].loaded, [])
+        self.assertEqual(len(restored['BTCUSD']['1H']), 2)
+
+    def test_legacy_csv_is_still_readable(self):
+        legacy_manager = DataManager(raw_data_path=self.tmp_dir.name, processed_data_path=self.processed_path, storage_format='csv')
+        legacy_manager.save_processed_data(self.df, 'BTCUSD', '1H')
+        data_manager = DataManager(raw_data_path=self.tmp_dir.name, processed_data_path=self.processed_path)
+        loaded = data_manager.load_processed_data('BTCUSD', '1H')
+        pd.testing.assert_frame_equal(loaded, self.df, check_freq=False)
+
+    def test_array_store_attaches_without_copy(self):
+        data_manager = DataManager(raw_data_path=self.tmp_dir.name, processed_data_path=self.processed_path)
+        handle = data_manager.export_array_store('BTCUSD', '1m', self.df)
+        self.assertIsInstance(handle, SharedFrame)
+        # The handle pickles as a path, not as the data
+        restored = pickle.loads(pickle.dumps(handle))
+        self.assertLess(len(pickle.dumps(handle)), 1024)
+
+        attached = restored.frame
+        pd.testing.assert_frame_equal(attached, self.df, check_freq=False)
+        # Columns are read-only views on the memory-mapped file
+        close = attached['Close'].to_numpy()
+        self.assertFalse(close.flags.writeable)
+        while close is not None and not isinstance(close, np.memmap):
+            close = close.base
+        self.assertIsInstance(close, np.memmap)
+
+    def test_array_store_reexport_publishes_a_new_version(self):
+        data_manager = DataManager(raw_data_path=self.tmp_dir.name, processed_data_path=self.processed_path)
+        old_handle = data_manager.export_array_store('BTCUSD', '1m', self.df)
+        old_frame = old_handle.frame
+        changed = self.df.copy()
+        changed['Close'] += 1.0
+        new_handle = data_manager.export_array_store('BTCUSD', '1m', changed.iloc[:5])
+        self.assertEqual(new_handle.directory, old_handle.directory)
+        self.assertNotEqual(new_handle.version, old_handle.version)
+        # The frame attached before the export still reads the old files
+        pd.testing.assert_frame_equal(old_frame, self.df, check_freq=False)
+        restored = pickle.loads(pickle.dumps(new_handle))
+        pd.testing.assert_frame_equal(restored.frame, changed.iloc[:5], check_freq=False)
+        # Only the current and the previous version are kept
+        data_manager.export_array_store('BTCUSD', '1m', self.df)
+        versions = [name for name in os.listdir(old_handle.directory)
+                    if os.path.isdir(os.path.join(old_handle.directory, name))]
+        self.assertEqual(len(versions), 2)
+        self.assertNotIn(old_handle.version, versions)
+
+class TestIncrementalUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.raw_path = os.path.join(self.tmp_dir.name, 'raw')
+        os.makedirs(os.path.join(self.raw_path, 'BTCUSD'))
+        self.raw_file = os.path.join(self.raw_path, 'BTCUSD', 'BTCUSDT_1m.csv')
+        timestamps = pd.date_range(start='2020-12-31 20:00:00', periods=600, freq='min')
+        close = [100.0 + (i % 37) - (i % 11) for i in range(600)]
+        self.raw = pd.DataFrame({
+            'timestamp': timestamps.strftime('%Y-%m-%d %H:%M:%S'),
+            'Open': close,
+            'High': [c + 1.0 for c in close],
+            'Low': [c - 1.0 for c in close],
+            'Close': close,
+            'Volume': [float(i % 7 + 1) for i in range(600)],
+            'support': [c - 2.0 for c in close],
+            'resistance': [c + 2.0 for c in close]
+        })
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_incremental_update_matches_full_rebuild(self):
+        timeframes = ['5m', '15m', '1H', '4H', '1D']
+        self.raw.iloc[:437].to_csv(self.raw_file, index=False)
+        incremental = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'inc'))
+        incremental.process_all_assets(timeframes=timeframes)
+
+        # New 1m bars arrive in the middle of open 5m/15m/1H/4H/1D buckets
+        self.raw.iloc[437:].to_csv(self.raw_file, mode='a', header=False, index=False)
+        incremental.process_all_assets(timeframes=timeframes, incremental=True)
+
+        full = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'full'))
+        full.process_all_assets(timeframes=timeframes)
+        for timeframe in ['1m'] + timeframes:
+            pd.testing.assert_frame_equal(
+                incremental.load_processed_data('BTCUSD', timeframe),
+                full.load_processed_data('BTCUSD', timeframe),
+                check_freq=False
+            )
+
+    def test_rewrite_that_grows_the_raw_file_is_not_merged_as_append(self):
+        timeframes = ['5m', '1H']
+        self.raw.iloc[:437].to_csv(self.raw_file, index=False)
+        incremental = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'inc'))
+        incremental.process_all_assets(timeframes=timeframes)
+
+        # Corrected history plus new rows: the file grows, but its first bytes changed
+        corrected = self.raw.copy()
+        corrected.loc[10, ['Open', 'High', 'Low', 'Close']] += 5.0
+        corrected.to_csv(self.raw_file, index=False)
+        with self.assertLogs('DataManager', level='INFO') as logs:
+            incremental.process_all_assets(timeframes=timeframes, incremental=True)
+        self.assertTrue(any('rewritten' in line for line in logs.output))
+
+        full = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'full'))
+        full.process_all_assets(timeframes=timeframes)
+        for timeframe in ['1m'] + timeframes:
+            pd.testing.assert_frame_equal(
+                incremental.load_processed_data('BTCUSD', timeframe),
+                full.load_processed_data('BTCUSD', timeframe),
+                check_freq=False
+            )
+
+        # A later pure append is still ingested incrementally
+        self.raw.iloc[:5].assign(timestamp=pd.date_range('2021-01-01 06:00:00', periods=5, freq='min')
+                                 .strftime('%Y-%m-%d %H:%M:%S')).to_csv(self.raw_file, mode='a', header=False, index=False)
+        with self.assertLogs('DataManager', level='INFO') as logs:
+            incremental.process_all_assets(timeframes=timeframes, incremental=True)
+        self.assertTrue(any('Appended 5 new 1m rows' in line for line in logs.output))
+
+    def test_chunked_ingestion_matches_full_load(self):
+        shuffled = self.raw.copy()
+        # One chunk internally out of order and one row with a missing value
+        shuffled.iloc[50:60] = shuffled.iloc[50:60].iloc[::-1].values
+        shuffled.loc[200, 'Close'] = None
+        shuffled.to_csv(self.raw_file, index=False)
+
+        streaming = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'stream'))
+        rows = streaming.ingest_raw_data('BTCUSD', 'BTCUSDT_1m.csv', chunksize=64)
+        self.assertEqual(rows, 599)
+
+        full = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'full'))
+        full.process_asset('BTCUSD', [])
+        pd.testing.assert_frame_equal(
+            streaming.load_processed_data('BTCUSD', '1m'),
+            full.load_processed_data('BTCUSD', '1m'),
+            check_freq=False
+        )
+
+    def test_out_of_core_resample_matches_in_memory(self):
+        # Three days of 1m data across a year boundary, with a gap spanning several buckets
+        timestamps = pd.date_range(start='2020-12-30 22:00:00', periods=3 * 1440, freq='min')
+        close = 100.0 + np.sin(np.arange(len(timestamps)) / 50.0) * 10.0
+        synthetic = pd.DataFrame({
+            'timestamp': timestamps.strftime('%Y-%m-%d %H:%M:%S'),
+            'Open': close, 'High': close + 1.0, 'Low': close - 1.0, 'Close': close,
+            'Volume': np.arange(len(timestamps)) % 13 + 1.0,
+            'support': close - 2.0, 'resistance': close + 2.0
+        }).drop(index=range(1000, 1400))
+        synthetic.to_csv(self.raw_file, index=False)
+        timeframes = ['5m', '15m', '30m', '1H', '4H', '1D']
+
+        in_memory = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'memory'), sr_windows=[4])
+        in_memory.process_asset('BTCUSD', timeframes)
+        for storage_format in ['parquet', 'csv', 'feather']:
+            streamed = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, storage_format),
+                                   storage_format=storage_format, sr_windows=[4])
+            streamed.process_asset('BTCUSD', timeframes, chunksize=293)
+            for timeframe in timeframes:
+                pd.testing.assert_frame_equal(
+                    streamed.load_processed_data('BTCUSD', timeframe),
+                    in_memory.load_processed_data('BTCUSD', timeframe),
+                    check_freq=False
+                )
+                self.assertEqual(streamed.list_datasets()['BTCUSD'][timeframe]['rows'],
+                                 in_memory.list_datasets()['BTCUSD'][timeframe]['rows'])
+            pd.testing.assert_frame_equal(streamed.load_quality_index('BTCUSD', '5m').anomalies,
+                                          in_memory.load_quality_index('BTCUSD', '5m').anomalies)
+
+    def test_parallel_processing_isolates_failures(self):
+        self.raw.to_csv(self.raw_file, index=False)
+        os.makedirs(os.path.join(self.raw_path, 'ETHUSD'))
+        broken = self.raw.head(10).assign(timestamp='not-a-date')
+        broken.to_csv(os.path.join(self.raw_path, 'ETHUSD', 'ETHUSDT_1m.csv'), index=False)
+
+        data_manager = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'processed'))
+        statuses = data_manager.process_all_assets(timeframes=['5m', '1H'], parallel=True, max_workers=2)
+        self.assertIsNone(statuses['BTCUSD'])
+        self.assertIsNotNone(statuses['ETHUSD'])
+        self.assertEqual(len(data_manager.load_processed_data('BTCUSD', '1H')), 10)
+
+    def test_manifest_reuses_valid_and_rebuilds_stale_artifacts(self):
+        self.raw.iloc[:300].to_csv(self.raw_file, index=False)
+        data_manager = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'processed'))
+        data_manager.process_asset('BTCUSD', ['5m', '1H'])
+        path_5m = data_manager.get_processed_file_path('BTCUSD', '5m')
+        built_at = os.path.getmtime(path_5m)
+
+        # Nothing changed: every artifact is reused
+        with self.assertLogs('DataManager', level='INFO') as logs:
+            data_manager.process_asset('BTCUSD', ['5m', '1H'])
+        self.assertFalse(any('Building' in line for line in logs.output))
+        self.assertEqual(os.path.getmtime(path_5m), built_at)
+
+        # The raw file is rewritten: loading serves a rebuilt artifact instead of the stale one
+        self.raw.to_csv(self.raw_file, index=False)
+        self.assertEqual(len(data_manager.load_processed_data('BTCUSD', '5m')), 120)
+        self.assertEqual(len(data_manager.load_processed_data('BTCUSD', '1m')), 600)
+
+    def test_manifest_detects_same_size_edit_in_the_middle(self):
+        self.raw.to_csv(self.raw_file, index=False)
+        data_manager = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'processed'))
+        data_manager.process_asset('BTCUSD', ['5m'])
+
+        # Correct the close price of a bar halfway through without changing the file size
+        with open(self.raw_file, 'rb') as f:
+            lines = f.read().split(b'\n')
+        fields = lines[300].split(b',')
+        fields[4] = (b'9' if fields[4][:1] != b'9' else b'8') + fields[4][1:]
+        lines[300] = b','.join(fields)
+        size = os.path.getsize(self.raw_file)
+        with open(self.raw_file, 'wb') as f:
+            f.write(b'\n'.join(lines))
+        os.utime(self.raw_file, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        self.assertEqual(os.path.getsize(self.raw_file), size)
+
+        corrected = float(fields[4])
+        self.assertEqual(data_manager.load_processed_data('BTCUSD', '1m')['Close'].iloc[299], corrected)
+
+    def test_manifest_accepts_rules_recorded_with_legacy_aliases(self):
+        self.raw.to_csv(self.raw_file, index=False)
+        manifest = AssetManifest(os.path.join(self.tmp_dir.name, 'processed'), 'BTCUSD')
+        manifest.record('1H', self.raw_file, 10, '2021-01-01', '2021-01-02', '1H', 'parquet', 1)
+        self.assertIsNone(manifest.invalid_reason('1H', self.raw_file, '1h', 'parquet', 1))
+        self.assertIsNotNone(manifest.invalid_reason('1H', self.raw_file, '4h', 'parquet', 1))
+
+    def test_manifest_hashes_the_middle_of_large_raw_files(self):
+        raw_file = os.path.join(self.tmp_dir.name, 'large.csv')
+        content = bytearray(b'0123456789abcdef' * (3 << 16))  # 3 MiB
+        with open(raw_file, 'wb') as f:
+            f.write(content)
+        manifest = AssetManifest(os.path.join(self.tmp_dir.name, 'processed'), 'BTCUSD')
+        manifest.record('1m', raw_file, 10, '2021-01-01', '2021-01-02', None, 'parquet', 1)
+
+        # Touching the file without changing it keeps the artifact valid
+        os.utime(raw_file, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        self.assertIsNone(manifest.invalid_reason('1m', raw_file, None, 'parquet', 1))
+
+        content[len(content) // 2] = ord('x')
+        with open(raw_file, 'wb') as f:
+            f.write(content)
+        os.utime(raw_file, ns=(time.time_ns(), time.time_ns() + 2 * 10 ** 9))
+        self.assertEqual(manifest.invalid_reason('1m', raw_file, None, 'parquet', 1), 'raw file changed')
+
+    def test_support_resistance_bank_survives_incremental_updates(self):
+        timeframes = ['5m', '15m']
+        self.raw.iloc[:437].to_csv(self.raw_file, index=False)
+        incremental = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'inc'), sr_windows=[3, 12])
+        incremental.process_all_assets(timeframes=timeframes)
+        self.raw.iloc[437:].to_csv(self.raw_file, mode='a', header=False, index=False)
+        incremental.process_all_assets(timeframes=timeframes, incremental=True)
+
+        full = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'full'), sr_windows=[3, 12])
+        full.process_all_assets(timeframes=timeframes)
+        for timeframe in timeframes:
+            df = incremental.load_processed_data('BTCUSD', timeframe)
+            self.assertIn('resistance_12', df.columns)
+            pd.testing.assert_frame_equal(df, full.load_processed_data('BTCUSD', timeframe), check_freq=False)
+            pd.testing.assert_series_equal(df['support_12'], df['Close'].rolling(12).min(), check_names=False, check_freq=False)
+
+        # Changing the windows rebuilds the resampled artifacts
+        changed = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'full'), sr_windows=[5])
+        self.assertIn('support_5', changed.load_processed_data('BTCUSD', '5m').columns)
+
+    def test_quality_index_flags_gaps_duplicates_and_bad_bars(self):
+        raw = self.raw.drop(index=range(100, 110))  # 10 missing 1m bars
+        raw.loc[200, 'High'] = raw.loc[200, 'Low'] - 1.0
+        raw = pd.concat([raw.loc[:350], raw.loc[[300]], raw.loc[351:]])  # a duplicate arriving out of order
+        raw.iloc[:450].to_csv(self.raw_file, index=False)
+        data_manager = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'processed'))
+        data_manager.process_asset('BTCUSD', ['5m'])
+
+        index = data_manager.load_quality_index('BTCUSD', '1m')
+        gaps = index.gaps()
+        self.assertEqual(len(gaps), 1)
+        self.assertEqual(gaps['count'].iloc[0], 10)
+        self.assertEqual(gaps['start'].iloc[0], pd.Timestamp('2020-12-31 21:39:00'))
+        self.assertEqual(index.summary()['high_low'], 1)
+        self.assertEqual(len(index.query('high_low', start='2020-12-31 23:20', end='2020-12-31 23:20')), 1)
+        self.assertEqual(index.summary()['duplicate'], 1)
+        self.assertEqual(data_manager.load_quality_index('BTCUSD', '5m').summary()['gap'], 2)
+
+        # Chunked ingestion and incremental updates produce the same index as a full scan
+        chunked = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'chunked'))
+        chunked.process_asset('BTCUSD', ['5m'], chunksize=64)
+        pd.testing.assert_frame_equal(chunked.load_quality_index('BTCUSD', '1m').anomalies, index.anomalies)
+
+        raw.iloc[450:].to_csv(self.raw_file, mode='a', header=False, index=False)
+        data_manager.process_all_assets(timeframes=['5m'], incremental=True)
+        self.assertEqual(data_manager.load_quality_index('BTCUSD', '1m').summary(),
+                         {'out_of_order': 1, 'duplicate': 1, 'gap': 10, 'high_low': 1, 'ohlc_range': 1, 'non_positive': 0, 'negative_volume': 0})
+
+    def test_information_bars_bucket_by_cumulative_quantity(self):
+        self.raw.iloc[:437].to_csv(self.raw_file, index=False)
+        data_manager = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'processed'))
+        bars = data_manager.build_information_bars('BTCUSD', 'volume', 100)
+        minute = data_manager.load_processed_data('BTCUSD', '1m')
+        self.assertEqual(list(bars.columns), list(minute.columns))
+        self.assertEqual(bars['Volume'].sum(), minute['Volume'].sum())
+        self.assertEqual(bars.index[-1], minute.index[-1])
+
+        # Reference: a bar is closed by the row that completes the next multiple of the threshold
+        bar_ids = ((minute['Volume'].cumsum() - minute['Volume']) // 100).to_numpy()
+        expected = minute.groupby(bar_ids).agg({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
+        np.testing.assert_array_equal(bars[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy(), expected.to_numpy())
+        self.assertEqual(len(data_manager.build_information_bars('BTCUSD', 'tick', 60)), 8)
+        data_manager.process_asset('BTCUSD', ['5m', 'dollar_50000'])
+
+        # Appended rows rebuild the bars to the same result as a full build
+        self.raw.iloc[437:].to_csv(self.raw_file, mode='a', header=False, index=False)
+        data_manager.process_all_assets(timeframes=['5m', 'dollar_50000'], incremental=True)
+        full = DataManager(raw_data_path=self.raw_path, processed_data_path=os.path.join(self.tmp_dir.name, 'full'))
+        pd.testing.assert_frame_equal(data_manager.load_processed_data('BTCUSD', 'dollar_50000'),
+                                      full.build_information_bars('BTCUSD', 'dollar', 50000), check_freq=False)
+
+    def test_catalog_tracks_every_write(self):
+        processed_path = os.path.join(self.tmp_dir.name, 'processed')
+        self.raw.iloc[:437].to_csv(self.raw_file, index=False)
+        data_manager = DataManager(raw_data_path=self.raw_path, processed_data_path=processed_path)
+        data_manager.process_all_assets(timeframes=['5m', '1H'])
+        self.raw.iloc[437:].to_csv(self.raw_file, mode='a', header=False, index=False)
+        data_manager.process_all_assets(timeframes=['5m', '1H'], incremental=True)
+
+        # A new manager lists the data from the catalog alone
+        datasets = DataManager(raw_data_path=self.raw_path, processed_data_path=processed_path).list_datasets()
+        self.assertEqual(list(datasets), ['BTCUSD'])
+        self.assertEqual(set(datasets['BTCUSD']), {'1m', '5m', '1H'})
+        for timeframe in ['1m', '5m', '1H']:
+            df = data_manager.load_processed_data('BTCUSD', timeframe)
+            entry = datasets['BTCUSD'][timeframe]
+            self.assertEqual(entry['rows'], len(df))
+            self.assertEqual(pd.Timestamp(entry['start']), df.index[0])
+            self.assertEqual(pd.Timestamp(entry['end']), df.index[-1])
+            self.assertEqual(entry['columns'], list(df.columns))
+            self.assertEqual(entry['path'], data_manager.get_processed_file_path('BTCUSD', timeframe))
+
+    def test_rebuild_catalog_lists_every_artifact_on_disk(self):
+        processed_path = os.path.join(self.tmp_dir.name, 'processed')
+        self.raw.to_csv(self.raw_file, index=False)
+        DataManager(raw_data_path=self.raw_path, processed_data_path=processed_path).process_all_assets(
+            timeframes=['5m', 'volume_100', 'tick_60'])
+        os.remove(os.path.join(processed_path, 'catalog.json'))
+
+        data_manager = DataManager(raw_data_path=self.raw_path, processed_data_path=processed_path)
+        data_manager.rebuild_catalog()
+        datasets = data_manager.list_datasets()
+        self.assertEqual(set(datasets['BTCUSD']), {'1m', '5m', 'volume_100', 'tick_60'})
+        self.assertEqual(datasets['BTCUSD']['tick_60']['rows'], len(data_manager.load_processed_data('BTCUSD', 'tick_60')))
+
 if __name__ == '__main__':
     unittest.main()
     
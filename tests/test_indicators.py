@@ -0,0 +1,192 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from utils.indicators import (rolling_min_max, calculate_support_resistance_bank, calculate_moving_average,
+                              IndicatorCache, collect_cache_stats, sma, ema, rolling_min, rolling_max, atr, rsi,
+                              bollinger)
+
+class TestIndicators(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.close = pd.Series(100.0 + np.cumsum(rng.normal(0.0, 1.0, 503)))
+
+    def test_rolling_min_max_matches_pandas(self):
+        close = self.close.copy()
+        close.iloc[40] = np.nan
+        for window in [1, 2, 7, 20, 64, 503, 600]:
+            rolling_min, rolling_max = rolling_min_max(close.to_numpy(), window)
+            np.testing.assert_array_equal(rolling_min, close.rolling(window).min().to_numpy())
+            np.testing.assert_array_equal(rolling_max, close.rolling(window).max().to_numpy())
+
+    def test_support_resistance_bank_columns(self):
+        data = pd.DataFrame({'Close': self.close})
+        bank = calculate_support_resistance_bank(data, [50, 10, 20, 10])
+        self.assertEqual(list(bank.columns), ['Close', 'support_10', 'resistance_10', 'support_20',
+                                              'resistance_20', 'support_50', 'resistance_50'])
+        self.assertNotIn('support_10', data.columns)
+        pd.testing.assert_series_equal(bank['support_20'], self.close.rolling(20).min(), check_names=False)
+        pd.testing.assert_series_equal(bank['resistance_50'], self.close.rolling(50).max(), check_names=False)
+
+class TestIndicatorKernels(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        rows = 20000
+        self.close = 20000.0 + np.cumsum(rng.normal(0.0, 5.0, rows))
+        self.high = self.close + rng.uniform(0.0, 5.0, rows)
+        self.low = self.close - rng.uniform(0.0, 5.0, rows)
+        self.windows = [1, 2, 14, 50, 4096, 5000, 25000]
+
+    def test_sma_matches_pandas(self):
+        close = self.close.copy()
+        close[[0, 3000, 3001, 19999]] = np.nan
+        averages = sma(close, self.windows)
+        self.assertEqual(averages.shape, (len(self.windows), len(close)))
+        for row, window in enumerate(self.windows):
+            np.testing.assert_allclose(averages[row], pd.Series(close).rolling(window).mean().to_numpy(), rtol=1e-12)
+        np.testing.assert_array_equal(sma(close, 14), averages[2])
+
+    def test_ema_matches_pandas(self):
+        close = self.close.copy()
+        close[:5] = np.nan
+        for row, span in enumerate([1, 3, 20, 200]):
+            expected = pd.Series(close).ewm(span=span, adjust=False).mean().to_numpy()
+            np.testing.assert_allclose(ema(close, [1, 3, 20, 200])[row], expected, rtol=1e-12)
+
+    def test_rolling_min_max_banks(self):
+        minima, maxima = rolling_min(self.close, self.windows[:5]), rolling_max(self.close, self.windows[:5])
+        for row, window in enumerate(self.windows[:5]):
+            np.testing.assert_array_equal(minima[row], pd.Series(self.close).rolling(window).min().to_numpy())
+            np.testing.assert_array_equal(maxima[row], pd.Series(self.close).rolling(window).max().to_numpy())
+
+    def test_atr_and_rsi_match_pandas(self):
+        high, low, close = pd.Series(self.high), pd.Series(self.low), pd.Series(self.close)
+        previous_close = close.shift()
+        true_range = pd.concat([high - low, (high - previous_close).abs(), (low - previous_close).abs()], axis=1).max(axis=1)
+        change = close.diff()
+        for window in [2, 14, 100]:
+            expected_atr = true_range.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+            np.testing.assert_allclose(atr(self.high, self.low, self.close, window), expected_atr, rtol=1e-12)
+            gain = change.clip(lower=0).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+            loss = (-change.clip(upper=0)).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+            np.testing.assert_allclose(rsi(self.close, [window])[0], 100 - 100 / (1 + gain / loss), rtol=1e-10)
+
+    def test_ewm_kernels_match_pandas_across_gaps(self):
+        np.testing.assert_allclose(ema(np.array([1, 2, np.nan, np.nan, 10, 11.0]), 3),
+                                   [1, 1.5, 1.5, 1.5, 8.3, 9.65], rtol=1e-12)
+        high, low, close = self.high.copy(), self.low.copy(), self.close.copy()
+        # Leading NaNs, single missing bars, a long gap and a missing last bar
+        gaps = np.r_[0:3, 40, 41, 500, 5000:5300, 12000, 19999]
+        for values in (high, low, close):
+            values[gaps] = np.nan
+        true_range = pd.concat([pd.Series(high - low), (pd.Series(high) - pd.Series(close).shift()).abs(),
+                                (pd.Series(low) - pd.Series(close).shift()).abs()], axis=1).max(axis=1)
+        change = pd.Series(close).diff()
+        for window in [3, 14, 100]:
+            expected = pd.Series(close).ewm(span=window, adjust=False).mean()
+            np.testing.assert_allclose(ema(close, window), expected, rtol=1e-12)
+            expected_atr = true_range.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+            np.testing.assert_allclose(atr(high, low, close, window), expected_atr, rtol=1e-12)
+            gain = change.clip(lower=0).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+            loss = (-change.clip(upper=0)).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+            np.testing.assert_allclose(rsi(close, window), 100 - 100 / (1 + gain / loss), rtol=1e-10, atol=1e-10)
+
+    def test_bollinger_matches_pandas(self):
+        middle, upper, lower = bollinger(self.close, [20, 300], num_std=2.5)
+        for row, window in enumerate([20, 300]):
+            rolling = pd.Series(self.close).rolling(window)
+            np.testing.assert_allclose(middle[row], rolling.mean(), rtol=1e-12)
+            # pandas' online variance is itself only accurate to about 1e-8 of the deviation
+            np.testing.assert_allclose((upper[row] - middle[row]) / 2.5, rolling.std(ddof=0), rtol=1e-6)
+            np.testing.assert_allclose(middle[row] - lower[row], upper[row] - middle[row], rtol=1e-12)
+
+    def test_invalid_window_raises(self):
+        with self.assertRaises(ValueError):
+            sma(self.close, [10, 0])
+
+class TestIndicatorCache(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.close = pd.Series(100.0 + np.cumsum(rng.normal(0.0, 1.0, 400)))
+        self.calls = []
+
+    def moving_average(self, close, window):
+        self.calls.append(window)
+        return calculate_moving_average(close, window)
+
+    def test_repeated_requests_hit(self):
+        cache = IndicatorCache()
+        first = cache.get(self.moving_average, self.close, 20)
+        second = cache.get(self.moving_average, self.close.copy(), 20)
+        cache.get(self.moving_average, self.close, 30)
+        self.assertIs(first, second)
+        self.assertEqual(self.calls, [20, 30])
+        np.testing.assert_allclose(first, self.close.rolling(20).mean().to_numpy(), rtol=1e-12)
+        self.assertFalse(first.flags.writeable)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_changed_data_misses(self):
+        cache = IndicatorCache()
+        cache.get(self.moving_average, self.close, 20)
+        changed = self.close.copy()
+        changed.iloc[-1] += 1.0
+        cache.get(self.moving_average, changed, 20)
+        self.assertEqual(self.calls, [20, 20])
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = IndicatorCache(max_entries=2)
+        cache.get(self.moving_average, self.close, 5)
+        cache.get(self.moving_average, self.close, 10)
+        cache.get(self.moving_average, self.close, 5)
+        cache.get(self.moving_average, self.close, 15)  # Evicts window 10
+        cache.get(self.moving_average, self.close, 5)
+        cache.get(self.moving_average, self.close, 10)
+        self.assertEqual(self.calls, [5, 10, 15, 10])
+        self.assertEqual(cache.stats()['entries'], 2)
+
+    def test_entries_are_evicted_by_bytes(self):
+        entry_bytes = self.close.to_numpy().nbytes
+        cache = IndicatorCache(max_bytes=2 * entry_bytes)
+        for window in [5, 10, 15]:
+            cache.get(self.moving_average, self.close, window)
+        cache.get(self.moving_average, self.close, 5)
+        self.assertEqual(self.calls, [5, 10, 15, 5])
+        self.assertEqual(cache.stats()['bytes'], 2 * entry_bytes)
+        self.assertEqual(cache.stats()['evictions'], 2)
+        IndicatorCache(max_bytes=entry_bytes - 1).get(self.moving_average, self.close, 5)
+        self.assertEqual(len(self.calls), 5)
+
+    def test_fingerprint_is_hashed_once_per_buffer(self):
+        cache = IndicatorCache()
+        data = pd.DataFrame({'Close': self.close})
+        with patch.object(IndicatorCache, 'fingerprint', wraps=IndicatorCache.fingerprint) as fingerprint:
+            cache.get(self.moving_average, data['Close'], 20)
+            cache.get(self.moving_average, data['Close'], 30)
+            cache.get(self.moving_average, data['Close'].to_numpy(), 20)
+            cache.get(self.moving_average, data['Close'].iloc[10:], 20)
+        self.assertEqual(fingerprint.call_count, 2)
+        self.assertEqual(self.calls, [20, 30, 20])
+
+    def test_disk_persistence_across_caches(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            IndicatorCache(cache_dir=cache_dir).get(self.moving_average, self.close, 20)
+            reloaded = IndicatorCache(cache_dir=cache_dir)
+            values = reloaded.get(self.moving_average, self.close, 20)
+        self.assertEqual(self.calls, [20])
+        self.assertEqual(reloaded.stats()['disk_hits'], 1)
+        np.testing.assert_allclose(values, self.close.rolling(20).mean().to_numpy(), rtol=1e-12)
+
+    def test_collect_cache_stats_sums_worker_counters(self):
+        records = [{'a': 1, '_indicator_cache': {'hits': 2, 'misses': 1, 'disk_hits': 0}},
+                   {'a': 2, '_indicator_cache': {'hits': 3, 'misses': 0, 'disk_hits': 1}}]
+        stats = collect_cache_stats(records, {'hits': 0, 'misses': 0, 'disk_hits': 0})
+        self.assertEqual(stats, {'hits': 5, 'misses': 1, 'disk_hits': 1})
+        self.assertNotIn('_indicator_cache', records[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+import logging
+import random
+import threading
+import unittest
+import numpy as np
+import pandas as pd
+from strategies.momentum_strategy import MomentumStrategy
+from backtest_framework.backtest.backtest_runner import BacktestRunner
+from backtest_framework.backtest.batch_engine import BatchBacktest, BATCH_STATS, ARRAYS_PER_PARAMETER_SET
+from backtest_framework.backtest.vectorized_engine import FirstHitIndex, VectorizedBacktest
+from optimization.grid_search_optimizer import GridSearchOptimizer
+from optimization.random_search_optimizer import RandomSearchOptimizer
+from optimization.monte_carlo_optimizer import MonteCarloOptimizer
+
+def make_ohlc(rows, seed):
+    # Geometric random walk with gaps between bars and wicks beyond open/close
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.002, rows)))
+    open_ = np.r_[close[0], close[:-1]] + rng.normal(0.0, 0.05, rows)
+    index = pd.date_range('2023-01-01', periods=rows, freq='15min', name='timestamp')
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + rng.uniform(0.0, 0.2, rows),
+        'Low': np.minimum(open_, close) - rng.uniform(0.0, 0.2, rows),
+        'Close': close,
+        'Volume': rng.uniform(0.0, 10.0, rows),
+    }, index=index)
+
+PARAM_RANGES = {
+    'short_window': [3, 8],
+    'long_window': [20, 40],
+    'sl_percent': [0.3, 2.0],
+    'tp_percent': [0.5, 5.0],
+}
+
+class TestFirstHitIndex(unittest.TestCase):
+
+    def test_matches_linear_scan(self):
+        rng = np.random.default_rng(11)
+        values = rng.normal(0.0, 1.0, 300)
+        index = FirstHitIndex(values, max_span=300)
+        starts = rng.integers(0, 300, 500)
+        ends = np.minimum(starts + rng.integers(0, 120, 500), 299)
+        levels = rng.normal(-1.5, 1.0, 500)
+        expected = []
+        for start, end, level in zip(starts, ends, levels):
+            hits = np.flatnonzero(values[start:end + 1] < level)
+            expected.append(start + hits[0] if len(hits) else -1)
+        np.testing.assert_array_equal(index.first_below(starts, ends, levels), expected)
+
+class TestBatchBacktest(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.data = make_ohlc(3000, seed=5)
+        self.param_sets = [
+            {'short_window': s, 'long_window': l, 'sl_percent': sl, 'tp_percent': tp}
+            for s in PARAM_RANGES['short_window'] for l in PARAM_RANGES['long_window']
+            for sl in PARAM_RANGES['sl_percent'] for tp in PARAM_RANGES['tp_percent']
+        ]
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_matches_vectorized_backtest(self):
+        # A small budget splits the grid into several blocks
+        batch = BatchBacktest(self.data, MomentumStrategy, cash=100000, commission=0.001, memory_budget_mb=1)
+        self.assertLess(batch.block_size, len(self.param_sets))
+        results = batch.run(self.param_sets)
+        single = VectorizedBacktest(self.data, MomentumStrategy, cash=100000, commission=0.001)
+        for row, params in enumerate(self.param_sets):
+            stats = single.run(**params)
+            for stat in BATCH_STATS:
+                self.assertTrue(np.isclose(results.loc[row, stat], stats[stat], rtol=1e-9, equal_nan=True),
+                                f"{stat} differs for {params}: {results.loc[row, stat]} != {stats[stat]}")
+
+    def test_block_size_follows_memory_budget(self):
+        bytes_per_set = ARRAYS_PER_PARAMETER_SET * 8 * len(self.data)
+        for budget_mb in [1, 8, 64]:
+            batch = BatchBacktest(self.data, MomentumStrategy, memory_budget_mb=budget_mb)
+            self.assertEqual(batch.block_size, budget_mb * 1024 ** 2 // bytes_per_set)
+        self.assertEqual(BatchBacktest(self.data, MomentumStrategy, memory_budget_mb=0.001).block_size, 1)
+
+    def test_exit_parameter_sweep_reuses_entry_signals(self):
+        calls = []
+
+        class CountingMomentumStrategy(MomentumStrategy):
+            @classmethod
+            def entry_signals(cls, df, **params):
+                calls.append((params['short_window'], params['long_window']))
+                return super().entry_signals(df, **params)
+
+        sweep = [{'short_window': s, 'long_window': 30, 'sl_percent': sl, 'tp_percent': tp}
+                 for s in [4, 9] for sl in [0.2, 0.5, 1.0, 3.0] for tp in [0.4, 1.0, 6.0]]
+        # Blocks of 5 split the entry groups across blocks
+        batch = BatchBacktest(self.data, CountingMomentumStrategy, cash=100000, commission=0.001,
+                              memory_budget_mb=5 * ARRAYS_PER_PARAMETER_SET * 8 * len(self.data) / 1024 ** 2)
+        self.assertEqual(batch.block_size, 5)
+        results = batch.run(sweep)
+        self.assertEqual(sorted(calls), [(4, 30), (9, 30)])
+        self.assertEqual(batch.entry_sets, 2)
+        single = VectorizedBacktest(self.data, MomentumStrategy, cash=100000, commission=0.001)
+        for row, params in enumerate(sweep):
+            self.assertAlmostEqual(results.loc[row, 'Equity Final [$]'], single.run(**params)['Equity Final [$]'],
+                                   places=6)
+
+class TestGridSearchOptimizer(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.data = make_ohlc(1500, seed=8)
+        runner = BacktestRunner({}, {}, transaction_costs=0.001)
+        self.optimizer = GridSearchOptimizer(runner, MomentumStrategy, self.data, {'15m': self.data})
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_batched_mode_matches_joblib(self):
+        constraint = lambda params: params['short_window'] < params['long_window']
+        best_joblib, joblib_results = self.optimizer.optimize(
+            PARAM_RANGES, 'Equity Final [$]', constraint=constraint, max_cores=1)
+        best_batched, batched_results = self.optimizer.optimize(
+            PARAM_RANGES, 'Equity Final [$]', constraint=constraint, mode='batched', memory_budget_mb=1)
+
+        self.assertEqual(len(joblib_results), len(batched_results))
+        self.assertEqual(list(batched_results.columns), list(joblib_results.columns))
+        for name in PARAM_RANGES:
+            self.assertEqual(best_joblib[name], best_batched[name])
+        for column in ['Equity Final [$]', 'Win Rate [%]', 'Max Drawdown [%]', 'Sharpe Ratio', 'Calmar Ratio']:
+            np.testing.assert_allclose(batched_results[column].astype(float),
+                                       joblib_results[column].astype(float), rtol=1e-9)
+        self.assertFalse(joblib_results['Max Drawdown [%]'].isna().any())
+
+    def test_workers_do_not_receive_the_runner(self):
+        # An unpicklable result in the runner must not reach the joblib workers
+        self.optimizer.backtest_runner.results['held'] = threading.Lock()
+        params = {'short_window': [3, 8], 'long_window': [20], 'sl_percent': [1.0], 'tp_percent': [2.0]}
+        _, parallel_results = self.optimizer.optimize(params, 'Equity Final [$]', max_cores=2)
+        _, serial_results = self.optimizer.optimize(params, 'Equity Final [$]', max_cores=1)
+        np.testing.assert_allclose(parallel_results['Equity Final [$]'], serial_results['Equity Final [$]'])
+
+    def test_unknown_mode_raises(self):
+        with self.assertRaises(ValueError):
+            self.optimizer.optimize(PARAM_RANGES, 'Equity Final [$]', mode='threads')
+
+class TestRandomSearchOptimizer(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.data = make_ohlc(1500, seed=9)
+        runner = BacktestRunner({}, {}, transaction_costs=0.001)
+        self.optimizer = RandomSearchOptimizer(runner, MomentumStrategy, self.data, {'15m': self.data})
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_batched_mode_matches_joblib(self):
+        random.seed(4)
+        _, joblib_results = self.optimizer.optimize(PARAM_RANGES, 6, 'Sharpe Ratio', max_cores=1)
+        random.seed(4)
+        _, batched_results = self.optimizer.optimize(PARAM_RANGES, 6, 'Sharpe Ratio', mode='batched')
+        self.assertEqual(list(batched_results.columns), list(joblib_results.columns))
+        for column in list(PARAM_RANGES) + ['Equity Final [$]', 'Max Drawdown [%]', 'Sharpe Ratio']:
+            np.testing.assert_allclose(batched_results[column].astype(float),
+                                       joblib_results[column].astype(float), rtol=1e-9)
+
+class TestMonteCarloOptimizer(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.data = make_ohlc(1500, seed=10)
+        runner = BacktestRunner({}, {}, transaction_costs=0.001)
+        # An unpicklable result in the runner must not reach the joblib workers
+        runner.results['held'] = threading.Lock()
+        self.optimizer = MonteCarloOptimizer(runner, MomentumStrategy, 'TEST', self.data, {'15m': self.data})
+        self.ranges = {'short_window': (3, 8), 'long_window': (20, 40), 'sl_percent': (0.5, 2.0), 'tp_percent': (1.0, 4.0)}
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_simulations_run_in_workers(self):
+        np.random.seed(2)
+        best, results = self.optimizer.optimize(self.ranges, n_simulations=4, max_cores=2)
+        self.assertEqual(len(results), 4)
+        for params, performance in zip(results['params'], results['performance']):
+            stats = VectorizedBacktest(self.data, MomentumStrategy, cash=100000, commission=0.001).run(**params)
+            self.assertAlmostEqual(performance, stats['Equity Final [$]'], places=6)
+
+    def test_perturbed_data_is_backtested(self):
+        np.random.seed(2)
+        _, plain = self.optimizer.optimize(self.ranges, n_simulations=3, max_cores=1)
+        np.random.seed(2)
+        _, perturbed = self.optimizer.optimize(self.ranges, n_simulations=3, perturb_data=True, max_cores=1)
+        self.assertEqual(list(plain['params']), list(perturbed['params']))
+        self.assertFalse(np.allclose(plain['performance'].astype(float), perturbed['performance'].astype(float)))
+
+if __name__ == '__main__':
+    unittest.main()
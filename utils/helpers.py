@@ -0,0 +1,52 @@
+# utils/helpers.py
+
+import pandas as pd
+
+# Mapping of the framework's timeframe labels to pandas resampling rules
+TIMEFRAME_RULES = {
+    '1m': '1min',
+    '5m': '5min',
+    '15m': '15min',
+    '30m': '30min',
+    '1H': '1h',
+    '4H': '4h',
+    '1D': '1D',
+}
+
+# Deprecated pandas aliases of the rules above, as recorded by older manifests
+LEGACY_RULES = {
+    '1T': '1min',
+    '5T': '5min',
+    '15T': '15min',
+    '30T': '30min',
+    '1H': '1h',
+    '4H': '4h',
+}
+
+
+def timeframe_to_rule(timeframe: str) -> str:
+    """
+    Convert a timeframe label (e.g., '5m', '1H') to a pandas resampling rule.
+
+    Parameters:
+        timeframe (str): Timeframe label used throughout the framework.
+
+    Returns:
+        str: Pandas offset alias (e.g., '5min').
+    """
+    if timeframe not in TIMEFRAME_RULES:
+        raise ValueError(f"Unsupported timeframe '{timeframe}'. Supported: {list(TIMEFRAME_RULES)}")
+    return TIMEFRAME_RULES[timeframe]
+
+
+def timeframe_to_timedelta(timeframe: str) -> pd.Timedelta:
+    """
+    Convert a timeframe label to the duration of one bar.
+
+    Parameters:
+        timeframe (str): Timeframe label (e.g., '1H').
+
+    Returns:
+        pd.Timedelta: Duration of a single bar.
+    """
+    return pd.Timedelta(pd.tseries.frequencies.to_offset(timeframe_to_rule(timeframe)))
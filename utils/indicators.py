@@ -1,7 +1,16 @@
 # utils/indicators.py
 
+import hashlib
+import logging
+import os
+import weakref
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 
+# Do not configure logging here; it's configured in main.py
+logger = logging.getLogger(__name__)
+
 def calculate_moving_average(close_prices: pd.Series, window: int) -> pd.Series:
     """
     Calculate the moving average for a given window size.
@@ -13,7 +22,7 @@ def calculate_moving_average(close_prices: pd.Series, window: int) -> pd.Series:
     Returns:
         pd.Series: Calculated moving average.
     """
-    return close_prices.rolling(window=window).mean()
+    return pd.Series(sma(close_prices.to_numpy(dtype='float64'), window), index=close_prices.index)
 
 def calculate_support_resistance(data: pd.DataFrame, window: int = 20) -> pd.DataFrame:
     """
@@ -26,6 +35,626 @@ def calculate_support_resistance(data: pd.DataFrame, window: int = 20) -> pd.Dat
     Returns:
         pd.DataFrame: DataFrame with added 'support' and 'resistance' columns.
     """
-    data['support'] = data['Close'].rolling(window=window).min()
-    data['resistance'] = data['Close'].rolling(window=window).max()
+    support, resistance = rolling_min_max(data['Close'].to_numpy(dtype='float64'), window)
+    data['support'] = support
+    data['resistance'] = resistance
     return data
+
+def rolling_min_max(values: np.ndarray, window: int) -> tuple:
+    """
+    Rolling minimum and maximum in O(n) regardless of the window size (van Herk/Gil-Werman).
+    The series is cut into blocks of `window` values; every window spans at most two blocks,
+    so its min/max is the combination of a suffix scan of one block and a prefix scan of the
+    next. Both scans are cumulative ufuncs, so the whole computation stays vectorized.
+    Matches pandas' rolling(window).min()/max(): the first window - 1 values are NaN, and so
+    is any window containing a NaN.
+
+    Parameters:
+        values (np.ndarray): 1-D float array.
+        window (int): Window size in bars.
+
+    Returns:
+        tuple: (rolling_min, rolling_max) arrays of the same length as values.
+    """
+    return _rolling_extreme(values, window, np.minimum), _rolling_extreme(values, window, np.maximum)
+
+def _rolling_extreme(values, window: int, ufunc) -> np.ndarray:
+    """
+    Rolling minimum (ufunc=np.minimum) or maximum (np.maximum) of rolling_min_max().
+    """
+    if window < 1:
+        raise ValueError(f"Window must be at least 1, got {window}")
+    values = np.asarray(values, dtype='float64')
+    n = len(values)
+    output = np.full(n, np.nan)
+    if n < window:
+        return output
+
+    fill = np.inf if ufunc is np.minimum else -np.inf
+    blocks = np.full(-(-n // window) * window, fill)
+    blocks[:n] = values
+    # Scan down the columns of the transposed blocks, so short windows still run long inner loops
+    columns = blocks.reshape(-1, window).T
+    prefix = ufunc.accumulate(columns, axis=0).T.ravel()
+    suffix = ufunc.accumulate(columns[::-1], axis=0)[::-1].T.ravel()
+    # Window ending at i covers [i - window + 1, i]: suffix of its first block, prefix of its last
+    output[window - 1:] = ufunc(suffix[:n - window + 1], prefix[window - 1:n])
+    return output
+
+def _window_list(windows) -> tuple:
+    """
+    Normalize an int or a sequence of windows to a list of ints, and whether a single int was given.
+    """
+    single = np.ndim(windows) == 0
+    window_list = [int(window) for window in np.atleast_1d(windows)]
+    for window in window_list:
+        if window < 1:
+            raise ValueError(f"Window must be at least 1, got {window}")
+    return window_list, single
+
+def _fill_gaps(values: np.ndarray) -> tuple:
+    """
+    Values with NaNs replaced by the previous (or, at the start, the next) valid value,
+    and the cumulative NaN count with a leading zero, for masking windows that contain NaNs.
+    """
+    missing = np.isnan(values)
+    nan_counts = np.concatenate(([0], np.cumsum(missing)))
+    if not missing.any():
+        return values, nan_counts
+    if missing.all():
+        return np.zeros_like(values), nan_counts
+    positions = np.where(missing, 0, np.arange(len(values)))
+    positions = np.maximum.accumulate(positions)
+    filled = values[positions]
+    first_valid = int(np.argmax(~missing))
+    filled[:first_valid] = values[first_valid]
+    return filled, nan_counts
+
+# Bars per block of the prefix sums behind sma() and bollinger()
+MOMENT_BLOCK = 4096
+
+def _block_prefix_sums(values: np.ndarray, block: int, with_squares: bool) -> dict:
+    """
+    Prefix sums restarted at every block of `block` bars and taken relative to the block's
+    first value, so they stay of the order of the local price range instead of growing into
+    a running total that loses precision over long series.
+    """
+    n = len(values)
+    padded = np.full(-(-n // block) * block, values[-1])
+    padded[:n] = values
+    blocks = padded.reshape(-1, block)
+    anchors = blocks[:, :1]
+    deviations = blocks - anchors
+    columns = [('prefix', 'before', 'totals', deviations)]
+    if with_squares:
+        columns.append(('prefix_squares', 'before_squares', 'totals_squares', deviations ** 2))
+    sums = {'anchor': np.broadcast_to(anchors, blocks.shape).ravel()[:n]}
+    for prefix_name, before_name, totals_name, terms in columns:
+        prefix = np.cumsum(terms, axis=1)
+        # Sum of the block's values before each bar (zero at block starts)
+        before = np.zeros_like(prefix)
+        before[:, 1:] = prefix[:, :-1]
+        sums[prefix_name] = prefix.ravel()[:n]
+        sums[before_name] = before.ravel()[:n]
+        sums[totals_name] = prefix[:, -1]
+    return sums
+
+def _window_moments(sums: dict, block: int, window: int) -> tuple:
+    """
+    Mean and population variance (None without squares) of every full window from block
+    prefix sums; a window (window <= block) spans its start block and at most the next one.
+
+    Returns:
+        tuple: (mean, variance) of the windows ending at positions window - 1 .. n - 1.
+    """
+    n = len(sums['prefix'])
+    count = n - window + 1
+    anchor = sums['anchor']
+    # Windows inside one block: difference of its prefix sums
+    head = sums['prefix'][window - 1:]
+    total = head - sums['before'][:count]
+    # Windows crossing into the next block: rest of the start block plus the head of the next
+    # block, moved from the next block's anchor to the start block's
+    crossing = (np.arange(0, count, block)[:, None] + np.arange(block - window + 1, block)).ravel()
+    crossing = crossing[crossing < count]
+    start_block = crossing // block
+    head_count = crossing + window - (start_block + 1) * block
+    shift = anchor[crossing + window - 1] - anchor[crossing]
+    total[crossing] += sums['totals'][start_block] + head_count * shift
+    mean = total / window
+    if 'prefix_squares' not in sums:
+        return anchor[:count] + mean, None
+
+    total_squares = sums['prefix_squares'][window - 1:] - sums['before_squares'][:count]
+    total_squares[crossing] += (sums['totals_squares'][start_block] + 2 * shift * head[crossing]
+                                + head_count * shift ** 2)
+    variance = np.maximum(total_squares / window - mean ** 2, 0.0)
+    return anchor[:count] + mean, variance
+
+def _rolling_moments(values, windows, with_variance: bool) -> tuple:
+    """
+    Rolling mean (and population variance) for several windows as (windows x n) arrays,
+    NaN for the first window - 1 values and for windows containing a NaN. The block prefix
+    sums are built once and shared by all windows up to MOMENT_BLOCK bars.
+    """
+    window_list, single = _window_list(windows)
+    values = np.asarray(values, dtype='float64')
+    n = len(values)
+    means = np.full((len(window_list), n), np.nan)
+    variances = np.full((len(window_list), n), np.nan) if with_variance else None
+    if not any(window <= n for window in window_list):
+        return window_list, single, means, variances
+    filled, nan_counts = _fill_gaps(values)
+    # Block size depends on the window only, so a window's values do not depend on the other windows
+    block_sums = {}
+    for row, window in enumerate(window_list):
+        if window > n:
+            continue
+        block = -(-window // MOMENT_BLOCK) * MOMENT_BLOCK
+        if block not in block_sums:
+            block_sums[block] = _block_prefix_sums(filled, block, with_variance)
+        mean, variance = _window_moments(block_sums[block], block, window)
+        means[row, window - 1:] = mean
+        if with_variance:
+            variances[row, window - 1:] = variance
+        if nan_counts[-1]:
+            gaps = np.flatnonzero(nan_counts[window:] - nan_counts[:-window]) + window - 1
+            means[row, gaps] = np.nan
+            if with_variance:
+                variances[row, gaps] = np.nan
+    return window_list, single, means, variances
+
+def _linear_recurrence(inputs: np.ndarray, decay: float, block: int = 32) -> np.ndarray:
+    """
+    Solve y[t] = inputs[t] + decay * y[t - 1] (y[-1] = 0) without a per-bar Python loop.
+    Each block of `block` bars is one matrix product with the decaying kernel decay ** (j - k);
+    the values carried from block to block follow the same recurrence with decay ** block,
+    which is solved recursively on the block ends.
+    """
+    n = len(inputs)
+    if n == 0:
+        return inputs.astype('float64')
+    block = min(block, n)
+    rows = -(-n // block)
+    padded = np.zeros(rows * block)
+    padded[:n] = inputs
+    steps = np.arange(block)
+    lags = steps[:, None] - steps[None, :]
+    kernel = np.where(lags >= 0, decay ** np.maximum(lags, 0), 0.0)
+    local = padded.reshape(rows, block) @ kernel.T
+    if rows > 1:
+        carried = _linear_recurrence(local[:, -1].copy(), decay ** block, block)
+        local[1:] += np.outer(carried[:-1], decay ** (steps + 1))
+    return local.ravel()[:n]
+
+def _ewm_mean(values: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """
+    Exponentially weighted mean with the recursion of pandas' ewm(alpha=alpha, adjust=False)
+    (ignore_na=False): starts at the first valid value and holds the last value through NaNs.
+    The value before a gap of g NaNs keeps the weight (1 - alpha) ** (g + 1) against alpha for
+    the next observation. Output is NaN until min_periods valid values have been seen.
+    """
+    output = np.full(len(values), np.nan)
+    valid = ~np.isnan(values)
+    first = int(np.argmax(valid)) if len(values) else 0
+    if len(values) == 0 or not valid[first]:
+        return output
+    decay = 1.0 - alpha
+    if valid[first:].all():
+        inputs = alpha * values[first:]
+        inputs[0] = values[first]
+        output[first:] = _linear_recurrence(inputs, decay)
+        output[:first + max(min_periods, 1) - 1] = np.nan
+        return output
+
+    positions = np.flatnonzero(valid)
+    observed = values[positions]
+    inputs = alpha * observed
+    inputs[0] = observed[0]
+    smoothed = _linear_recurrence(inputs, decay)
+
+    # Observations that follow a gap start a segment; the recurrence ran through the gap with
+    # a single decay step, so each segment gets a correction decaying from its first observation
+    starts = np.flatnonzero(np.diff(positions) > 1) + 1
+    if len(starts):
+        gap_decay = decay ** (positions[starts] - positions[starts - 1])
+        corrections = np.zeros(len(starts))
+        previous_start, previous_correction = 0, 0.0
+        for segment, start in enumerate(starts):
+            held = smoothed[start - 1] + previous_correction * decay ** (start - 1 - previous_start)
+            corrected = (gap_decay[segment] * held + alpha * observed[start]) / (gap_decay[segment] + alpha)
+            corrections[segment] = corrected - smoothed[start]
+            previous_start, previous_correction = start, corrections[segment]
+        segment = np.searchsorted(starts, np.arange(len(observed)), side='right') - 1
+        in_segment = segment >= 0
+        offsets = np.arange(len(observed))[in_segment] - starts[segment[in_segment]]
+        smoothed[in_segment] += corrections[segment[in_segment]] * decay ** offsets
+
+    output[positions] = smoothed
+    last_valid = np.maximum.accumulate(np.where(valid, np.arange(len(values)), -1))
+    held = last_valid >= 0
+    output[held] = output[last_valid[held]]
+    output[np.cumsum(valid) < max(min_periods, 1)] = np.nan
+    return output
+
+def sma(values, windows) -> np.ndarray:
+    """
+    Simple moving average from cumulative sums computed once for all windows (then O(n)
+    per window), matching pandas' rolling(window).mean().
+
+    Parameters:
+        values (np.ndarray): 1-D float array (e.g., Close).
+        windows (int or list): Window size, or several window sizes.
+
+    Returns:
+        np.ndarray: 1-D array for a single window, (windows x n) array for a list.
+    """
+    _, single, means, _ = _rolling_moments(values, windows, with_variance=False)
+    return means[0] if single else means
+
+def ema(values, spans) -> np.ndarray:
+    """
+    Exponential moving average with alpha = 2 / (span + 1), matching pandas'
+    ewm(span=span, adjust=False).mean(). The recursion runs as blocked matrix products.
+
+    Parameters:
+        values (np.ndarray): 1-D float array.
+        spans (int or list): Span, or several spans.
+
+    Returns:
+        np.ndarray: 1-D array for a single span, (spans x n) array for a list.
+    """
+    span_list, single = _window_list(spans)
+    values = np.asarray(values, dtype='float64')
+    output = np.vstack([_ewm_mean(values, 2.0 / (span + 1)) for span in span_list]) if span_list \
+        else np.empty((0, len(values)))
+    return output[0] if single else output
+
+def rolling_min(values, windows) -> np.ndarray:
+    """
+    Rolling minimum for one or several windows (see rolling_min_max()).
+
+    Returns:
+        np.ndarray: 1-D array for a single window, (windows x n) array for a list.
+    """
+    window_list, single = _window_list(windows)
+    output = np.array([_rolling_extreme(values, window, np.minimum) for window in window_list]).reshape(len(window_list), -1)
+    return output[0] if single else output
+
+def rolling_max(values, windows) -> np.ndarray:
+    """
+    Rolling maximum for one or several windows (see rolling_min_max()).
+
+    Returns:
+        np.ndarray: 1-D array for a single window, (windows x n) array for a list.
+    """
+    window_list, single = _window_list(windows)
+    output = np.array([_rolling_extreme(values, window, np.maximum) for window in window_list]).reshape(len(window_list), -1)
+    return output[0] if single else output
+
+def true_range(high, low, close) -> np.ndarray:
+    """
+    True range: the largest of high - low and the distances of high and low from the previous close.
+    """
+    high = np.asarray(high, dtype='float64')
+    low = np.asarray(low, dtype='float64')
+    close = np.asarray(close, dtype='float64')
+    previous_close = np.concatenate(([np.nan], close[:-1]))
+    return np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+def atr(high, low, close, windows) -> np.ndarray:
+    """
+    Average true range with Wilder's smoothing, matching pandas'
+    true_range.ewm(alpha=1 / window, min_periods=window, adjust=False).mean().
+
+    Parameters:
+        high, low, close (np.ndarray): 1-D float arrays.
+        windows (int or list): Window size, or several window sizes.
+
+    Returns:
+        np.ndarray: 1-D array for a single window, (windows x n) array for a list.
+    """
+    window_list, single = _window_list(windows)
+    ranges = true_range(high, low, close)
+    output = np.array([_ewm_mean(ranges, 1.0 / window, window) for window in window_list]).reshape(len(window_list), -1)
+    return output[0] if single else output
+
+def rsi(close, windows) -> np.ndarray:
+    """
+    Relative strength index with Wilder's smoothing of gains and losses
+    (ewm(alpha=1 / window, min_periods=window, adjust=False)), from 0 to 100.
+
+    Parameters:
+        close (np.ndarray): 1-D float array.
+        windows (int or list): Window size, or several window sizes.
+
+    Returns:
+        np.ndarray: 1-D array for a single window, (windows x n) array for a list.
+    """
+    window_list, single = _window_list(windows)
+    close = np.asarray(close, dtype='float64')
+    change = np.diff(close, prepend=np.nan)
+    gains = np.clip(change, 0.0, None)
+    losses = np.clip(-change, 0.0, None)
+    rows = []
+    for window in window_list:
+        average_gain = _ewm_mean(gains, 1.0 / window, window)
+        average_loss = _ewm_mean(losses, 1.0 / window, window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rows.append(100.0 - 100.0 / (1.0 + average_gain / average_loss))
+    output = np.array(rows).reshape(len(window_list), -1)
+    return output[0] if single else output
+
+def bollinger(close, windows, num_std: float = 2.0) -> tuple:
+    """
+    Bollinger bands: rolling mean plus/minus num_std rolling (population) standard deviations,
+    matching pandas' rolling(window).mean() and rolling(window).std(ddof=0).
+
+    Parameters:
+        close (np.ndarray): 1-D float array.
+        windows (int or list): Window size, or several window sizes.
+        num_std (float): Band width in standard deviations.
+
+    Returns:
+        tuple: (middle, upper, lower), each 1-D for a single window or (windows x n) for a list.
+    """
+    _, single, middle, variance = _rolling_moments(close, windows, with_variance=True)
+    width = num_std * np.sqrt(variance)
+    bands = (middle, middle + width, middle - width)
+    return tuple(band[0] for band in bands) if single else bands
+
+def calculate_support_resistance_bank(data: pd.DataFrame, windows, column: str = 'Close') -> pd.DataFrame:
+    """
+    Calculate support and resistance levels for several windows in one pass.
+    Adds 'support_{window}' and 'resistance_{window}' columns, so strategies can
+    sweep the window without recomputing anything.
+
+    Parameters:
+        data (pd.DataFrame): DataFrame containing the price column.
+        windows (list): Window sizes in bars.
+        column (str): Price column the levels are computed from.
+
+    Returns:
+        pd.DataFrame: Copy of data with the added columns.
+    """
+    values = data[column].to_numpy(dtype='float64')
+    windows = sorted(set(windows))
+    supports, resistances = rolling_min(values, windows), rolling_max(values, windows)
+    bank = {}
+    for row, window in enumerate(windows):
+        bank[f'support_{window}'], bank[f'resistance_{window}'] = supports[row], resistances[row]
+    return data.assign(**bank)
+
+def support_resistance_columns(window) -> tuple:
+    """
+    Names of the support/resistance columns for a window (None for the default columns).
+    """
+    if window is None:
+        return 'support', 'resistance'
+    return f'support_{window}', f'resistance_{window}'
+
+# Default memory budget of an IndicatorCache (256 MiB per process)
+DEFAULT_INDICATOR_CACHE_BYTES = 256 << 20
+
+class IndicatorCache:
+    """
+    Memoizes indicator values keyed by (data fingerprint, indicator, params), so repeated
+    backtests and optimizer runs over the same data compute each indicator once.
+    Entries are evicted least recently used first beyond max_entries or max_bytes; with
+    cache_dir set, computed values are also written as .npy files and reloaded by later runs
+    (and other processes). Cached arrays are read-only and shared between callers.
+    """
+
+    def __init__(self, max_entries: int = 256, cache_dir: str = None, max_bytes: int = DEFAULT_INDICATOR_CACHE_BYTES):
+        """
+        Initialize the cache.
+
+        Parameters:
+            max_entries (int): Number of indicator arrays kept in memory.
+            cache_dir (str, optional): Directory for on-disk persistence; None keeps the cache in memory only.
+            max_bytes (int): Memory budget of the kept arrays; arrays larger than it are not kept.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._fingerprints = {}  # (buffer identity, view layout) -> (weakref to buffer owner, fingerprint)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def fingerprint(data) -> str:
+        """
+        Content hash of a price series or array (values, shape and dtype).
+        """
+        values = np.ascontiguousarray(np.asarray(data))
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{values.dtype.str}{values.shape}".encode())
+        digest.update(memoryview(values).cast('B'))
+        return digest.hexdigest()
+
+    def _fingerprint_of(self, data) -> str:
+        """
+        fingerprint(data), hashed once per underlying buffer and view: Series and arrays
+        viewing the same memory (e.g., df['Close'] taken again) reuse the first hash.
+        Inputs are treated as immutable once passed to the cache.
+        """
+        values = np.asarray(data)
+        owner = values
+        while isinstance(owner.base, np.ndarray):
+            owner = owner.base
+        key = (id(owner), values.__array_interface__['data'][0], values.shape, values.strides, values.dtype.str)
+        entry = self._fingerprints.get(key)
+        if entry is not None and entry[0]() is owner:
+            return entry[1]
+        fingerprint = self.fingerprint(values)
+        try:
+            reference = weakref.ref(owner, lambda _, key=key: self._fingerprints.pop(key, None))
+        except TypeError:
+            return fingerprint
+        self._fingerprints[key] = (reference, fingerprint)
+        return fingerprint
+
+    def get(self, func, data, *params) -> np.ndarray:
+        """
+        Values of func(data, *params), computed on the first request only.
+
+        Parameters:
+            func (callable): Indicator function taking the data and its parameters.
+            data (pd.Series or np.ndarray): Input series.
+            *params: Indicator parameters (hashable).
+
+        Returns:
+            np.ndarray: Read-only float64 indicator values.
+        """
+        key = (self._fingerprint_of(data), f"{func.__module__}.{func.__qualname__}", params)
+        values = self._entries.get(key)
+        if values is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return values
+
+        path = self._path(key)
+        if path is not None and os.path.exists(path):
+            values = np.load(path)
+            self.hits += 1
+            self.disk_hits += 1
+        else:
+            values = np.asarray(func(data, *params), dtype='float64')
+            self.misses += 1
+            if path is not None:
+                self._save(path, values)
+        values.flags.writeable = False
+        self._store(key, values)
+        return values
+
+    def put_many(self, func, data, param_list: list, values_list) -> None:
+        """
+        Store values computed outside the cache (e.g., several windows of a multi-window
+        indicator computed in one pass) as func(data, *params) for each params in param_list.
+
+        Parameters:
+            func (callable): Indicator function the values stand for.
+            data (pd.Series or np.ndarray): Input series.
+            param_list (list): Parameter tuples, one per row of values_list.
+            values_list (iterable): Indicator values, one array per parameter tuple.
+        """
+        fingerprint = self._fingerprint_of(data)
+        name = f"{func.__module__}.{func.__qualname__}"
+        for params, values in zip(param_list, values_list):
+            values = np.array(values, dtype='float64')
+            values.flags.writeable = False
+            self._store((fingerprint, name, tuple(params)), values)
+
+    def _store(self, key, values):
+        """
+        Keep values under key, evicting least recently used entries beyond max_entries or max_bytes.
+        """
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key).nbytes
+        if values.nbytes > self.max_bytes:
+            return
+        while self._entries and (len(self._entries) >= self.max_entries
+                                 or self.current_bytes + values.nbytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.nbytes
+            self.evictions += 1
+        self._entries[key] = values
+        self.current_bytes += values.nbytes
+
+    def _path(self, key):
+        if self.cache_dir is None:
+            return None
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.npy")
+
+    def _save(self, path, values):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename, so concurrent readers never load a partial file
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            with open(temporary_path, 'wb') as file:
+                np.save(file, values)
+            os.replace(temporary_path, path)
+        except OSError as e:
+            logger.error(f"Error persisting indicator to {path}: {e}")
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters since the cache was created or cleared.
+
+        Returns:
+            dict: hits, misses, disk_hits, evictions, entries, bytes, max_bytes and hit_rate (fraction of
+                  requests served from the cache).
+        """
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hit_rate': self.hits / requests if requests else 0.0,
+        }
+
+    def clear(self):
+        """
+        Drop the in-memory entries and reset the counters (files in cache_dir are kept).
+        """
+        self._entries.clear()
+        self.current_bytes = 0
+        self.hits = self.misses = self.disk_hits = self.evictions = 0
+
+# Process-wide cache used by the strategies (each joblib/multiprocessing worker has its own)
+INDICATOR_CACHE = IndicatorCache()
+
+def cached_indicator(func, data, *params) -> np.ndarray:
+    """
+    func(data, *params) through the process-wide INDICATOR_CACHE.
+    """
+    return INDICATOR_CACHE.get(func, data, *params)
+
+def cache_counters() -> dict:
+    """
+    Current hit/miss counters of this process's INDICATOR_CACHE.
+    """
+    return {'hits': INDICATOR_CACHE.hits, 'misses': INDICATOR_CACHE.misses, 'disk_hits': INDICATOR_CACHE.disk_hits}
+
+def counters_since(before: dict) -> dict:
+    """
+    Change of this process's cache counters since a cache_counters() snapshot.
+    """
+    now = cache_counters()
+    return {name: now[name] - before[name] for name in now}
+
+def collect_cache_stats(records: list, before: dict) -> dict:
+    """
+    Indicator cache counters of an optimizer run. Records filled in worker processes carry
+    their own counters under '_indicator_cache' (removed here); without them, the counters
+    of this process since `before` are used.
+
+    Parameters:
+        records (list): Result dictionaries of the run.
+        before (dict): cache_counters() snapshot taken before the run.
+
+    Returns:
+        dict: Summed hits, misses and disk_hits.
+    """
+    per_record = [record.pop('_indicator_cache') for record in records if '_indicator_cache' in record]
+    if not per_record:
+        return counters_since(before)
+    return {name: sum(counters[name] for counters in per_record) for name in before}
+
+def format_cache_stats(stats: dict) -> str:
+    """
+    One-line summary of indicator cache counters for logs.
+    """
+    requests = stats['hits'] + stats['misses']
+    hit_rate = stats['hits'] / requests if requests else 0.0
+    return (f"Indicator cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({hit_rate:.1%} hit rate, {stats.get('disk_hits', 0)} from disk)")